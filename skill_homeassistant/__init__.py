@@ -29,6 +29,10 @@ class HomeAssistantSkill(OVOSSkill):
         "lights.set.brightness.intent",
         "lights.increase.brightness.intent",
         "lights.decrease.brightness.intent",
+        "media.increase.volume.intent",
+        "media.decrease.volume.intent",
+        "climate.increase.temperature.intent",
+        "climate.decrease.temperature.intent",
         "lights.get.color.intent",
         "lights.set.color.intent",
         "assist.intent",
@@ -73,6 +77,11 @@ class HomeAssistantSkill(OVOSSkill):
         # Register for settings changes to update client config
         self.settings_change_callback = self._on_settings_changed
 
+    def shutdown(self):
+        if hasattr(self, "ha_client"):
+            self.ha_client.close()
+        super().shutdown()
+
     def _on_settings_changed(self):
         """Handle settings changes by updating the Home Assistant client config."""
         self.log.info("Settings changed, updating Home Assistant client configuration")
@@ -348,6 +357,60 @@ class HomeAssistantSkill(OVOSSkill):
                 return
             self.log.info(f"Trying to decrease brightness for {device}")
 
+    @intent_handler("media.increase.volume.intent")  # pragma: no cover
+    def handle_increase_volume_intent(self, message: Message):
+        self._adjust_volume(message, 0.1)
+
+    @intent_handler("media.decrease.volume.intent")  # pragma: no cover
+    def handle_decrease_volume_intent(self, message: Message):
+        self._adjust_volume(message, -0.1)
+
+    def _adjust_volume(self, message: Message, volume_step: float):
+        self.log.info(message.data)
+        if not self.check_client_connection():
+            return
+        if device := self._get_device_from_message(message):
+            response = self.ha_client.handle_adjust_media_volume(
+                Message("", {"device": device, "volume_step": volume_step})
+            )
+            volume = response.get("volume", "unknown percentage") if response else None
+            if self._handle_device_response(
+                response,
+                device,
+                "media.current.volume",
+                {"volume": volume},
+                success_message=f"Volume set to {volume}",
+            ):
+                return
+            self.log.info(f"Trying to adjust volume for {device}")
+
+    @intent_handler("climate.increase.temperature.intent")  # pragma: no cover
+    def handle_increase_temperature_intent(self, message: Message):
+        self._adjust_temperature(message, 1)
+
+    @intent_handler("climate.decrease.temperature.intent")  # pragma: no cover
+    def handle_decrease_temperature_intent(self, message: Message):
+        self._adjust_temperature(message, -1)
+
+    def _adjust_temperature(self, message: Message, temperature_step: float):
+        self.log.info(message.data)
+        if not self.check_client_connection():
+            return
+        if device := self._get_device_from_message(message):
+            response = self.ha_client.handle_adjust_climate_temperature(
+                Message("", {"device": device, "temperature_step": temperature_step})
+            )
+            temperature = response.get("temperature", "unknown") if response else None
+            if self._handle_device_response(
+                response,
+                device,
+                "climate.current.temperature",
+                {"temperature": temperature},
+                success_message=f"Temperature set to {temperature}",
+            ):
+                return
+            self.log.info(f"Trying to adjust temperature for {device}")
+
     @intent_handler("lights.get.color.intent")  # pragma: no cover
     def handle_get_color_intent(self, message: Message):
         self.log.info(message.data)
@@ -380,7 +443,12 @@ class HomeAssistantSkill(OVOSSkill):
             color = color[3:].strip()
 
         if device:
-            response = self.ha_client.handle_set_light_color(Message("", {"device": device, "color": color}))
+            response = self.ha_client.handle_set_light_color(
+                Message("", {"device": device, "color": color, "lang": self.lang})
+            )
+            if response.get("unknown_color"):
+                self.speak_dialog("no.parsed.color")
+                return
             color = response.get("color", "unknown")
             if self._handle_device_response(
                 response,
@@ -1,18 +1,48 @@
 """Home Assistant client"""
 
+import os
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout, as_completed
+from contextvars import copy_context
 from copy import deepcopy
-from typing import Optional
+from functools import partial
+from threading import Lock, Timer
+from typing import Dict, Optional
 
 from ovos_bus_client import Message, MessageBusClient
 from ovos_utils.log import LOG
 from ovos_utils.parse import match_one
 
-from skill_homeassistant.ha_client.constants import SUPPORTED_DEVICES
+from skill_homeassistant.ha_client.constants import (
+    POLL_MAX_AGE,
+    PROJECTED_ATTRIBUTES,
+    REGISTRY_SETTINGS,
+    RUNTIME_SETTINGS,
+    SUPPORTED_DEVICES,
+)
+from skill_homeassistant.ha_client.logic.cassette import CassetteConnector
+from skill_homeassistant.ha_client.logic.coalesce import AdjustmentCoalescer
+from skill_homeassistant.ha_client.logic.codec import get_codec
+from skill_homeassistant.ha_client.logic.command_queue import CommandQueue
+from skill_homeassistant.ha_client.logic.colors import (
+    DEFAULT_COLOR_DISTANCE,
+    DEFAULT_COLOR_RESOLVER,
+    get_color_index,
+)
 from skill_homeassistant.ha_client.logic.connector import HomeAssistantRESTConnector
+from skill_homeassistant.ha_client.logic.endpoints import EndpointPool
+from skill_homeassistant.ha_client.logic.executor import PriorityExecutor, request_priority
+from skill_homeassistant.ha_client.logic.filters import EntityFilter
+from skill_homeassistant.ha_client.logic.ratelimit import RateLimiter
+from skill_homeassistant.ha_client.logic.timeouts import AdaptiveTimeouts
 from skill_homeassistant.ha_client.logic.utils import (
+    get_ha_value_from_percentage_brightness,
     get_percentage_brightness_from_ha_value,
     map_entity_to_device_type,
 )
+from skill_homeassistant.ha_client.logic.validation import ConnectionValidation
+
+# Joins an instance name and an entity id into an instance-qualified id, e.g. "garage/light.door"
+INSTANCE_SEPARATOR = "/"
 
 
 class HomeAssistantClient:
@@ -29,14 +59,24 @@ class HomeAssistantClient:
         self.config = config or {}
         self.oauth_client_id = None
         self.temporary_instance = None
-        self.connector = None
-        self.devices = []
+        self.connector = None  # Main instance
+        self.connectors: Dict[str, HomeAssistantRESTConnector] = {}  # Instance name -> connector, main instance ""
+        self.devices = []  # Raw /api/states payload, only held while the registry is being built
+        self.instance_devices = {}  # Same for the other instances, by instance name
         self.registered_devices = []  # Device objects
         self.registered_device_names = []  # Device friendly/entity names
 
         self.instance_available = False
         self.device_types = SUPPORTED_DEVICES
         self.brightness_increment = self.get_brightness_increment()
+        self.entity_filter = EntityFilter.from_config(self.config.get("entity_filter"))
+        self.coalescer = AdjustmentCoalescer()
+        self.color_index = get_color_index()
+        self.command_queue = None
+        self._replay_timer = None
+        self._replay_lock = Lock()
+        self._registry_lock = Lock()
+        self._fetch_generation = 0  # Bumped by every fetch, so late instances of an older one are dropped
 
         # Register bus events if we have a bus
         if self.bus is not None:
@@ -79,10 +119,34 @@ class HomeAssistantClient:
         """
         return self.config.get("toggle_automations", False)
 
+    @property
+    def adjustment_window(self) -> float:
+        """Get the adjustment coalescing window from the config
+
+        Returns:
+            float: Seconds to merge repeated relative adjustments of one entity into a
+                single service call, default 0 (send every adjustment immediately)
+        """
+        return float(self.config.get("adjustment_window", 0))
+
+    @property
+    def state_fetch_mode(self) -> str:
+        """Get how the state list is downloaded from the config
+
+        Returns:
+            str: "full" to decode the whole /api/states body at once (default),
+                "stream" to parse it incrementally, or "template" to have Home Assistant
+                render only the supported domains and needed attributes
+        """
+        return self.config.get("state_fetch", "full")
+
     # SETUP INSTANCE SUPPORT
-    def validate_instance_connection(self, host, api_key, assist_only, verify_ssl):
+    def validate_instance_connection(self, host, api_key, assist_only, verify_ssl) -> ConnectionValidation:
         """Validate the connection to the Home Assistant instance
 
+        Only the lightweight /api/ and /api/config endpoints are requested, with a short timeout.
+        The validated connections are kept and reused by the connector built for the same instance.
+
         Args:
             host (str): The Home Assistant instance URL
             api_key (str): The Home Assistant API key
@@ -90,30 +154,81 @@ class HomeAssistantClient:
             verify_ssl (bool): Whether to verify ssl certificates (True) or ignore ssl errors (False). Default True
 
         Returns:
-            bool: True if the connection is valid, False otherwise
+            ConnectionValidation: Whether the instance is reachable and accepts the key, its version and
+                latency; truthy if the connection is valid, falsy otherwise
         """
+        for connector in self.connectors.values():
+            if self._same_instance(connector, host, api_key, verify_ssl):
+                return connector.validate()
+        if self.temporary_instance is not None:
+            self.temporary_instance.close()
+            self.temporary_instance = None
         try:
             validator = HomeAssistantRESTConnector(host, api_key, assist_only, verify_ssl)
-
-            validator.get_all_devices()
-
-            return True
-
+            result = validator.validate()
         except Exception as e:
             LOG.exception("Error validating Home Assistant connection", exc_info=e)
-            return False
+            return ConnectionValidation(error=str(e))
+        if result:
+            self.temporary_instance = validator
+        else:
+            LOG.warning(f"Home Assistant connection to {host} is not valid: {result.error}")
+            validator.close()
+        return result
+
+    @staticmethod
+    def _same_instance(connector, host, api_key, verify_ssl) -> bool:
+        """Whether a connector talks to host with the same credentials and certificate checks."""
+        return (
+            connector.host.rstrip("/") == host.rstrip("/")
+            and connector.api_key == api_key
+            and connector.verify_ssl == verify_ssl
+        )
 
     # INSTANCE INIT OPERATIONS
     def update_config(self, new_config: dict) -> None:
-        """Update the client configuration and reinitialize.
+        """Update the client configuration, doing only the work the changed settings need.
 
         Call this when skill settings change to push new config to the client.
+        Runtime settings (RUNTIME_SETTINGS) are applied in place, registry settings
+        (REGISTRY_SETTINGS) rebuild the devices over the existing connections, and any
+        other change reinitializes the connectors.
 
         Args:
             new_config: New configuration dict with host, api_key, etc.
         """
+        changed = {key for key, value in new_config.items() if key not in self.config or self.config[key] != value}
         self.config.update(new_config)
-        self.init_configuration()
+        if not changed:
+            LOG.debug("Configuration unchanged")
+            return
+        if self.connector is None or changed - RUNTIME_SETTINGS - REGISTRY_SETTINGS:
+            LOG.info(f"Connection settings changed ({', '.join(sorted(changed))}), reconnecting")
+            self.init_configuration()
+            return
+        self._apply_runtime_settings()
+        if changed & REGISTRY_SETTINGS:
+            LOG.info(f"Registry settings changed ({', '.join(sorted(changed))}), rebuilding devices")
+            self._apply_registry_settings()
+            self.coalescer.flush()
+            self.refresh_devices()
+
+    def _apply_runtime_settings(self) -> None:
+        """Apply the settings that need neither a reconnect nor a registry rebuild."""
+        self.brightness_increment = self.get_brightness_increment()
+        self.coalescer.window = self.adjustment_window
+        self.color_index = get_color_index(
+            self.config.get("color_palette", "css3"),
+            float(self.config.get("color_match_distance", DEFAULT_COLOR_DISTANCE)),
+        )
+
+    def _apply_registry_settings(self) -> None:
+        """Apply the settings that decide which entities are registered to the filter and connectors."""
+        self.entity_filter = EntityFilter.from_config(self.config.get("entity_filter"))
+        assist_only = self.config.get("assist_only", True)
+        instances = {instance.get("name", ""): instance for instance in self.config.get("instances") or []}
+        for name, connector in self.connectors.items():
+            connector.assist_only = instances.get(name, {}).get("assist_only", assist_only) if name else assist_only
 
     def init_configuration(self, message=None):
         """Initialize instance configuration.
@@ -125,26 +240,158 @@ class HomeAssistantClient:
         configuration_api_key = self.config.get("api_key", "")
         configuration_assist_only = self.config.get("assist_only", True)
         configuration_verify_ssl = self.config.get("verify_ssl", True)
-        if configuration_host != "" and configuration_api_key != "":
-            self.connector = HomeAssistantRESTConnector(
-                host=configuration_host,
-                api_key=configuration_api_key,
-                assist_only=configuration_assist_only,
-                verify_ssl=configuration_verify_ssl,
-                timeout=self.config.get("timeout", 3),
+        self.entity_filter = EntityFilter.from_config(self.config.get("entity_filter"))
+        # Pending adjustments target the devices of the previous configuration
+        self.coalescer.flush()
+        self._apply_runtime_settings()
+        self.command_queue = CommandQueue.from_config(self.config.get("offline_queue"))
+        if self.command_queue is not None:
+            self.command_queue.on_add = self._schedule_replay
+        self._close_connectors()
+        if configuration_host and configuration_api_key:
+            self.connector = self._build_connector(
+                "", configuration_host, configuration_api_key, configuration_assist_only, configuration_verify_ssl
             )
-            self.devices = self.connector.get_all_devices()
-            if len(self.devices) > 0:
+            self.connectors[""] = self.connector
+            for instance in self.config.get("instances") or []:
+                name = instance.get("name", "")
+                if not name or INSTANCE_SEPARATOR in name or name in self.connectors:
+                    LOG.warning(f"Skipping Home Assistant instance {instance.get('host')}: it needs a unique name")
+                    continue
+                if not instance.get("host") or not instance.get("api_key"):
+                    LOG.warning(f"Skipping Home Assistant instance {name}: host and api_key are required")
+                    continue
+                self.connectors[name] = self._build_connector(
+                    name,
+                    instance["host"],
+                    instance["api_key"],
+                    instance.get("assist_only", configuration_assist_only),
+                    instance.get("verify_ssl", configuration_verify_ssl),
+                )
+            if self.command_queue:
+                # Commands persisted before a restart
+                self._schedule_replay()
+            if self._load_devices() > 0:
                 self.instance_available = True  # TODO: Use the validator to check this
-            self.registered_devices = []
-            self.build_devices()
         else:
             # Clear stale connection state when config is removed
             self.instance_available = False
             self.connector = None
             self.devices = []
-            self.registered_devices = []
-            self.registered_device_names = []
+            self.instance_devices = {}
+            with self._registry_lock:
+                self._fetch_generation += 1
+                self._clear_registry()
+
+    def close(self) -> None:
+        """Send pending adjustments, then close every connector, saving any cassette being recorded."""
+        self.coalescer.flush()
+        self._close_connectors()
+        if self.temporary_instance is not None:
+            self.temporary_instance.close()
+            self.temporary_instance = None
+
+    def _close_connectors(self) -> None:
+        """Close every connector and stop its executor, cancelling the requests still queued on it."""
+        with self._registry_lock:
+            # Instances still fetching belong to the previous connectors
+            self._fetch_generation += 1
+        for connector in self.connectors.values():
+            connector.close()
+            if connector.executor is not None:
+                connector.executor.shutdown()
+        self.connectors = {}
+
+    def _build_connector(self, name, host, api_key, assist_only, verify_ssl) -> HomeAssistantRESTConnector:
+        """Create the connector of one instance with the shared connection settings.
+
+        Args:
+            name (str): The instance name, "" for the main instance.
+            host (str | list): The Home Assistant instance URL, or its URLs in order of preference.
+            api_key (str): The Home Assistant API key.
+            assist_only (bool): Whether to only pull entities exposed to Assist.
+            verify_ssl (bool): Whether to verify ssl certificates.
+        """
+        endpoints = None
+        if isinstance(host, (list, tuple)):
+            urls = [url.rstrip("/") for url in host if url]
+            host = urls[0] if urls else ""
+            if len(urls) > 1:
+                endpoints = EndpointPool(urls, probe_interval=float(self.config.get("endpoint_probe_interval", 30)))
+        session = None
+        validated = self.temporary_instance
+        if validated is not None and self._same_instance(validated, host, api_key, verify_ssl):
+            # Keep the connections opened while validating the instance
+            session, self.temporary_instance = validated.session, None
+        connector_class, cassette_args = HomeAssistantRESTConnector, {}
+        cassette = self.config.get("cassette") or {}
+        if cassette.get("path"):
+            # Record or replay every exchange, one cassette file per instance
+            root, extension = os.path.splitext(cassette["path"])
+            connector_class = CassetteConnector
+            cassette_args = {
+                "cassette_path": f"{root}.{name}{extension}" if name else cassette["path"],
+                "mode": cassette.get("mode", "replay"),
+                "latency_scale": float(cassette.get("latency_scale", 0)),
+                "redact": cassette.get("redact") or (),
+            }
+        return connector_class(
+            host=host,
+            api_key=api_key,
+            assist_only=assist_only,
+            verify_ssl=verify_ssl,
+            timeout=self.config.get("timeout", 3),
+            state_max_age=self.config.get("state_max_age", 0),
+            poll_max_age={**POLL_MAX_AGE, **self.config.get("poll_max_age", {})},
+            name=name,
+            codec=get_codec(self.config.get("json_codec")),
+            compression=self.config.get("compression", "bulk"),
+            adaptive_timeouts=AdaptiveTimeouts.from_config(self.config.get("adaptive_timeouts")),
+            command_queue=self.command_queue,
+            # One pool per instance, so a slow instance cannot take the workers of the others
+            executor=PriorityExecutor.from_config(self.config.get("io_executor")),
+            rate_limiter=RateLimiter.from_config(self.config.get("rate_limit")),
+            endpoints=endpoints,
+            session=session,
+            **cassette_args,
+        )
+
+    def _schedule_replay(self) -> None:
+        """Check whether Home Assistant is back after the queue's retry interval, unless a check is pending."""
+        with self._replay_lock:
+            if self._replay_timer is not None or self.command_queue is None:
+                return
+            self._replay_timer = Timer(self.command_queue.retry_interval, self._replay_queued_commands)
+            self._replay_timer.daemon = True
+            self._replay_timer.start()
+
+    def _replay_queued_commands(self) -> None:
+        """Replay the offline command queue if Home Assistant answers, otherwise check again later."""
+        with self._replay_lock:
+            self._replay_timer = None
+        command_queue, connectors = self.command_queue, self.connectors
+        if not command_queue or not connectors:
+            return
+        reachable = set()
+        with request_priority("refresh"):
+            for name in {command.instance for command in command_queue.pending()}:
+                if name not in connectors or connectors[name].ping():
+                    reachable.add(name)
+
+        def send(command):
+            if command.instance not in reachable:
+                return False
+            connector = connectors.get(command.instance)
+            if connector is None:
+                LOG.warning(f"Dropping queued {command.service} for {command.entity_id}: unknown instance")
+                return True
+            return connector.replay_command(command)
+
+        if reachable:
+            sent = command_queue.replay(send)
+            LOG.info(f"Home Assistant is reachable again, replayed {sent} queued commands")
+        if command_queue:
+            self._schedule_replay()
 
     def refresh_devices(self) -> int:
         """Refresh devices from Home Assistant API.
@@ -159,24 +406,227 @@ class HomeAssistantClient:
             return 0
 
         LOG.info("Refreshing device list from Home Assistant")
-        self.devices = self.connector.get_all_devices()
-        self.registered_devices = []
-        self.registered_device_names = []
-        self.build_devices()
+        for connector in self.connectors.values() or [self.connector]:
+            if connector.assist_only:
+                # Pick up entities exposed or unexposed in Assist since the last build
+                connector.get_exposed_entities(refresh=True)
+        with request_priority("refresh"):
+            self._load_devices()
         LOG.info(f"Device refresh complete: {len(self.registered_devices)} devices registered")
         return len(self.registered_devices)
 
-    def build_devices(self, *args, **kwargs):
+    def _clear_registry(self) -> None:
+        """Release every registered device, so none keeps listening for state changes, and empty the registry."""
+        for device in self.registered_devices:
+            device.release()
+        self.registered_devices = []
+        self.registered_device_names = []
+
+    def _load_devices(self) -> int:
+        """Fetch the state list of every instance and rebuild the registry from them.
+
+        Several instances are fetched in parallel, and each one's devices are registered
+        as soon as its state list arrives, replacing the previous registry with the first.
+        Instances that have not answered within the fetch_deadline setting register their
+        devices whenever they do, so a slow or unreachable instance delays none of the others.
+
+        Returns:
+            int: The number of entities processed before the deadline
+        """
+        with self._registry_lock:
+            self._fetch_generation += 1
+            generation = self._fetch_generation
+        if len(self.connectors) <= 1:
+            self.devices = self._fetch_devices()
+            self.instance_devices = {}
+            with self._registry_lock:
+                self._clear_registry()
+            return self.build_devices()
+        deadline = float(self.config.get("fetch_deadline", 10))
+        pool = ThreadPoolExecutor(max_workers=len(self.connectors), thread_name_prefix="ha-fetch")
+        # copy_context keeps the request priority of the caller
+        futures = {
+            pool.submit(copy_context().run, self._fetch_instance, connector): connector
+            for connector in self.connectors.values()
+        }
+        pool.shutdown(wait=False)
+        self.entity_filter.stats.clear()
+        pending = set(futures)
+        entity_count = 0
+        try:
+            for future in as_completed(futures, timeout=deadline):
+                if len(pending) == len(futures):
+                    # The previous registry stays usable until the first instance answers
+                    with self._registry_lock:
+                        self._clear_registry()
+                pending.discard(future)
+                entity_count += self._register_instance(futures[future], future, generation)
+        except FuturesTimeout:
+            if len(pending) == len(futures):
+                with self._registry_lock:
+                    self._clear_registry()
+            late = ", ".join(futures[future].name or "main" for future in pending)
+            LOG.warning(f"Home Assistant instances {late} did not answer in {deadline}s; registering them later")
+            for future in pending:
+                future.add_done_callback(partial(self._register_late_instance, futures[future], generation))
+        self._log_registry(entity_count)
+        return entity_count
+
+    def _register_instance(self, connector, future, generation) -> int:
+        """Register the devices of a fetched instance, unless fetching it failed.
+
+        Args:
+            connector (HomeAssistantRESTConnector): The instance.
+            future (Future): Its fetch.
+            generation (int): The fetch the state list belongs to.
+
+        Returns:
+            int: The number of entities processed
+        """
+        try:
+            states = future.result()
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            LOG.warning(f"Could not fetch the devices of Home Assistant instance {connector.name or 'main'}: {error}")
+            return 0
+        return self._register_states(connector, states, generation)
+
+    def _register_late_instance(self, connector, generation, future) -> None:
+        """Register the devices of an instance that answered after the fetch deadline."""
+        entity_count = self._register_instance(connector, future, generation)
+        LOG.info(f"Home Assistant instance {connector.name or 'main'} answered late: {entity_count} entities")
+
+    def _fetch_instance(self, connector):
+        """Fetch one instance's state list in full, so the download finishes on the fetching thread."""
+        return list(self._fetch_devices(connector))
+
+    def _fetch_devices(self, connector=None):
+        """Fetch the state list from Home Assistant using the configured fetch mode.
+
+        Args:
+            connector (HomeAssistantRESTConnector): The instance to fetch from. Default None for the main one.
+
+        Returns:
+            Iterable[dict]: A list of states, or a generator when streaming
+        """
+        connector = connector or self.connector
+        if self.state_fetch_mode == "template":
+            devices = connector.get_all_devices_projected(self.device_types, PROJECTED_ATTRIBUTES)
+            if devices is not None:
+                return devices
+            LOG.warning("State projection failed, falling back to the full /api/states download")
+        if self.state_fetch_mode == "stream":
+            return connector.iter_all_devices(domains=self.device_types)
+        return connector.get_all_devices()
+
+    def _exposed_entities(self, refresh: bool = False, connector=None):
+        """Get the entities exposed to Assist when assist_only is set.
+
+        Args:
+            refresh (bool): Fetch the list again instead of using the connector's cached copy.
+            connector (HomeAssistantRESTConnector): The instance to ask. Default None for the main one.
+
+        Returns:
+            Container[str]: The exposed entity ids, or None to register every entity
+        """
+        connector = connector or self.connector
+        if not connector or not connector.assist_only:
+            return None
+        exposed = connector.get_exposed_entities(refresh=refresh)
+        if exposed is None:
+            LOG.warning("Could not load the entities exposed to Assist; registering all entities")
+        return exposed
+
+    def _entity_areas(self, connector):
+        """Resolve the areas the entity filter's area rules need, which /api/states does not carry.
+
+        Args:
+            connector (HomeAssistantRESTConnector): The instance to ask.
+
+        Returns:
+            dict: entity id -> area id, or None to skip the area rules
+        """
+        areas = connector.get_entity_areas()
+        if areas is None:
+            LOG.warning("Could not resolve entity areas; the entity filter's area rules are skipped")
+        return areas
+
+    def _entity_integrations(self, connector):
+        """Resolve the entities of the integrations the entity filter's integration rules name.
+
+        Args:
+            connector (HomeAssistantRESTConnector): The instance to ask.
+
+        Returns:
+            dict: entity id -> integrations, or None to skip the integration rules
+        """
+        integrations = connector.get_entity_integrations(self.entity_filter.integrations)
+        if integrations is None:
+            LOG.warning("Could not resolve integration entities; the entity filter's integration rules are skipped")
+        return integrations
+
+    def build_devices(self, *args, **kwargs) -> int:
         """Build the devices from the cached device list.
 
-        Note: This processes self.devices but does not fetch fresh data.
+        Note: This processes self.devices, and self.instance_devices for any other
+        instances, but does not fetch fresh data.
         Use refresh_devices() to fetch fresh data from Home Assistant.
+        The raw state list is released once the registry is built, since every
+        registered device already holds its own state and attributes.
+        Entities rejected by the entity_filter setting are skipped before a device is
+        built; the reasons are counted in self.entity_filter.stats. Area rules first
+        resolve every entity's area, and integration rules the entities of the named
+        integrations, with one template render per instance each.
+
+        Returns:
+            int: The number of entities processed
         """
         LOG.info(f"Initializing configuration with args: {args} and kwargs: {kwargs}")
-        for device in self.devices:
+        self.entity_filter.stats.clear()
+        sources = [(self.connector, self.devices)]
+        sources.extend((self.connectors[name], states) for name, states in self.instance_devices.items())
+        entity_count = sum(self._register_states(connector, states) for connector, states in sources)
+        self.devices = []
+        self.instance_devices = {}
+        self._log_registry(entity_count)
+        return entity_count
+
+    def _register_states(self, connector, states, generation: Optional[int] = None) -> int:
+        """Build the devices of one instance's state list and add them to the registry.
+
+        The registry keeps the instances in configuration order, the main one first,
+        whichever order they are registered in.
+
+        Args:
+            connector (HomeAssistantRESTConnector): The instance the states come from.
+            states (Iterable[dict]): Its state list.
+            generation (int): The fetch the states belong to; they are dropped if another
+                fetch started since. Default None to always register them.
+
+        Returns:
+            int: The number of entities processed
+        """
+        entity_filter = self.entity_filter
+        entity_count = 0
+        devices, device_names = [], []
+        exposed = self._exposed_entities(connector=connector)
+        areas = self._entity_areas(connector) if entity_filter.uses_areas else None
+        integrations = self._entity_integrations(connector) if entity_filter.integrations else None
+        for device in states:
+            entity_count += 1
             device_type = map_entity_to_device_type(device["entity_id"])
             if device_type is not None:
                 device_id = device["entity_id"]
+                if exposed is not None and device_id not in exposed:
+                    continue
+                # The state list may be shared with other callers of get_all_devices: copy, don't modify
+                if areas is not None:
+                    device = {**device, "area_id": areas.get(device_id)}
+                if integrations is not None:
+                    device = {**device, "integrations": integrations.get(device_id, ())}
+                if entity_filter and not entity_filter(
+                    device, check_areas=areas is not None, check_integrations=integrations is not None
+                ):
+                    continue
                 device_name = device.get("attributes", {}).get("friendly_name", device_id)
                 device_icon = f"mdi:{device_type}"
                 device_state = device.get("state", None)
@@ -184,9 +634,8 @@ class HomeAssistantClient:
 
                 device_attributes = device.get("attributes", {})
                 if device_type in self.device_types:
-                    LOG.debug(f"Device added: {device_name} - {device_type} - {device_area}")
                     dev_args = [
-                        self.connector,
+                        connector,
                         device_id,
                         device_icon,
                         device_name,
@@ -194,10 +643,33 @@ class HomeAssistantClient:
                         device_attributes,
                         device_area,
                     ]
-                    self.registered_devices.append(self.device_types[device_type](*dev_args))
-                    self.registered_device_names.append(device_name)
+                    devices.append(self.device_types[device_type](*dev_args))
+                    device_names.append(device_name)
                 else:
                     LOG.warning(f"Device type {device_type} not supported; please file an issue on GitHub")
+        with self._registry_lock:
+            if generation is not None and generation != self._fetch_generation:
+                # The registry was rebuilt without this instance since
+                for device in devices:
+                    device.release()
+                return entity_count
+            order = {name: index for index, name in enumerate(self.connectors)}
+            # sorted is stable, so each instance keeps the order of its state list
+            registry = sorted(
+                zip(self.registered_devices + devices, self.registered_device_names + device_names),
+                key=lambda entry: order.get(getattr(entry[0].connector, "name", ""), 0),
+            )
+            self.registered_devices = [device for device, _ in registry]
+            self.registered_device_names = [device_name for _, device_name in registry]
+        return entity_count
+
+    def _log_registry(self, entity_count: int) -> None:
+        """Log the size of the registry and what the entity filter skipped."""
+        # One summary line: LOG inspects the call stack, which costs milliseconds per call on large installs
+        LOG.debug(f"Registered {len(self.registered_devices)} devices from {entity_count} entities")
+        if self.entity_filter.stats:
+            skipped = sum(self.entity_filter.stats.values())
+            LOG.info(f"Entity filter skipped {skipped} entities: {dict(self.entity_filter.stats)}")
 
     def handle_get_devices(self):
         """Handle the get devices message
@@ -205,10 +677,23 @@ class HomeAssistantClient:
         Args:
             message (Message): The message object
         """
-        # build a plain list of devices
-        device_list = []
-        for device in self.registered_devices:
-            device_list.append(device.get_device_display_model())
+        with request_priority("gui"):
+            # Refresh the stale devices of each instance in one request instead of polling them one by one
+            stale_by_connector = {}
+            for device in self.registered_devices:
+                if device.needs_poll():
+                    stale_by_connector.setdefault(device.connector, []).append(device)
+            refreshed = set()
+            for connector, stale in stale_by_connector.items():
+                if len(stale) > 1:
+                    states = connector.get_device_states(device.device_id for device in stale)
+                    for device in stale:
+                        device.apply_state(states.get(device.device_id))
+                    refreshed.update(stale)
+            # build a plain list of devices
+            device_list = []
+            for device in self.registered_devices:
+                device_list.append(self._display_model(device, poll=device not in refreshed))
 
         return {"devices": device_list}
 
@@ -234,6 +719,17 @@ class HomeAssistantClient:
         # No device found
         LOG.debug(f"No Home Assistant device exists for {device}")
 
+    def _display_model(self, device, poll: bool = True) -> dict:
+        """Get a device's display model, with its instance-qualified id.
+
+        Args:
+            device (HomeAssistantDevice): The device.
+            poll (bool): Poll the device first if its state is stale. Default True.
+        """
+        model = device.get_device_display_model(poll=poll)
+        model["id"] = self.qualified_id(device)
+        return model
+
     def _return_device_response(self, *args, device_id, **kwargs):
         """Return the device representation to the bus
 
@@ -243,8 +739,8 @@ class HomeAssistantClient:
         LOG.warning(f"Received unnecessary args: {args}")
         LOG.warning(f"Received unnecessary kwargs: {kwargs}")
         for device in self.registered_devices:
-            if device.device_id == device_id:
-                return device.get_device_display_model()
+            if self._is_device(device, device_id):
+                return self._display_model(device)
         LOG.debug(f"No device found with device ID {device_id}")
         return {}
 
@@ -257,7 +753,7 @@ class HomeAssistantClient:
         device_id, spoken_device = self._gather_device_id(message)
         if device_id is not None:
             for device in self.registered_devices:
-                if device.device_id == device_id:
+                if self._is_device(device, device_id):
                     device.turn_on()
                     return {"device": spoken_device}
         # No device found
@@ -273,7 +769,7 @@ class HomeAssistantClient:
         device_id, spoken_device = self._gather_device_id(message)
         if device_id is not None:
             for device in self.registered_devices:
-                if device.device_id == device_id:
+                if self._is_device(device, device_id):
                     device.turn_off()
                     return {"device": spoken_device}
         # No device found
@@ -308,7 +804,7 @@ class HomeAssistantClient:
         function_args = message.data.get("function_args", None)
         if device_id is not None and function_name is not None:
             for device in self.registered_devices:
-                if device.device_id == device_id:
+                if self._is_device(device, device_id):
                     if function_args is not None:
                         response = device.call_function(function_name, function_args)
                     else:
@@ -328,7 +824,7 @@ class HomeAssistantClient:
         device_id, spoken_device = self._gather_device_id(message)
         if device_id is not None:
             for device in self.registered_devices:
-                if device.device_id == device_id:
+                if self._is_device(device, device_id):
                     return {
                         "device": spoken_device,
                         "brightness": get_percentage_brightness_from_ha_value(device.get_brightness()),
@@ -347,8 +843,8 @@ class HomeAssistantClient:
         device_id, spoken_device = self._gather_device_id(message)
         if device_id is not None:
             for device in self.registered_devices:
-                if device.device_id == device_id:
-                    color = device.get_spoken_color()
+                if self._is_device(device, device_id):
+                    color = device.get_spoken_color(self.color_index)
                     return {"device": spoken_device, "color": color}
         else:
             response = "Device id not provided"
@@ -359,14 +855,18 @@ class HomeAssistantClient:
         """Handle the set light color message
 
         Args:
-            message (Message): The message object
+            message (Message): The message object, with the spoken "color" and optionally its "lang"
         """
         device_id, spoken_device = self._gather_device_id(message)
         color = message.data.get("color", "")
-        color.replace("to", "")
         for device in self.registered_devices:
-            if device.device_id == device_id:
-                device.set_color(color)
+            if self._is_device(device, device_id):
+                resolved = DEFAULT_COLOR_RESOLVER.resolve(color, message.data.get("lang"))
+                if resolved is None:
+                    response = f"Unknown color {color}"
+                    LOG.warning(response)
+                    return {"device": spoken_device, "response": response, "unknown_color": color}
+                device.set_color(resolved[0])
                 return {"device": spoken_device, "color": color}
         response = "Device id not provided"
         LOG.error(response)
@@ -381,7 +881,7 @@ class HomeAssistantClient:
         device_id, spoken_device = self._gather_device_id(message)
         brightness = message.data.get("brightness")
         for device in self.registered_devices:
-            if device.device_id == device_id:
+            if self._is_device(device, device_id):
                 device.set_brightness(brightness)
                 return {
                     "device": spoken_device,
@@ -400,12 +900,13 @@ class HomeAssistantClient:
         """
         device_id, spoken_device = self._gather_device_id(message)
         for device in self.registered_devices:
-            if device.device_id == device_id:
-                device.increase_brightness(self.brightness_increment)
-                return {
-                    "device": spoken_device,
-                    "brightness": get_percentage_brightness_from_ha_value(device.get_brightness()),
-                }
+            if self._is_device(device, device_id):
+                if self.coalescer.window > 0:
+                    brightness = self._adjust_brightness(device, self.brightness_increment)
+                else:
+                    device.increase_brightness(self.brightness_increment)
+                    brightness = get_percentage_brightness_from_ha_value(device.get_brightness())
+                return {"device": spoken_device, "brightness": brightness}
         response = "Device id not provided"
         LOG.error(response)
         return {"device": spoken_device, "response": response}
@@ -418,16 +919,89 @@ class HomeAssistantClient:
         """
         device_id, spoken_device = self._gather_device_id(message)
         for device in self.registered_devices:
-            if device.device_id == device_id:
-                device.decrease_brightness(self.brightness_increment)
-                return {
-                    "device": spoken_device,
-                    "brightness": get_percentage_brightness_from_ha_value(device.get_brightness()),
-                }
+            if self._is_device(device, device_id):
+                if self.coalescer.window > 0:
+                    brightness = self._adjust_brightness(device, -self.brightness_increment)
+                else:
+                    device.decrease_brightness(self.brightness_increment)
+                    brightness = get_percentage_brightness_from_ha_value(device.get_brightness())
+                return {"device": spoken_device, "brightness": brightness}
         response = "Device id not provided"
         LOG.error(response)
         return {"device": spoken_device, "response": response}
 
+    def _adjust_brightness(self, device, step_pct: int) -> int:
+        """Coalesce a relative brightness change into one absolute call.
+
+        Args:
+            device (HomeAssistantLight): The light to adjust.
+            step_pct (int): The change in brightness percent.
+
+        Returns:
+            int: The projected brightness percent
+        """
+        return round(
+            self.coalescer.adjust(
+                (self.qualified_id(device), "brightness"),
+                get_percentage_brightness_from_ha_value(device.get_brightness()),
+                step_pct,
+                lambda pct: device.set_brightness(get_ha_value_from_percentage_brightness(pct)),
+                lower=0,
+                upper=100,
+            )
+        )
+
+    def handle_adjust_media_volume(self, message):
+        """Handle a relative media player volume change
+
+        Args:
+            message (Message): The message object, with "volume_step" as a fraction of
+                full volume (e.g. 0.1 or -0.1)
+        """
+        device_id, spoken_device = self._gather_device_id(message)
+        step = float(message.data.get("volume_step", 0.1))
+        for device in self.registered_devices:
+            if self._is_device(device, device_id) and isinstance(device, self.device_types["media_player"]):
+                volume = self.coalescer.adjust(
+                    (self.qualified_id(device), "volume_level"),
+                    device.device_attributes.get("volume_level") or 0,
+                    step,
+                    device.set_volume_level,
+                    lower=0,
+                    upper=1,
+                )
+                return {"device": spoken_device, "volume": round(volume * 100)}
+        response = "Device id not provided"
+        LOG.error(response)
+        return {"device": spoken_device, "response": response}
+
+    def handle_adjust_climate_temperature(self, message):
+        """Handle a relative climate setpoint change
+
+        Args:
+            message (Message): The message object, with "temperature_step" in the
+                device's unit (e.g. 1 or -0.5)
+        """
+        device_id, spoken_device = self._gather_device_id(message)
+        step = float(message.data.get("temperature_step", 1))
+        for device in self.registered_devices:
+            if self._is_device(device, device_id) and isinstance(device, self.device_types["climate"]):
+                attributes = device.device_attributes
+                if attributes.get("temperature") is None:
+                    break
+                temperature = self.coalescer.adjust(
+                    (self.qualified_id(device), "temperature"),
+                    attributes["temperature"],
+                    step,
+                    device.set_temperature,
+                    lower=attributes.get("min_temp"),
+                    upper=attributes.get("max_temp"),
+                )
+                return {"device": spoken_device, "temperature": temperature}
+        response = "Device id not provided or device has no temperature setpoint"
+        LOG.error(response)
+        return {"device": spoken_device, "response": response}
+
     def handle_assist_message(self, message):
         """Handle a passthrough message to Home Assistant's Assist API.
 
@@ -444,13 +1018,33 @@ class HomeAssistantClient:
         return None
 
     # UTILS
+    @staticmethod
+    def qualified_id(device) -> str:
+        """Get the id a device is addressed by: its entity id, prefixed by its instance name off the main instance.
+
+        Args:
+            device (HomeAssistantDevice): The device.
+        """
+        name = getattr(device.connector, "name", "")
+        return f"{name}{INSTANCE_SEPARATOR}{device.device_id}" if name else device.device_id
+
+    def _is_device(self, device, device_id: str) -> bool:
+        """Check whether a device is the one a bus message refers to.
+
+        Args:
+            device (HomeAssistantDevice): The device.
+            device_id (str): An instance-qualified id, or a bare entity id, which matches the
+                first instance registering that entity.
+        """
+        return device.device_id == device_id or self.qualified_id(device) == device_id
+
     def fuzzy_match_name(self, devices_list, spoken_name, device_names) -> Optional[str]:
         """Given a list of device names, fuzzy match the spoken name to the most likely one.
         Returns the device id of the most likely match or None if no match is found.
         """
         device, score = match_one(spoken_name, device_names)
         if score > self.search_confidence_threshold:
-            return devices_list[device_names.index(device)].device_id
+            return self.qualified_id(devices_list[device_names.index(device)])
         LOG.info(f"Device name '{spoken_name}' not found, closest match is '{device}' with confidence score {score}")
         LOG.info(f"Score of {score} is too low, returning None")
         return None
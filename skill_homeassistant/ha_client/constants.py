@@ -28,3 +28,100 @@ SUPPORTED_DEVICES = {
     "scene": HomeAssistantScene,
     "automation": HomeAssistantAutomation,
 }
+
+# Seconds a device's cached state satisfies poll() before it is fetched again, per domain.
+# Overridden per domain by the poll_max_age setting; unlisted domains always poll.
+POLL_MAX_AGE = {
+    "sensor": 5,
+    "binary_sensor": 5,
+    "light": 2,
+    "switch": 2,
+    "media_player": 2,
+    "vacuum": 5,
+    "climate": 10,
+    "camera": 60,
+    "scene": 300,
+    "automation": 300,
+}
+
+# Attributes the client reads from states, i.e. every attribute a device getter reads.
+# Everything else (source_list, entity_picture, forecasts...) is left out of template
+# projections to keep the download small.
+PROJECTED_ATTRIBUTES = (
+    "friendly_name",
+    "icon",
+    "device_class",
+    "supported_features",
+    "unit_of_measurement",
+    "state_class",
+    "last_reset",
+    "native_value",
+    "native_unit_of_measurement",
+    "suggested_unit_of_measurement",
+    "brightness",
+    "color_mode",
+    "color_temp",
+    "effect",
+    "effect_list",
+    "hs_color",
+    "rgb_color",
+    "xy_color",
+    "min_mireds",
+    "max_mireds",
+    "supported_color_modes",
+    "current_position",
+    "volume_level",
+    "is_volume_muted",
+    "media_title",
+    "media_artist",
+    "media_album_name",
+    "media_series_title",
+    "media_season",
+    "media_episode",
+    "media_channel",
+    "media_content_id",
+    "media_content_type",
+    "media_duration",
+    "media_position",
+    "media_position_updated_at",
+    "app_id",
+    "app_name",
+    "temperature",
+    "current_temperature",
+    "target_temp_low",
+    "target_temp_high",
+    "target_temp_step",
+    "min_temp",
+    "max_temp",
+    "humidity",
+    "current_humidity",
+    "target_humidity",
+    "hvac_mode",
+    "hvac_modes",
+    "fan_mode",
+    "battery_level",
+    "fan_speed",
+    "fan_speed_list",
+    "status",
+)
+
+# Settings that take effect without reconnecting or rebuilding the device registry.
+# silent_entities and disable_intents are read by the skill, not the client.
+RUNTIME_SETTINGS = frozenset(
+    {
+        "brightness_increment",
+        "search_confidence_threshold",
+        "toggle_automations",
+        "adjustment_window",
+        "color_palette",
+        "color_match_distance",
+        "state_fetch",
+        "fetch_deadline",
+        "silent_entities",
+        "disable_intents",
+    }
+)
+
+# Settings that change which entities are registered, applied by refetching states over
+# the existing connections. Any setting in neither set reconnects to Home Assistant.
+REGISTRY_SETTINGS = frozenset({"entity_filter", "assist_only"})
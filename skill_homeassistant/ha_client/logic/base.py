@@ -5,7 +5,9 @@ It defines the interface that concrete connector implementations must follow.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Container, Dict, Iterable, Iterator, List, Optional
+
+from skill_homeassistant.ha_client.logic.listeners import ListenerRegistry
 
 
 class HomeAssistantConnector(ABC):
@@ -14,7 +16,17 @@ class HomeAssistantConnector(ABC):
     Defines the interface for Home Assistant connector implementations.
     """
 
-    def __init__(self, host, api_key, assist_only=True, verify_ssl=True, timeout=3):
+    def __init__(
+        self,
+        host,
+        api_key,
+        assist_only=True,
+        verify_ssl=True,
+        timeout=3,
+        state_max_age=0,
+        poll_max_age=None,
+        name="",
+    ):
         """Constructor
 
         Args:
@@ -23,13 +35,22 @@ class HomeAssistantConnector(ABC):
             assist_only (bool): Whether to only pull entities exposed to Assist. Default True.
             verify_ssl (bool): Whether to verify SSL certificates. Default True.
             timeout (int): The timeout for requests. Default 3 seconds.
+            state_max_age (float): Seconds a device's cached state is trusted to skip
+                service calls that would not change it. Default 0 never skips.
+            poll_max_age (dict): Seconds a device's cached state satisfies a poll, per domain.
+                Default None polls every time.
+            name (str): The instance name, qualifying entity ids when several instances are
+                configured. Default "" for the main instance.
         """
         self.host = host
         self.api_key = api_key
         self.assist_only = assist_only
-        self.event_listeners = {}
+        self.event_listeners = ListenerRegistry()
         self.timeout = timeout
         self.verify_ssl = verify_ssl
+        self.state_max_age = state_max_age
+        self.poll_max_age = poll_max_age or {}
+        self.name = name
 
     @abstractmethod
     def get_all_devices(self) -> List[dict]:
@@ -38,6 +59,67 @@ class HomeAssistantConnector(ABC):
         """
         raise NotImplementedError
 
+    def iter_all_devices(self, domains: Optional[Container[str]] = None) -> Iterator[dict]:
+        """
+        Iterate over all devices. Connectors that can parse the state list
+        incrementally should override this; the default walks get_all_devices().
+        Args:
+            domains (Container[str]): Only yield entities of these domains. Default None yields all.
+        """
+        for device in self.get_all_devices():
+            if domains is None or device["entity_id"].split(".")[0] in domains:
+                yield device
+
+    def get_all_devices_projected(self, domains: Iterable[str], attributes: Iterable[str]) -> Optional[List[dict]]:
+        """
+        Get all devices of the given domains carrying only the given attributes.
+        Returns None when the connector cannot project states, so callers fall back to get_all_devices().
+        Args:
+            domains (Iterable[str]): The device types to include.
+            attributes (Iterable[str]): The attribute names to include.
+        """
+        return None
+
+    def get_exposed_entities(self, refresh: bool = False) -> Optional[Container[str]]:
+        """
+        Get the ids of the entities exposed to Assist.
+        Returns None when the connector cannot tell, in which case every entity is used.
+        Args:
+            refresh (bool): Fetch the list again instead of using a cached copy.
+        """
+        return None
+
+    def get_entity_areas(self) -> Optional[Dict[str, str]]:
+        """
+        Get the area id of every entity assigned to an area, keyed by entity id.
+        Returns None when the connector cannot resolve areas.
+        """
+        return None
+
+    def get_entity_integrations(self, integrations: Iterable[str]) -> Optional[Dict[str, List[str]]]:
+        """
+        Get the entities provided by some integrations, as entity id -> the integrations providing it.
+        Returns None when the connector cannot resolve integrations.
+        Args:
+            integrations (Iterable[str]): Integration names.
+        """
+        return None
+
+    def get_device_states(self, entity_ids: Iterable[str]) -> Dict[str, dict]:
+        """
+        Get the states of several devices, keyed by entity id.
+        Connectors that can fetch many states in one request should override this;
+        the default calls get_device_state() for each entity.
+        Args:
+            entity_ids (Iterable[str]): The ids of the devices.
+        """
+        states = {}
+        for entity_id in entity_ids:
+            state = self.get_device_state(entity_id)
+            if isinstance(state, dict) and state:
+                states[entity_id] = state
+        return states
+
     @abstractmethod
     def get_device_state(self, entity_id: str):
         """
@@ -141,3 +223,13 @@ class HomeAssistantConnector(ABC):
             callback (function): The callback to call.
         """
         raise NotImplementedError
+
+    @abstractmethod
+    def unregister_callback(self, device_id, callback):
+        """Unregister a callback registered with register_callback.
+
+        Args:
+            device_id (str): The id of the device.
+            callback (function): The registered callback.
+        """
+        raise NotImplementedError
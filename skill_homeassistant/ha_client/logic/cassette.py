@@ -0,0 +1,251 @@
+"""Home Assistant Record/Replay Connector Module.
+
+This module provides a REST connector that records the HTTP and WebSocket exchanges
+it makes with Home Assistant to a cassette file, and one that serves them back
+without a network. Recorded latencies can be replayed as they were, scaled, or
+dropped, so benchmarks and tests run deterministically against realistic payloads.
+The API key and host are never written: requests are keyed by method, path and body,
+with JSON bodies in canonical form so that the codec or key order a body was written
+with does not stop it matching. Named JSON fields can be redacted from everything that
+is recorded, e.g. entity names or locations, before a cassette is shared.
+"""
+
+import base64
+import hashlib
+import json
+import os
+from collections import defaultdict, deque
+from threading import Lock
+from time import perf_counter, sleep
+from typing import Any, Callable, Deque, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import requests
+from ovos_utils.log import LOG
+
+from skill_homeassistant.ha_client.logic.connector import HomeAssistantRESTConnector
+
+CASSETTE_VERSION = 1
+CASSETTE_MODES = ("record", "replay")
+
+_Key = Tuple[str, str, str]
+
+
+class CassetteMiss(requests.exceptions.RequestException):
+    """No recorded exchange matches a request being replayed."""
+
+
+def _encode_body(content: bytes) -> Dict[str, str]:
+    try:
+        return {"body": content.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"body_base64": base64.b64encode(content).decode("ascii")}
+
+
+def _decode_body(data: dict) -> bytes:
+    if "body_base64" in data:
+        return base64.b64decode(data["body_base64"])
+    return data.get("body", "").encode("utf-8")
+
+
+def _redact(data: Any, fields: FrozenSet[str]) -> Any:
+    """Replace the values of the named fields anywhere in a JSON document.
+
+    A value is replaced by a digest of itself rather than a constant, so that entities
+    stay distinct from each other and the same value reads the same everywhere.
+    """
+    if isinstance(data, dict):
+        return {key: _pseudonym(value) if key in fields else _redact(value, fields) for key, value in data.items()}
+    if isinstance(data, list):
+        return [_redact(value, fields) for value in data]
+    return data
+
+
+def _pseudonym(value: Any) -> str:
+    digest = hashlib.sha256(json.dumps(value, sort_keys=True).encode("utf-8")).hexdigest()
+    return f"redacted-{digest[:12]}"
+
+
+def _replayed_response(url: str, data: dict) -> requests.Response:
+    """Build a complete, already-read requests.Response from a recorded one."""
+    response = requests.Response()
+    response.status_code = data["status"]
+    response.url = url
+    response.headers.update(data.get("headers", {}))
+    response._content = _decode_body(data)  # pylint: disable=protected-access
+    response._content_consumed = True  # pylint: disable=protected-access
+    return response
+
+
+class CassetteConnector(HomeAssistantRESTConnector):
+    """REST connector that records its exchanges to, or replays them from, a cassette file."""
+
+    def __init__(
+        self,
+        *args,
+        cassette_path: str,
+        mode: str = "replay",
+        latency_scale: float = 0,
+        scrub: Optional[Callable[[str, bytes], bytes]] = None,
+        redact: Iterable[str] = (),
+        **kwargs,
+    ):
+        """Constructor
+
+        Args:
+            cassette_path (str): The cassette file.
+            mode (str): "record" sends requests to Home Assistant and saves them,
+                "replay" answers them from the cassette without a network. Default "replay".
+            latency_scale (float): Replay mode only: 1 waits as long as the recorded
+                exchange took, 0 (default) answers immediately.
+            scrub (Callable): Anonymises a request or response body, or a WebSocket
+                result, before it is saved, given the request path and the body.
+                Replay applies it to requests too, so they match the recorded ones.
+            redact (Iterable[str]): Names of JSON fields whose values are replaced in
+                everything saved, e.g. ["friendly_name", "latitude"]; applied before scrub.
+        """
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode {mode}")
+        super().__init__(*args, **kwargs)
+        self.cassette_path = cassette_path
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.scrub = scrub
+        self.redact = frozenset(redact or ())
+        self._interactions: List[dict] = []
+        self._replay: Dict[_Key, Deque[dict]] = defaultdict(deque)
+        self._cassette_lock = Lock()
+        if mode == "replay":
+            self._load()
+
+    @staticmethod
+    def _key(method: str, path: str, body) -> _Key:
+        if isinstance(body, bytes):
+            body = body.decode("utf-8")
+        if body:
+            try:
+                body = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":"))
+            except ValueError:
+                pass
+        return (method, path, body or "")
+
+    def _request_key(self, method: str, path: str, body) -> _Key:
+        """Key a request as it is saved, with its body anonymised."""
+        method, path, body = self._key(method, path, body)
+        if body:
+            body = self._anonymise(path, body.encode("utf-8")).decode("utf-8")
+        return self._key(method, path, body)
+
+    def _anonymise(self, path: str, content: bytes) -> bytes:
+        """Redact the configured fields of a JSON body, then apply the scrub hook."""
+        if self.redact:
+            try:
+                content = json.dumps(_redact(json.loads(content), self.redact)).encode("utf-8")
+            except ValueError:
+                pass  # Not JSON: only the scrub hook applies
+        if self.scrub is not None:
+            content = self.scrub(path, content)
+        return content
+
+    def _load(self) -> None:
+        """Load the exchanges to replay; a missing or broken cassette replays nothing, so every request misses."""
+        try:
+            with open(self.cassette_path, encoding="utf-8") as cassette_file:
+                interactions = json.load(cassette_file)["interactions"]
+            keys = [
+                self._key(
+                    interaction["request"]["method"],
+                    interaction["request"]["path"],
+                    interaction["request"].get("body"),
+                )
+                for interaction in interactions
+            ]
+        except (OSError, ValueError, KeyError, TypeError) as error:
+            LOG.error(f"Could not load cassette {self.cassette_path}, replaying nothing: {error!r}")
+            return
+        for key, interaction in zip(keys, interactions):
+            self._replay[key].append(interaction)
+
+    def _next_interaction(self, key: _Key) -> dict:
+        """Take the next recorded exchange for a request; the last one repeats once the rest are used up."""
+        with self._cassette_lock:
+            interactions = self._replay.get(key)
+            if not interactions:
+                raise CassetteMiss(f"No recorded response for {key[0]} {key[1]}")
+            return interactions.popleft() if len(interactions) > 1 else interactions[0]
+
+    def _wait(self, interaction: dict) -> None:
+        if self.latency_scale > 0:
+            sleep(interaction["elapsed"] * self.latency_scale)
+
+    def _record(self, key: _Key, response_data: dict, elapsed: float) -> None:
+        with self._cassette_lock:
+            self._interactions.append(
+                {
+                    "request": {"method": key[0], "path": key[1], "body": key[2]},
+                    "response": response_data,
+                    "elapsed": round(elapsed, 6),
+                }
+            )
+
+    def _replay_response(self, key: _Key, url: str) -> requests.Response:
+        interaction = self._next_interaction(key)
+        self._wait(interaction)
+        return _replayed_response(url, interaction["response"])
+
+    def _record_response(self, key: _Key, response: requests.Response, started: float) -> None:
+        content = response.content  # Reads streamed bodies in full, so the timing covers the download
+        elapsed = perf_counter() - started
+        content = self._anonymise(key[1], content)
+        content_type = response.headers.get("Content-Type")
+        headers = {"Content-Type": content_type} if content_type else {}
+        self._record(key, {"status": response.status_code, "headers": headers, **_encode_body(content)}, elapsed)
+
+    def _send(self, method, endpoint, path, kwargs):
+        key = self._request_key(method, path, kwargs.get("data"))
+        if self.mode == "replay":
+            return self._replay_response(key, self.host + path)
+        started = perf_counter()
+        response = super()._send(method, endpoint, path, kwargs)
+        self._record_response(key, response, started)
+        return response
+
+    def _get_from(self, url, path, timeout):
+        key = self._request_key("GET", path, None)
+        if self.mode == "replay":
+            return self._replay_response(key, url + path)
+        started = perf_counter()
+        response = super()._get_from(url, path, timeout)
+        self._record_response(key, response, started)
+        return response
+
+    def _ws_command(self, command):
+        key = self._request_key("WS", command["type"], json.dumps(command, sort_keys=True))
+        if self.mode == "replay":
+            interaction = self._next_interaction(key)
+            self._wait(interaction)
+            return interaction["response"]["result"]
+        started = perf_counter()
+        result = super()._ws_command(command)
+        elapsed = perf_counter() - started
+        recorded = result
+        if self.redact or self.scrub is not None:
+            recorded = json.loads(self._anonymise(key[1], json.dumps(result).encode("utf-8")))
+        self._record(key, {"result": recorded}, elapsed)
+        return result
+
+    def save(self) -> None:
+        """Write the exchanges recorded so far to the cassette file."""
+        if self.mode != "record":
+            return
+        with self._cassette_lock:
+            cassette = {"version": CASSETTE_VERSION, "interactions": list(self._interactions)}
+        os.makedirs(os.path.dirname(self.cassette_path) or ".", exist_ok=True)
+        temporary = self.cassette_path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as cassette_file:
+            json.dump(cassette, cassette_file)
+        os.replace(temporary, self.cassette_path)
+
+    def close(self):
+        """Save the cassette when recording, then close the connector."""
+        self.save()
+        super().close()
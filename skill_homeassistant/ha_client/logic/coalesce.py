@@ -0,0 +1,105 @@
+"""Home Assistant Adjustment Coalescing Module.
+
+This module merges rapid relative adjustments to the same entity ("brighter...
+brighter... brighter") into a single absolute service call. Each adjustment is
+applied to the value projected by the previous ones, and the call is sent once no
+further adjustment has arrived within the window.
+"""
+
+from threading import Lock, Timer
+from typing import Callable, Dict, Hashable, Optional
+
+from ovos_utils.log import LOG
+
+
+class _PendingAdjustment:
+    __slots__ = ("value", "apply", "timer")
+
+    def __init__(self, value: float, apply: Callable[[float], None]):
+        self.value = value
+        self.apply = apply
+        self.timer: Optional[Timer] = None
+
+
+class AdjustmentCoalescer:
+    """Per-key debounce of relative adjustments into absolute updates."""
+
+    def __init__(self, window: float = 0):
+        """Constructor
+
+        Args:
+            window (float): Seconds to wait for further adjustments before sending the
+                merged value. 0 (default) applies every adjustment immediately.
+        """
+        self.window = window
+        self._pending: Dict[Hashable, _PendingAdjustment] = {}
+        self._lock = Lock()
+
+    def adjust(
+        self,
+        key: Hashable,
+        current: float,
+        delta: float,
+        apply: Callable[[float], None],
+        lower: Optional[float] = None,
+        upper: Optional[float] = None,
+    ) -> float:
+        """Queue a relative adjustment.
+
+        Args:
+            key (Hashable): Identifies the value being adjusted, e.g. (entity_id, "brightness").
+            current (float): The last known value, used when nothing is pending for the key.
+            delta (float): The relative change.
+            apply (Callable): Sends the absolute value; called from a timer thread when a
+                window is set.
+            lower (float): Optional lower bound for the projected value.
+            upper (float): Optional upper bound for the projected value.
+
+        Returns:
+            float: The projected value after this adjustment
+        """
+        window = self.window
+        with self._lock:
+            pending = self._pending.pop(key, None)
+            if pending is not None:
+                pending.timer.cancel()
+                current = pending.value
+            value = current + delta
+            if lower is not None:
+                value = max(lower, value)
+            if upper is not None:
+                value = min(upper, value)
+            if window > 0:
+                pending = self._pending[key] = _PendingAdjustment(value, apply)
+                pending.timer = Timer(window, self._flush, (key, pending))
+                pending.timer.daemon = True
+                pending.timer.start()
+        if window <= 0:
+            apply(value)
+        return value
+
+    def pending_value(self, key: Hashable) -> Optional[float]:
+        """Get the projected value of a key that has not been sent yet, or None."""
+        with self._lock:
+            pending = self._pending.get(key)
+            return None if pending is None else pending.value
+
+    def _flush(self, key: Hashable, pending: _PendingAdjustment) -> None:
+        with self._lock:
+            # A timer that fired while a newer adjustment replaced it must not send
+            if self._pending.get(key) is not pending:
+                return
+            del self._pending[key]
+        try:
+            pending.apply(pending.value)
+        except Exception:  # pylint: disable=broad-exception-caught
+            LOG.exception(f"Error applying coalesced adjustment for {key}")
+
+    def flush(self) -> None:
+        """Send every pending adjustment now."""
+        with self._lock:
+            pending = list(self._pending.items())
+            for _, adjustment in pending:
+                adjustment.timer.cancel()
+        for key, adjustment in pending:
+            self._flush(key, adjustment)
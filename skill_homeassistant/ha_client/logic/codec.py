@@ -0,0 +1,82 @@
+"""Home Assistant JSON Codec Module.
+
+This module picks the JSON implementation used by the connectors. orjson and
+msgspec are used when installed, with the standard library as the fallback.
+Every codec decodes straight from the response bytes and encodes straight to
+bytes, so no intermediate str copy of a payload is made.
+"""
+
+import json
+from typing import Any, Callable, Optional, Tuple, Type
+
+CODEC_PREFERENCE = ("orjson", "msgspec", "json")
+
+
+class JSONCodec:
+    """A bytes-in, bytes-out JSON implementation."""
+
+    __slots__ = ("name", "loads", "dumps", "decode_errors")
+
+    def __init__(
+        self,
+        name: str,
+        loads: Callable[[bytes], Any],
+        dumps: Callable[[Any], bytes],
+        decode_errors: Tuple[Type[Exception], ...] = (ValueError,),
+    ):
+        """Constructor
+
+        Args:
+            name (str): The name of the backing library.
+            loads (Callable): Decodes bytes to Python objects.
+            dumps (Callable): Encodes Python objects to bytes.
+            decode_errors (tuple): The exceptions loads raises on malformed input.
+        """
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+        self.decode_errors = decode_errors
+
+    def __repr__(self):
+        return f"JSONCodec({self.name})"
+
+
+def _orjson_codec() -> JSONCodec:
+    import orjson
+
+    return JSONCodec("orjson", orjson.loads, orjson.dumps, (orjson.JSONDecodeError,))
+
+
+def _msgspec_codec() -> JSONCodec:
+    import msgspec
+
+    return JSONCodec("msgspec", msgspec.json.decode, msgspec.json.encode, (msgspec.DecodeError,))
+
+
+def _stdlib_codec() -> JSONCodec:
+    return JSONCodec("json", json.loads, lambda obj: json.dumps(obj).encode("utf-8"), (ValueError,))
+
+
+_FACTORIES = {"orjson": _orjson_codec, "msgspec": _msgspec_codec, "json": _stdlib_codec}
+
+
+def get_codec(name: Optional[str] = None) -> JSONCodec:
+    """Get a JSON codec.
+
+    Args:
+        name (str): "orjson", "msgspec" or "json". Default None (or "auto") picks the
+            first installed library in CODEC_PREFERENCE.
+
+    Returns:
+        JSONCodec: The requested codec, or the stdlib codec if the library is not installed
+    """
+    candidates = CODEC_PREFERENCE if name in (None, "auto") else (name, "json")
+    for candidate in candidates:
+        try:
+            return _FACTORIES[candidate]()
+        except (ImportError, KeyError):
+            continue
+    return _stdlib_codec()
+
+
+DEFAULT_CODEC = get_codec()
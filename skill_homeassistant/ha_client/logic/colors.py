@@ -0,0 +1,281 @@
+"""Home Assistant Colour Naming Module.
+
+This module names light colours by perceptual distance rather than exact RGB match.
+Palette colours are converted to CIELAB once and stored in a small KD-tree, so the
+nearest name for a bulb's ``rgb_color`` is found with a handful of comparisons.
+It also resolves spoken colour names, including localised ones, to RGB values.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from math import sqrt
+from os.path import dirname, isfile, join
+from threading import Lock
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+from ovos_utils.log import LOG
+from ovos_utils.parse import match_one
+from webcolors import hex_to_rgb, name_to_rgb, names, rgb_to_name
+
+Lab = Tuple[float, float, float]
+
+# CIE76 distance beyond which a colour is read out as an RGB code instead of a name.
+# About 2.3 is a just-noticeable difference; 20 still reads as "the same colour".
+DEFAULT_COLOR_DISTANCE = 20.0
+
+# Named colours every CSS3 colour resolves to, one name per RGB value
+CSS3_PALETTE: Dict[str, Tuple[int, int, int]] = {
+    rgb_to_name(name_to_rgb(name)): tuple(name_to_rgb(name)) for name in names("css3")
+}
+
+# Colours smart bulbs are commonly set to that CSS3 has no name for
+BULB_PALETTE: Dict[str, Tuple[int, int, int]] = {
+    "candlelight": (255, 147, 41),
+    "warm white": (255, 197, 143),
+    "soft white": (255, 214, 170),
+    "neutral white": (255, 241, 224),
+    "cool white": (212, 235, 255),
+    "daylight": (201, 226, 255),
+    "amber": (255, 191, 0),
+    "rose": (255, 0, 127),
+    "mint": (62, 180, 137),
+    "lilac": (200, 162, 200),
+    "peach": (255, 229, 180),
+    "sunset": (253, 94, 83),
+}
+
+PALETTES = {
+    "css3": CSS3_PALETTE,
+    "extended": {**CSS3_PALETTE, **BULB_PALETTE},
+}
+
+
+def _linear(channel: float) -> float:
+    channel /= 255
+    return channel / 12.92 if channel <= 0.04045 else ((channel + 0.055) / 1.055) ** 2.4
+
+
+def _lab_f(value: float) -> float:
+    return value ** (1 / 3) if value > 216 / 24389 else (24389 / 27 * value + 16) / 116
+
+
+def rgb_to_lab(rgb: Sequence[int]) -> Lab:
+    """Convert an sRGB triple to CIELAB (D65 white point).
+
+    Args:
+        rgb (Sequence[int]): Red, green and blue from 0 to 255.
+    """
+    red, green, blue = (_linear(channel) for channel in rgb)
+    x = (0.4124 * red + 0.3576 * green + 0.1805 * blue) / 0.95047
+    y = 0.2126 * red + 0.7152 * green + 0.0722 * blue
+    z = (0.0193 * red + 0.1192 * green + 0.9505 * blue) / 1.08883
+    fx, fy, fz = _lab_f(x), _lab_f(y), _lab_f(z)
+    return (116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz))
+
+
+class _Node:
+    __slots__ = ("point", "name", "axis", "left", "right")
+
+    def __init__(self, point: Lab, name: str, axis: int, left, right):
+        self.point = point
+        self.name = name
+        self.axis = axis
+        self.left = left
+        self.right = right
+
+
+def _build(entries: Sequence[Tuple[Lab, str]], depth: int = 0) -> Optional[_Node]:
+    if not entries:
+        return None
+    axis = depth % 3
+    entries = sorted(entries, key=lambda entry: entry[0][axis])
+    middle = len(entries) // 2
+    point, name = entries[middle]
+    return _Node(point, name, axis, _build(entries[:middle], depth + 1), _build(entries[middle + 1 :], depth + 1))
+
+
+class ColorIndex:
+    """Nearest-name lookup over a palette in CIELAB space."""
+
+    __slots__ = ("_root", "max_distance", "size")
+
+    def __init__(self, palette: Dict[str, Sequence[int]], max_distance: float = DEFAULT_COLOR_DISTANCE):
+        """Constructor
+
+        Args:
+            palette (dict): Colour name to RGB triple.
+            max_distance (float): CIE76 distance beyond which no name is returned.
+        """
+        self._root = _build([(rgb_to_lab(rgb), name) for name, rgb in palette.items()])
+        self.max_distance = max_distance
+        self.size = len(palette)
+
+    def nearest(self, rgb: Iterable[int]) -> Tuple[Optional[str], float]:
+        """Find the palette colour closest to an RGB triple.
+
+        Args:
+            rgb (Iterable[int]): Red, green and blue from 0 to 255.
+
+        Returns:
+            tuple: The colour name and its CIE76 distance
+        """
+        target = rgb_to_lab(tuple(rgb))
+        lightness, green_red, blue_yellow = target
+        best_name, best_squared = None, float("inf")
+        # Each entry carries the squared distance from the target to its splitting plane
+        stack = [(self._root, 0.0)]
+        while stack:
+            node, plane_squared = stack.pop()
+            if node is None or plane_squared >= best_squared:
+                continue
+            point = node.point
+            squared = (point[0] - lightness) ** 2 + (point[1] - green_red) ** 2 + (point[2] - blue_yellow) ** 2
+            if squared < best_squared:
+                best_name, best_squared = node.name, squared
+            offset = target[node.axis] - node.point[node.axis]
+            near, far = (node.left, node.right) if offset < 0 else (node.right, node.left)
+            stack.append((far, offset * offset))
+            stack.append((near, 0.0))
+        return best_name, sqrt(best_squared)
+
+    def name(self, rgb: Iterable[int]) -> Optional[str]:
+        """Get the name of the closest palette colour, or None if it is beyond max_distance.
+
+        Args:
+            rgb (Iterable[int]): Red, green and blue from 0 to 255.
+        """
+        name, distance = self.nearest(rgb)
+        return name if distance <= self.max_distance else None
+
+
+@lru_cache(maxsize=None)
+def get_color_index(palette: str = "css3", max_distance: float = DEFAULT_COLOR_DISTANCE) -> ColorIndex:
+    """Get the shared index for a palette, building it on first use.
+
+    Args:
+        palette (str): "css3" (default) or "extended" to add common bulb colours.
+            Unknown palettes fall back to "css3".
+        max_distance (float): CIE76 distance beyond which no name is returned.
+    """
+    return ColorIndex(PALETTES.get(palette, CSS3_PALETTE), max_distance)
+
+
+DEFAULT_COLOR_INDEX = get_color_index()
+
+
+LOCALE_DIR = join(dirname(dirname(dirname(__file__))), "locale")
+COLOR_VOCABULARY = join("vocab", "colors.value")
+
+# Minimum similarity for a misheard colour name to resolve to the closest known one
+DEFAULT_FUZZY_THRESHOLD = 0.8
+
+_NOISE = re.compile(r"\b(?:the|colou?r)\b|[^\w#]|_")
+
+
+def normalize_color_name(text: str) -> str:
+    """Normalise a spoken colour name for lookup: "The Light-Blue colour" becomes "lightblue".
+
+    Args:
+        text (str): The colour as transcribed.
+    """
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return _NOISE.sub("", text)
+
+
+class ColorResolver:
+    """Resolves spoken colour names to RGB, with per-language vocabularies and a fuzzy fallback."""
+
+    def __init__(
+        self, locale_dir: str = LOCALE_DIR, fuzzy_threshold: float = DEFAULT_FUZZY_THRESHOLD, cache_size: int = 256
+    ):
+        """Constructor
+
+        Args:
+            locale_dir (str): Directory holding <lang>/vocab/colors.value files.
+            fuzzy_threshold (float): Minimum similarity, from 0 to 1, for a fuzzy match.
+            cache_size (int): How many resolved (text, language) pairs to remember.
+        """
+        self.locale_dir = locale_dir
+        self.fuzzy_threshold = fuzzy_threshold
+        # Every CSS3 spelling (grey and gray, aqua and cyan...) plus the bulb colours
+        self._names: Dict[str, Tuple[str, Tuple[int, int, int]]] = {
+            normalize_color_name(name): (name, tuple(name_to_rgb(name))) for name in names("css3")
+        }
+        for name, rgb in BULB_PALETTE.items():
+            self._names[normalize_color_name(name)] = (name, rgb)
+        self._vocabularies: Dict[str, Dict[str, Tuple[str, Tuple[int, int, int]]]] = {}
+        self._vocabulary_lock = Lock()
+        self.resolve = lru_cache(maxsize=cache_size)(self._resolve)
+
+    def _lookup(self, text: str) -> Optional[Tuple[str, Tuple[int, int, int]]]:
+        if text.startswith("#"):
+            try:
+                return text, tuple(hex_to_rgb(text))
+            except ValueError:
+                return None
+        return self._names.get(text)
+
+    def _language_dir(self, lang: str) -> Optional[str]:
+        lang = lang.lower()
+        if isfile(join(self.locale_dir, lang, COLOR_VOCABULARY)):
+            return lang
+        prefix = lang.split("-")[0]
+        for candidate in (f"{prefix}-{prefix}", prefix):
+            if isfile(join(self.locale_dir, candidate, COLOR_VOCABULARY)):
+                return candidate
+        return None
+
+    def vocabulary(self, lang: str) -> Dict[str, Tuple[str, Tuple[int, int, int]]]:
+        """Get the localised colour words of a language, loading them on first use.
+
+        Each line of colors.value is "<word>,<colour name or #hex>".
+
+        Args:
+            lang (str): The language code, e.g. "es-es".
+        """
+        with self._vocabulary_lock:
+            if lang in self._vocabularies:
+                return self._vocabularies[lang]
+            vocabulary = {}
+            language_dir = self._language_dir(lang)
+            if language_dir is not None:
+                with open(join(self.locale_dir, language_dir, COLOR_VOCABULARY), encoding="utf-8") as value_file:
+                    for line in value_file:
+                        word, _, target = line.partition(",")
+                        if not target or line.startswith("#"):
+                            continue
+                        resolved = self._lookup(normalize_color_name(target))
+                        if resolved is None:
+                            LOG.warning(f"Unknown color {target.strip()} in {language_dir} color vocabulary")
+                            continue
+                        vocabulary[normalize_color_name(word)] = resolved
+            self._vocabularies[lang] = vocabulary
+            return vocabulary
+
+    def _resolve(self, text: str, lang: Optional[str] = None) -> Optional[Tuple[str, Tuple[int, int, int]]]:
+        """Resolve a spoken colour name; memoised per instance as resolve().
+
+        Args:
+            text (str): The colour as transcribed, e.g. "light blue" or "rojo".
+            lang (str): The language of the text. Default None uses English names only.
+
+        Returns:
+            tuple: The canonical colour name and its RGB triple, or None if nothing matches
+        """
+        key = normalize_color_name(text)
+        if not key:
+            return None
+        vocabulary = self.vocabulary(lang) if lang else {}
+        resolved = vocabulary.get(key) or self._lookup(key)
+        if resolved is not None:
+            return resolved
+        candidates = {**self._names, **vocabulary}
+        best, score = match_one(key, list(candidates))
+        if score >= self.fuzzy_threshold:
+            return candidates[best]
+        return None
+
+
+DEFAULT_COLOR_RESOLVER = ColorResolver()
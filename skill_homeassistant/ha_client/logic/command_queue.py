@@ -0,0 +1,233 @@
+"""Home Assistant Offline Command Queue Module.
+
+This module holds service calls that failed because Home Assistant could not be
+reached, typically while it restarts after an update. Commands are kept in order,
+bounded in number and age, and optionally persisted to a JSON file so they survive
+a restart of the assistant too. Before a replay, commands superseded by a later one
+for the same entity are dropped: turn_on, turn_off and toggle replace each other,
+with consecutive turn_on arguments merged, and any other service replaces an
+earlier call of the same service.
+"""
+
+import json
+import os
+from threading import Lock
+from time import time
+from typing import Any, Callable, Dict, List, Optional
+
+from ovos_utils.log import LOG
+from ovos_utils.xdg_utils import xdg_state_home
+
+POWER_SERVICES = frozenset({"turn_on", "turn_off", "toggle"})
+DEFAULT_QUEUE_PATH = os.path.join(xdg_state_home(), "skill-homeassistant", "offline_queue.json")
+
+
+class QueuedCommand:
+    """A service call waiting for Home Assistant to come back."""
+
+    __slots__ = ("entity_id", "domain", "service", "arguments", "expires", "instance")
+
+    def __init__(
+        self, entity_id: str, domain: str, service: str, arguments: Optional[dict], expires: float, instance: str = ""
+    ):
+        """Constructor
+
+        Args:
+            entity_id (str): The target entity.
+            domain (str): The service domain, e.g. "light".
+            service (str): The service, e.g. "turn_on".
+            arguments (dict): Extra service data, or None.
+            expires (float): Epoch seconds after which the command is dropped.
+            instance (str): The name of the Home Assistant instance the entity belongs to.
+        """
+        self.entity_id = entity_id
+        self.domain = domain
+        self.service = service
+        self.arguments = arguments
+        self.expires = expires
+        self.instance = instance
+
+    @property
+    def supersedes_key(self):
+        """Commands with the same key replace each other."""
+        return (self.instance, self.entity_id, "power" if self.service in POWER_SERVICES else self.service)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialise for the persisted queue."""
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QueuedCommand":
+        """Deserialise from the persisted queue."""
+        return cls(
+            data["entity_id"],
+            data["domain"],
+            data["service"],
+            data.get("arguments"),
+            data["expires"],
+            data.get("instance", ""),
+        )
+
+
+class CommandQueue:
+    """Bounded, optionally persisted FIFO of service calls to replay on reconnect."""
+
+    def __init__(self, max_size: int = 50, ttl: float = 300, path: Optional[str] = None, retry_interval: float = 5):
+        """Constructor
+
+        Args:
+            max_size (int): Most commands held; the oldest is dropped when full.
+            ttl (float): Seconds a command stays worth sending.
+            path (str): JSON file the queue is persisted to. Default None keeps it in memory.
+            retry_interval (float): Seconds between reachability checks while commands are queued.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.path = path
+        self.retry_interval = retry_interval
+        # Called after a command is queued, e.g. to start watching for Home Assistant to return
+        self.on_add: Optional[Callable[[], None]] = None
+        self._commands: List[QueuedCommand] = []
+        self._lock = Lock()
+        self.stats = {"queued": 0, "replayed": 0, "expired": 0, "dropped": 0, "superseded": 0, "failed": 0}
+        self._load()
+
+    @classmethod
+    def from_config(cls, config: Any) -> Optional["CommandQueue"]:
+        """Build from the ``offline_queue`` setting.
+
+        Args:
+            config: False or None to disable, True for the defaults, or a dict with
+                max_size, ttl, retry_interval and path ("" keeps the queue in memory).
+        """
+        if not config:
+            return None
+        if not isinstance(config, dict):
+            config = {}
+        return cls(
+            max_size=int(config.get("max_size", 50)),
+            ttl=float(config.get("ttl", 300)),
+            path=config.get("path", DEFAULT_QUEUE_PATH) or None,
+            retry_interval=float(config.get("retry_interval", 5)),
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._commands)
+
+    def add(
+        self, entity_id: str, domain: str, service: str, arguments: Optional[dict] = None, instance: str = ""
+    ) -> None:
+        """Queue a service call that could not be sent.
+
+        Args:
+            entity_id (str): The target entity.
+            domain (str): The service domain.
+            service (str): The service.
+            arguments (dict): Extra service data, or None.
+            instance (str): The name of the Home Assistant instance the entity belongs to.
+        """
+        arguments = dict(arguments) if arguments else None
+        command = QueuedCommand(entity_id, domain, service, arguments, time() + self.ttl, instance)
+        with self._lock:
+            self._commands.append(command)
+            self.stats["queued"] += 1
+            if len(self._commands) > self.max_size:
+                dropped = self._commands.pop(0)
+                self.stats["dropped"] += 1
+                LOG.warning(f"Offline command queue full, dropped {dropped.service} for {dropped.entity_id}")
+            self._save()
+        LOG.info(f"Home Assistant unreachable, queued {service} for {entity_id}")
+        if self.on_add is not None:
+            self.on_add()
+
+    def pending(self) -> List[QueuedCommand]:
+        """Remove expired and superseded commands and return what is left, in order."""
+        now = time()
+        with self._lock:
+            latest: Dict[Any, QueuedCommand] = {}
+            kept: List[QueuedCommand] = []
+            for command in self._commands:
+                if command.expires < now:
+                    self.stats["expired"] += 1
+                    continue
+                previous = latest.get(command.supersedes_key)
+                if previous is not None:
+                    kept.remove(previous)
+                    self.stats["superseded"] += 1
+                    if previous.service == command.service == "turn_on" and previous.arguments:
+                        command.arguments = {**previous.arguments, **(command.arguments or {})}
+                latest[command.supersedes_key] = command
+                kept.append(command)
+            self._commands = kept
+            self._save()
+            return list(kept)
+
+    def replay(self, send: Callable[[QueuedCommand], bool]) -> int:
+        """Send the pending commands in order.
+
+        Once a command finds its instance unreachable, it and the later commands for
+        that instance are kept for the next attempt; other instances carry on. Commands
+        failing for any other reason are logged and dropped.
+
+        Args:
+            send (Callable): Sends one command; returns False if Home Assistant is unreachable.
+
+        Returns:
+            int: The number of commands sent
+        """
+        sent = 0
+        unreachable = set()
+        for command in self.pending():
+            if command.instance in unreachable:
+                continue
+            try:
+                if not send(command):
+                    LOG.info(f"Home Assistant {command.instance or 'instance'} unreachable, keeping its commands")
+                    unreachable.add(command.instance)
+                    continue
+                outcome = "replayed"
+            except Exception:  # pylint: disable=broad-exception-caught
+                LOG.exception(f"Error replaying {command.service} for {command.entity_id}")
+                outcome = "failed"
+            with self._lock:
+                if command in self._commands:
+                    self._commands.remove(command)
+                self.stats[outcome] += 1
+                self._save()
+            sent += outcome == "replayed"
+        return sent
+
+    def clear(self) -> None:
+        """Forget every queued command."""
+        with self._lock:
+            self._commands = []
+            self._save()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get the queue counters and its current length."""
+        with self._lock:
+            return {**self.stats, "length": len(self._commands)}
+
+    def _save(self) -> None:
+        """Write the queue to disk; call with the lock held."""
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            temporary = self.path + ".tmp"
+            with open(temporary, "w", encoding="utf-8") as queue_file:
+                json.dump([command.to_dict() for command in self._commands], queue_file)
+            os.replace(temporary, self.path)
+        except OSError:
+            LOG.exception(f"Error saving the offline command queue to {self.path}")
+
+    def _load(self) -> None:
+        if not self.path or not os.path.isfile(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as queue_file:
+                self._commands = [QueuedCommand.from_dict(data) for data in json.load(queue_file)][-self.max_size :]
+        except (OSError, ValueError, KeyError, TypeError):
+            LOG.exception(f"Error loading the offline command queue from {self.path}")
+            self._commands = []
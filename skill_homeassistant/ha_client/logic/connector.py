@@ -5,33 +5,471 @@ Home Assistant. It makes HTTP calls to control devices and get state information
 """
 
 import json
+import ssl
+from concurrent.futures import CancelledError
+from queue import Full
+from threading import Lock
+from time import perf_counter
 
 import requests
 from ovos_utils.log import LOG
+from websocket import WebSocketException, create_connection
 
 from skill_homeassistant.ha_client.logic.base import HomeAssistantConnector
+from skill_homeassistant.ha_client.logic.codec import DEFAULT_CODEC
+from skill_homeassistant.ha_client.logic.events import EventRouter
+from skill_homeassistant.ha_client.logic.executor import current_priority
+from skill_homeassistant.ha_client.logic.ratelimit import RateLimited
+from skill_homeassistant.ha_client.logic.singleflight import SingleFlight
+from skill_homeassistant.ha_client.logic.streaming import STREAM_CHUNK_SIZE, iter_states
+from skill_homeassistant.ha_client.logic.validation import VALIDATION_TIMEOUT, ConnectionValidation
+
+# Rendered by Home Assistant's /api/template endpoint. Each entity becomes a compact
+# [entity_id, state, [[attribute, value], ...]] row holding only the requested attributes.
+STATE_PROJECTION_TEMPLATE = (
+    "{%- set domains = DOMAINS -%}{%- set keys = KEYS -%}"
+    "[{%- for s in states if s.domain in domains -%}"
+    "{{ ',' if not loop.first }}"
+    "{{ [s.entity_id, s.state, s.attributes.items() | selectattr('0', 'in', keys) | list] | to_json }}"
+    "{%- endfor -%}]"
+)
+
+# Renders the full state of the listed entities as [entity_id, state, [[key, value], ...]] rows
+STATE_SELECTION_TEMPLATE = (
+    "{%- set ids = ENTITY_IDS -%}"
+    "[{%- for s in states if s.entity_id in ids -%}"
+    "{{ ',' if not loop.first }}"
+    "{{ [s.entity_id, s.state, s.attributes.items() | list] | to_json }}"
+    "{%- endfor -%}]"
+)
+
+# Renders the area of every entity in an area, directly or through its device, as [entity_id, area_id] rows
+ENTITY_AREA_TEMPLATE = (
+    "[{%- for s in states if area_id(s.entity_id) -%}"
+    "{{ ',' if not loop.first }}"
+    "{{ [s.entity_id, area_id(s.entity_id)] | to_json }}"
+    "{%- endfor -%}]"
+)
+
+# Renders the entities of each listed integration as [entity_id, integration] rows
+INTEGRATION_ENTITY_TEMPLATE = (
+    "{%- set ns = namespace(rows=[]) -%}"
+    "{%- for name in INTEGRATIONS -%}"
+    "{%- for entity_id in integration_entities(name) -%}"
+    "{%- set ns.rows = ns.rows + [[entity_id, name]] -%}"
+    "{%- endfor -%}"
+    "{%- endfor -%}"
+    "{{ ns.rows | to_json }}"
+)
+
+# Endpoints whose responses are large enough that compression always pays off
+BULK_ENDPOINTS = frozenset({"states", "template"})
+# Endpoints whose POSTs change entity states
+WRITE_ENDPOINTS = frozenset({"state", "service"})
+COMPRESSION_MODES = ("bulk", "all", "off")
 
 
 class HomeAssistantRESTConnector(HomeAssistantConnector):
     """Home Assistant REST Connector"""
 
-    def __init__(self, *args, **kwargs):
+    def __init__(
+        self,
+        *args,
+        codec=None,
+        compression="bulk",
+        adaptive_timeouts=None,
+        command_queue=None,
+        executor=None,
+        rate_limiter=None,
+        endpoints=None,
+        session=None,
+        **kwargs,
+    ):
+        """Constructor
+
+        Args:
+            codec (JSONCodec): The JSON implementation for payloads. Default None picks the fastest installed.
+            compression (str): "bulk" requests gzip/deflate for the state list and template renders,
+                "all" for every request (low-bandwidth satellites), "off" for none. Default "bulk".
+            adaptive_timeouts (AdaptiveTimeouts): Derives per-endpoint (connect, read) timeouts from
+                observed latency. Default None uses the fixed timeout for every request.
+            command_queue (CommandQueue): Holds service calls that fail because Home Assistant is
+                unreachable, for replay_command once it is back. Default None raises the connection error.
+            executor (PriorityExecutor): Sends requests from a worker pool, most urgent first, with the
+                priority set by executor.request_priority. Default None sends on the calling thread.
+            rate_limiter (RateLimiter): Paces service calls. Default None sends them as they come.
+            endpoints (EndpointPool): Alternative base URLs of the instance, probed in the background and
+                failed over to when the current one is unreachable. Default None only uses host.
+            session (requests.Session): Pooled connections to reuse, e.g. from the connector that
+                validated the instance. Default None opens a new session.
+        """
         super().__init__(*args, **kwargs)
+        self.codec = codec or DEFAULT_CODEC
+        if compression not in COMPRESSION_MODES:
+            LOG.warning(f"Unknown compression mode {compression}, using 'bulk'")
+            compression = "bulk"
+        self.compression = compression
         self.headers = {
             "Authorization": "Bearer " + self.api_key,
             "content-type": "application/json",
         }
+        self._compressed_headers = {**self.headers, "Accept-Encoding": "gzip, deflate"}
+        self._identity_headers = {**self.headers, "Accept-Encoding": "identity"}
+        self.transfer_stats = {}
+        self._transfer_stats_lock = Lock()
+        self._exposed_entities = None
+        self._single_flight = SingleFlight()
+        self.events = EventRouter(self.event_listeners, self.codec)
+        self.adaptive_timeouts = adaptive_timeouts
+        self.command_queue = command_queue
+        self.executor = executor
+        self.rate_limiter = rate_limiter
+        # Keeps connections to the instance alive between requests
+        self.session = session or requests.Session()
+        self.endpoints = endpoints
+        if endpoints is not None:
+            endpoints.start_probing(self._probe)
+
+    def close(self):
+        """Close the pooled connections to the instance and stop probing its base URLs."""
+        if self.endpoints is not None:
+            self.endpoints.stop()
+        self.session.close()
 
     def register_callback(self, device_id, callback):
-        self.event_listeners[device_id] = callback
+        self.event_listeners.register(device_id, callback)
+
+    def unregister_callback(self, device_id, callback):
+        self.event_listeners.unregister(device_id, callback)
+
+    def dispatch_event(self, message):
+        """Deliver a Home Assistant event to the listeners of the entity it is about.
+
+        Args:
+            message (bytes | str | dict): A WebSocket event message, as received or decoded.
+
+        Returns:
+            int: The number of listeners called with the entity's new state
+        """
+        return self.events.dispatch(message)
+
+    def get_event_stats(self):
+        """Get the event routing counters.
+
+        Returns:
+            dict: See EventRouter.get_stats
+        """
+        return self.events.get_stats()
+
+    def get_listener_stats(self):
+        """Get the state change listener counters.
+
+        Returns:
+            dict: See ListenerRegistry.get_stats; a growing "collected" count means devices are
+                dropped without being released
+        """
+        return self.event_listeners.get_stats()
+
+    def _headers_for(self, endpoint):
+        """Get the request headers for an endpoint class, negotiating compression as configured.
+
+        Identity is asked for explicitly when not compressing, since requests otherwise sends
+        its default "Accept-Encoding: gzip, deflate".
+        """
+        if self.compression == "all" or (self.compression == "bulk" and endpoint in BULK_ENDPOINTS):
+            return self._compressed_headers
+        return self._identity_headers
+
+    def _request(self, method, endpoint, path, payload=None, **kwargs):
+        """Send a request to Home Assistant.
+
+        Args:
+            method (str): "GET" or "POST".
+            endpoint (str): The endpoint class, e.g. "states", "state" or "service".
+            path (str): The API path, starting with /api.
+            payload (dict): The JSON body of a POST request.
+
+        Raises:
+            requests.exceptions.RequestException: If the request failed or the executor could not run it.
+        """
+        if payload is not None:
+            kwargs["data"] = self.codec.dumps(payload)
+        try:
+            if self.executor is None:
+                return self._send(method, endpoint, path, kwargs)
+            return self._send_on_executor(method, endpoint, path, kwargs)
+        finally:
+            if method == "POST" and endpoint in WRITE_ENDPOINTS:
+                # A read issued after the write must not join a read sent before it
+                self._single_flight.invalidate()
+
+    def _send_on_executor(self, method, endpoint, path, kwargs):
+        """Run _send on an executor worker, reporting a full queue or a shutdown as a RequestException."""
+        try:
+            future = self.executor.submit(current_priority(), self._send, method, endpoint, path, kwargs)
+        except (Full, RuntimeError) as e:
+            raise requests.exceptions.RequestException(str(e)) from e
+        try:
+            return future.result()
+        except CancelledError as e:
+            raise requests.exceptions.RequestException(f"{path} was cancelled by the executor shutting down") from e
+
+    def _send(self, method, endpoint, path, kwargs):
+        """Make the HTTP call of _request, on the calling thread or an executor worker.
+
+        With several base URLs, a URL that cannot be connected to is marked unhealthy and
+        the request moves on to the next candidate.
+        """
+        send = self.session.post if method == "POST" else self.session.get
+        adaptive = self.adaptive_timeouts
+        headers = self._headers_for(endpoint)
+        timeout = self.timeout if adaptive is None else adaptive.timeout_for(endpoint, self.timeout)
+        urls = [self.host] if self.endpoints is None else self.endpoints.candidates()
+        for index, url in enumerate(urls):
+            started = perf_counter()
+            try:
+                response = send(url + path, headers=headers, timeout=timeout, verify=self.verify_ssl, **kwargs)
+            except requests.exceptions.ConnectionError:
+                if self.endpoints is None:
+                    raise
+                last = index == len(urls) - 1
+                self.endpoints.record_failure(url, failover=not last)
+                if last:
+                    raise
+                LOG.warning(f"{url} is unreachable, failing over to {urls[index + 1]}")
+                continue
+            except requests.exceptions.ReadTimeout:
+                if adaptive is not None:
+                    adaptive.record_timeout(endpoint, timeout[1])
+                raise
+            # Time to the response headers; streamed bodies are bounded by the per-read timeout
+            elapsed = perf_counter() - started
+            if self.endpoints is not None:
+                self.endpoints.record_success(url, elapsed)
+                self.host = url
+            if adaptive is not None:
+                adaptive.record(endpoint, elapsed)
+            return response
+        raise requests.exceptions.ConnectionError(f"No base URL to send {path} to")
+
+    def _probe(self, url):
+        """Request /api/ from a base URL.
+
+        Returns:
+            float: The latency in seconds
+        """
+        started = perf_counter()
+        self._get_from(url, "/api/", self.timeout).raise_for_status()
+        return perf_counter() - started
+
+    def _get_from(self, url, path, timeout):
+        """GET a path from one base URL, without failover, the executor or adaptive timeouts.
+
+        Args:
+            url (str): The base URL.
+            path (str): The API path, starting with /api.
+            timeout (float): Seconds the request may take.
+        """
+        return self.session.get(url + path, headers=self.headers, timeout=timeout, verify=self.verify_ssl)
+
+    def _read_json(self, endpoint, response):
+        """Check a response and decode its JSON body straight from bytes.
+
+        Raises:
+            requests.exceptions.HTTPError: If Home Assistant returned an error status.
+            requests.exceptions.InvalidJSONError: If the body is not valid JSON.
+        """
+        response.raise_for_status()
+        content = response.content
+        self._record_transfer(endpoint, response, len(content))
+        try:
+            return self.codec.loads(content)
+        except self.codec.decode_errors as e:
+            raise requests.exceptions.InvalidJSONError(str(e), response=response) from e
+
+    def _record_transfer(self, endpoint, response, decoded_bytes):
+        """Add a response to the transfer stats of its endpoint class.
+
+        Args:
+            endpoint (str): The endpoint class.
+            response (requests.Response): The fully read response.
+            decoded_bytes (int): The size of the body after content decoding.
+        """
+        try:
+            # urllib3 counts the bytes read off the socket, i.e. before gzip/deflate decoding
+            wire_bytes = int(response.raw.tell())
+        except (AttributeError, TypeError, ValueError):
+            wire_bytes = decoded_bytes
+        with self._transfer_stats_lock:
+            stats = self.transfer_stats.setdefault(endpoint, {"requests": 0, "wire_bytes": 0, "decoded_bytes": 0})
+            stats["requests"] += 1
+            stats["wire_bytes"] += wire_bytes
+            stats["decoded_bytes"] += decoded_bytes
+
+    def get_transfer_stats(self):
+        """Get the bytes transferred per endpoint class.
+
+        Returns:
+            dict: endpoint class -> {"requests", "wire_bytes", "decoded_bytes"}
+        """
+        with self._transfer_stats_lock:
+            return {endpoint: dict(stats) for endpoint, stats in self.transfer_stats.items()}
+
+    def get_timeout_stats(self):
+        """Get the latency samples and current read timeout per endpoint class.
+
+        Returns:
+            dict: endpoint class -> {"samples", "read_timeout"}, empty when adaptive timeouts are off
+        """
+        if self.adaptive_timeouts is None:
+            return {}
+        return self.adaptive_timeouts.get_stats()
+
+    def get_executor_stats(self):
+        """Get the request queue depths and counters per priority.
+
+        Returns:
+            dict: See PriorityExecutor.get_stats, empty when requests are sent on the calling thread
+        """
+        if self.executor is None:
+            return {}
+        return self.executor.get_stats()
+
+    def get_rate_limit_stats(self):
+        """Get how many service calls the rate limiter allowed, delayed and rejected.
+
+        Returns:
+            dict: {"allowed", "delayed", "rejected"}, empty when there is no rate limit
+        """
+        if self.rate_limiter is None:
+            return {}
+        return self.rate_limiter.get_stats()
+
+    def get_endpoint_stats(self):
+        """Get the failover count and the health and latency of each base URL.
+
+        Returns:
+            dict: See EndpointPool.get_stats, empty with a single base URL
+        """
+        if self.endpoints is None:
+            return {}
+        return self.endpoints.get_stats()
+
+    def get_single_flight_stats(self):
+        """Get how many reads were sent and how many joined an identical read already in flight.
+
+        Returns:
+            dict: {"executed", "shared"}
+        """
+        return self._single_flight.get_stats()
+
+    def _ws_command(self, command):
+        """Run a single command over the Home Assistant WebSocket API.
+
+        Args:
+            command (dict): The command, without its id.
+
+        Returns:
+            The command result
+
+        Raises:
+            WebSocketException: If authentication or the command fails.
+        """
+        url = "ws" + self.host[len("http") :] + "/api/websocket" if self.host.startswith("http") else self.host
+        sslopt = None if self.verify_ssl else {"cert_reqs": ssl.CERT_NONE, "check_hostname": False}
+        ws = create_connection(url, timeout=self.timeout, sslopt=sslopt)
+        try:
+            ws.recv()  # auth_required
+            ws.send(self.codec.dumps({"type": "auth", "access_token": self.api_key}))
+            auth = self.codec.loads(ws.recv())
+            if auth.get("type") != "auth_ok":
+                raise WebSocketException(f"Authentication failed: {auth.get('message', auth.get('type'))}")
+            ws.send(self.codec.dumps({"id": 1, **command}))
+            while True:
+                message = self.codec.loads(ws.recv())
+                if message.get("id") == 1 and message.get("type") == "result":
+                    break
+        finally:
+            ws.close()
+        if not message.get("success"):
+            raise WebSocketException(f"{command['type']} failed: {message.get('error')}")
+        return message.get("result")
+
+    def get_exposed_entities(self, refresh=False):
+        """Get the entities exposed to Assist, fetched over the WebSocket API and cached.
+
+        Args:
+            refresh (bool): Fetch the list again instead of using the cached one.
+
+        Returns:
+            set: The exposed entity ids, or None if the list could not be fetched
+        """
+        if self._exposed_entities is not None and not refresh:
+            return self._exposed_entities
+        try:
+            result = self._ws_command({"type": "homeassistant/expose_entity/list"})
+        except (OSError, WebSocketException, ValueError):
+            LOG.exception("Error fetching the entities exposed to Assist")
+            return self._exposed_entities
+        self._exposed_entities = frozenset(
+            entity_id
+            for entity_id, assistants in result.get("exposed_entities", {}).items()
+            if assistants.get("conversation")
+        )
+        return self._exposed_entities
+
+    def get_entity_areas(self):
+        """Get the area of every entity assigned to one, rendered by Home Assistant.
+
+        /api/states does not carry areas, so they are resolved with the area_id template
+        function, which also covers entities placed in an area through their device.
+
+        Returns:
+            dict: entity id -> area id, or None if the template could not be rendered
+        """
+        try:
+            response = self._request("POST", "template", "/api/template", {"template": ENTITY_AREA_TEMPLATE})
+            return dict(self._read_json("template", response))
+        except (requests.exceptions.RequestException, TypeError, ValueError):
+            LOG.exception("Error resolving entity areas")
+            return None
+
+    def get_entity_integrations(self, integrations):
+        """Get the entities provided by some integrations, rendered by Home Assistant.
+
+        /api/states does not say which integration provides an entity, so they are resolved
+        with the integration_entities template function.
+
+        Args:
+            integrations (Iterable[str]): Integration names, e.g. "hue".
+
+        Returns:
+            dict: entity id -> list of the given integrations providing it, or None if the
+                template could not be rendered
+        """
+        template = INTEGRATION_ENTITY_TEMPLATE.replace("INTEGRATIONS", json.dumps(sorted(integrations)))
+        try:
+            response = self._request("POST", "template", "/api/template", {"template": template})
+            entities = {}
+            for entity_id, integration in self._read_json("template", response):
+                entities.setdefault(entity_id, []).append(integration)
+            return entities
+        except (requests.exceptions.RequestException, TypeError, ValueError):
+            LOG.exception("Error resolving integration entities")
+            return None
 
     def get_all_devices(self):
-        """Get all devices from home assistant."""
-        url = self.host + "/api/states"
+        """Get all devices from home assistant.
+
+        Concurrent calls share one request, unless a write completed in between; the returned list
+        must not be modified.
+        """
+        return self._single_flight.do(("states",), self._fetch_all_devices)
+
+    def _fetch_all_devices(self):
         try:
-            response = requests.get(url, headers=self.headers, timeout=self.timeout, verify=self.verify_ssl)
-            response.raise_for_status()
-            return response.json()
+            response = self._request("GET", "states", "/api/states")
+            return self._read_json("states", response)
         except requests.exceptions.ConnectionError:
             LOG.exception(f"Error connecting to Home Assistant at {self.host}")
             return []
@@ -39,13 +477,100 @@ class HomeAssistantRESTConnector(HomeAssistantConnector):
             LOG.exception("Error fetching devices")
             return []
 
-    def get_device_state(self, entity_id):
-        """Get the state of a device."""
-        url = self.host + "/api/states/" + entity_id
+    def get_all_devices_projected(self, domains, attributes):
+        """Get all devices of the given domains, rendered server-side with only the given attributes.
+
+        Args:
+            domains (Iterable[str]): The device types to include.
+            attributes (Iterable[str]): The attribute names to include.
+
+        Returns:
+            list: The projected states, or None if the template could not be rendered
+        """
+        template = STATE_PROJECTION_TEMPLATE.replace("DOMAINS", json.dumps(sorted(domains))).replace(
+            "KEYS", json.dumps(sorted(attributes))
+        )
+        try:
+            response = self._request("POST", "template", "/api/template", {"template": template})
+            rows = self._read_json("template", response)
+        except requests.exceptions.InvalidJSONError:
+            LOG.exception("State projection template did not render valid JSON")
+            return None
+        except requests.exceptions.RequestException:
+            LOG.exception("Error rendering state projection template")
+            return None
+        return [
+            {"entity_id": entity_id, "state": state, "attributes": dict(attributes)}
+            for entity_id, state, attributes in rows
+        ]
+
+    def iter_all_devices(self, domains=None):
+        """Stream all devices from home assistant, one entity at a time.
+
+        Args:
+            domains (Container[str]): Only decode entities of these domains. Default None decodes all.
+        """
+        decoded_bytes = 0
+
+        def counted(chunks):
+            nonlocal decoded_bytes
+            for chunk in chunks:
+                decoded_bytes += len(chunk)
+                yield chunk
+
         try:
-            response = requests.get(url, headers=self.headers, timeout=self.timeout, verify=self.verify_ssl)
+            response = self._request("GET", "states", "/api/states", stream=True)
             response.raise_for_status()
-            return response.json()
+            with response:
+                yield from iter_states(counted(response.iter_content(chunk_size=STREAM_CHUNK_SIZE)), domains)
+                self._record_transfer("states", response, decoded_bytes)
+        except requests.exceptions.ConnectionError:
+            LOG.exception(f"Error connecting to Home Assistant at {self.host}")
+        except requests.exceptions.RequestException:
+            LOG.exception("Error fetching devices")
+        except ValueError:
+            LOG.exception("Error parsing device list")
+
+    def get_device_states(self, entity_ids):
+        """Get the states of several devices in one request.
+
+        The states are rendered by a template; if that fails, one /api/states snapshot
+        is fetched and filtered instead.
+
+        Args:
+            entity_ids (Iterable[str]): The ids of the devices.
+
+        Returns:
+            dict: Entity id to state object. Entities Home Assistant does not know are left out.
+        """
+        wanted = sorted(set(entity_ids))
+        if not wanted:
+            return {}
+        template = STATE_SELECTION_TEMPLATE.replace("ENTITY_IDS", json.dumps(wanted))
+        try:
+            response = self._request("POST", "template", "/api/template", {"template": template})
+            rows = self._read_json("template", response)
+            return {
+                entity_id: {"entity_id": entity_id, "state": state, "attributes": dict(attributes)}
+                for entity_id, state, attributes in rows
+            }
+        except requests.exceptions.RequestException:
+            LOG.exception("Error rendering state selection template, falling back to a state snapshot")
+        wanted = set(wanted)
+        return {device["entity_id"]: device for device in self.get_all_devices() if device["entity_id"] in wanted}
+
+    def get_device_state(self, entity_id):
+        """Get the state of a device.
+
+        Concurrent calls for the same entity share one request, unless a write completed in between;
+        the returned state must not be modified.
+        """
+        return self._single_flight.do(("state", entity_id), self._fetch_device_state, entity_id)
+
+    def _fetch_device_state(self, entity_id):
+        try:
+            response = self._request("GET", "state", "/api/states/" + entity_id)
+            return self._read_json("state", response)
         except requests.exceptions.ConnectionError:
             LOG.exception(f"Error connecting to Home Assistant at {self.host}")
             return []
@@ -61,14 +586,10 @@ class HomeAssistantRESTConnector(HomeAssistantConnector):
             state (str): The state to set.
             attributes (dict): The attributes to set.
         """
-        url = self.host + "/api/states/" + entity_id
         payload = {"state": state, "attributes": attributes}
-        response = requests.post(
-            url, data=json.dumps(payload), headers=self.headers, timeout=self.timeout, verify=self.verify_ssl
-        )
+        response = self._request("POST", "state", "/api/states/" + entity_id, payload)
         try:
-            response.raise_for_status()
-            return response.json()
+            return self._read_json("state", response)
         except requests.exceptions.RequestException:
             LOG.exception("Error setting device state")
             return None
@@ -127,6 +648,104 @@ class HomeAssistantRESTConnector(HomeAssistantConnector):
             if device["entity_id"].startswith(device_type) and device["attributes"][attribute] not in value
         ]
 
+    def _post_service(self, device_id, device_type, service, arguments=None):
+        """Send a service call, queueing it if Home Assistant cannot be reached.
+
+        Returns:
+            requests.Response: The response, or None if the call was queued or refused by the rate limiter
+
+        Raises:
+            requests.exceptions.ConnectionError: If Home Assistant is unreachable and there is no command queue.
+        """
+        if self.rate_limiter is not None:
+            try:
+                self.rate_limiter.acquire(device_type, device_id)
+            except RateLimited:
+                LOG.warning(f"Rate limit reached, dropped {service} for {device_id}")
+                return None
+        payload = {"entity_id": device_id}
+        if arguments:
+            for key, value in arguments.items():
+                payload[key] = value
+        try:
+            return self._request("POST", "service", "/api/services/" + device_type + "/" + service, payload)
+        except requests.exceptions.ConnectionError:
+            if self.command_queue is None:
+                raise
+            self.command_queue.add(device_id, device_type, service, arguments, instance=self.name)
+            return None
+
+    def replay_command(self, command):
+        """Send a queued service call.
+
+        Args:
+            command (QueuedCommand): The call to send.
+
+        Returns:
+            bool: False if Home Assistant is unreachable or the rate limit is reached, True once the call was sent
+        """
+        if self.rate_limiter is not None:
+            try:
+                self.rate_limiter.acquire(command.domain, command.entity_id)
+            except RateLimited:
+                return False
+        payload = {"entity_id": command.entity_id, **(command.arguments or {})}
+        try:
+            response = self._request(
+                "POST", "service", "/api/services/" + command.domain + "/" + command.service, payload
+            )
+        except requests.exceptions.ConnectionError:
+            return False
+        try:
+            self._read_json("service", response)
+        except requests.exceptions.RequestException:
+            LOG.exception(f"Error replaying {command.service} for {command.entity_id}")
+        return True
+
+    def ping(self):
+        """Check that the Home Assistant API is up.
+
+        Returns:
+            bool: True if /api/ answered successfully
+        """
+        try:
+            self._request("GET", "api", "/api/").raise_for_status()
+        except requests.exceptions.RequestException:
+            return False
+        return True
+
+    def validate(self, timeout=VALIDATION_TIMEOUT):
+        """Check that Home Assistant is reachable and accepts the access token.
+
+        Only requests /api/ and, once that succeeds, /api/config for the version.
+
+        Args:
+            timeout (float): Seconds each request may take.
+
+        Returns:
+            ConnectionValidation: Truthy when the connection is usable
+        """
+        result = ConnectionValidation()
+        try:
+            started = perf_counter()
+            response = self._get_from(self.host, "/api/", timeout)
+            result.latency = perf_counter() - started
+            result.reachable = True
+            if response.status_code in (401, 403):
+                result.error = "The access token was rejected"
+                return result
+            response.raise_for_status()
+            result.auth_ok = True
+            response = self._get_from(self.host, "/api/config", timeout)
+            response.raise_for_status()
+            config = self.codec.loads(response.content)
+            result.version = config.get("version") if isinstance(config, dict) else None
+        except requests.exceptions.RequestException as e:
+            result.error = str(e)
+        except self.codec.decode_errors as e:
+            result.error = f"Invalid response from /api/config: {e}"
+        return result
+
     def turn_on(self, device_id, device_type):
         """Turn on a device.
 
@@ -134,14 +753,11 @@ class HomeAssistantRESTConnector(HomeAssistantConnector):
             device_id (str): The id of the device.
             device_type (str): The type of the device.
         """
-        url = self.host + "/api/services/" + device_type + "/turn_on"
-        payload = {"entity_id": device_id}
-        response = requests.post(
-            url, data=json.dumps(payload), headers=self.headers, timeout=self.timeout, verify=self.verify_ssl
-        )
+        response = self._post_service(device_id, device_type, "turn_on")
+        if response is None:
+            return None
         try:
-            response.raise_for_status()
-            return response.json()
+            return self._read_json("service", response)
         except requests.exceptions.RequestException:
             LOG.exception("Error turning on device")
             return None
@@ -153,14 +769,11 @@ class HomeAssistantRESTConnector(HomeAssistantConnector):
             device_id (str): The id of the device.
             device_type (str): The type of the device.
         """
-        url = self.host + "/api/services/" + device_type + "/turn_off"
-        payload = {"entity_id": device_id}
-        response = requests.post(
-            url, data=json.dumps(payload), headers=self.headers, timeout=self.timeout, verify=self.verify_ssl
-        )
+        response = self._post_service(device_id, device_type, "turn_off")
+        if response is None:
+            return None
         try:
-            response.raise_for_status()
-            return response.json()
+            return self._read_json("service", response)
         except requests.exceptions.RequestException:
             LOG.exception("Error turning off device")
             return None
@@ -174,19 +787,12 @@ class HomeAssistantRESTConnector(HomeAssistantConnector):
             function (str): The function to call.
             arguments (dict): The arguments to pass to the function.
         """
-        url = self.host + "/api/services/" + device_type + "/" + function
-        payload = {"entity_id": device_id}
-        if arguments:
-            for key, value in arguments.items():
-                payload[key] = value
-
-        response = requests.post(
-            url, data=json.dumps(payload), headers=self.headers, timeout=self.timeout, verify=self.verify_ssl
-        )
+        response = self._post_service(device_id, device_type, function, arguments)
+        if response is None:
+            return None
 
         try:
-            response.raise_for_status()
-            return response.json()
+            return self._read_json("service", response)
         except requests.exceptions.RequestException:
             LOG.exception("Error calling function")
             return None
@@ -199,17 +805,13 @@ class HomeAssistantRESTConnector(HomeAssistantConnector):
             arguments (dict, optional): Additional arguments to send. HA currently only supports 'language'
         """
         arguments = arguments or {}
-        url = self.host + "/api/conversation/process"
         payload = {
             "text": command,
             "language": arguments.get("language", "en"),
         }
-        response = requests.post(
-            url, data=json.dumps(payload), headers=self.headers, timeout=self.timeout, verify=self.verify_ssl
-        )
+        response = self._request("POST", "assist", "/api/conversation/process", payload)
         try:
-            response.raise_for_status()
-            return response.json()
+            return self._read_json("assist", response)
         except requests.exceptions.RequestException:
             LOG.exception("Error sending Assist command")
             return None
@@ -4,18 +4,51 @@ This module provides the base device class for interacting with Home Assistant d
 It defines common functionality for controlling devices and getting their state information.
 """
 
+from sys import intern
+from time import monotonic
+
 from ovos_utils.log import LOG
-from webcolors import (  # TODO: Use ovos-color-parser when it's ready
-    name_to_rgb,
-    rgb_to_name,
-)
 
 from skill_homeassistant.ha_client.logic.base import HomeAssistantConnector
+from skill_homeassistant.ha_client.logic.colors import (  # TODO: Use ovos-color-parser when it's ready
+    DEFAULT_COLOR_INDEX,
+    DEFAULT_COLOR_RESOLVER,
+)
+
+
+def intern_attributes(attributes):
+    """Return a copy of an attribute dict with interned keys.
+
+    Attribute keys repeat across every entity of a domain (``friendly_name``,
+    ``brightness``, ``supported_features``...), so interning lets all devices
+    share one copy of each key string.
+
+    Args:
+        attributes (dict): The attributes of the device.
+    """
+    if not attributes:
+        return {}
+    return {intern(key): value for key, value in attributes.items()}
 
 
 class HomeAssistantDevice:
     """Home Assistant Device"""
 
+    __slots__ = (
+        "connector",
+        "device_id",
+        "device_icon",
+        "device_name",
+        "device_state",
+        "device_attributes",
+        "device_area",
+        "has_device_class",
+        "device_class",
+        "device_type",
+        "last_refreshed",
+        "__weakref__",
+    )
+
     def __init__(  # pylint: disable=keyword-arg-before-vararg
         self,
         connector: HomeAssistantConnector,
@@ -39,26 +72,34 @@ class HomeAssistantDevice:
         """
         self.connector = connector
         self.device_id = device_id
-        self.device_icon = device_icon
+        self.device_icon = intern(device_icon) if device_icon else device_icon
         self.device_name = device_name
         self.device_state = device_state
-        self.device_attributes = device_attributes
+        self.device_attributes = intern_attributes(device_attributes)
         self.device_area = device_area
         self.has_device_class = False
         self.device_class = None
-        self.device_type = self.device_id.split(".")[0]
+        self.device_type = intern(self.device_id.split(".")[0])
+        self.last_refreshed = monotonic()
         self.query_device_class()
         self.connector.register_callback(self.device_id, self.callback_listener)
 
-    def callback_listener(self, message):
-        """Callback for when the device state changes."""
-        event = message.get("event")
-        event_type = event.get("event_type")
-        if event_type == "state_changed":
-            new_state = event.get("data").get("new_state")
-            if new_state.get("entity_id") == self.device_id:
-                self.device_state = new_state.get("state")
-                self.device_attributes = new_state.get("attributes")
+    def release(self):
+        """Stop listening for state changes; call when the device leaves the registry."""
+        self.connector.unregister_callback(self.device_id, self.callback_listener)
+
+    def callback_listener(self, new_state):
+        """Callback for when the device state changes.
+
+        Args:
+            new_state (dict): The device's new state object, routed to it by the connector.
+                None when the entity was removed.
+        """
+        if not new_state:
+            return
+        self.device_state = new_state.get("state")
+        self.device_attributes = intern_attributes(new_state.get("attributes"))
+        self.last_refreshed = monotonic()
 
     def query_device_class(self):
         """Query the device class of the device."""
@@ -121,13 +162,55 @@ class HomeAssistantDevice:
         """Check if the device is unavailable."""
         return self.device_state == "unavailable"
 
-    def turn_on(self):
-        """Turn on the device."""
-        return self.connector.turn_on(self.device_id, self.device_type)
+    def is_fresh(self):
+        """Check if the cached state is recent enough to trust, per the connector's state_max_age."""
+        max_age = self.connector.state_max_age
+        return max_age > 0 and monotonic() - self.last_refreshed <= max_age
 
-    def turn_off(self):
-        """Turn off the device."""
-        return self.connector.turn_off(self.device_id, self.device_type)
+    def already_in_state(self, state, **attributes):
+        """Check if the fresh cached state already equals a target state and attributes.
+
+        Args:
+            state (str): The target state.
+            **attributes: The target attribute values; lists and tuples compare equal.
+        """
+        if self.device_state != state or not self.is_fresh():
+            return False
+        for name, value in attributes.items():
+            current = self.device_attributes.get(name)
+            if isinstance(value, (list, tuple)) and isinstance(current, (list, tuple)):
+                current, value = list(current), list(value)
+            if current != value:
+                return False
+        return True
+
+    def expire_state(self):
+        """Stop trusting the cached state, e.g. after a call that changes it, until it is next refreshed."""
+        self.last_refreshed = 0
+
+    def turn_on(self, force=False):
+        """Turn on the device.
+
+        Args:
+            force (bool): Send the call even if the device is known to be on.
+        """
+        if not force and self.already_in_state("on"):
+            return []
+        response = self.connector.turn_on(self.device_id, self.device_type)
+        self.expire_state()
+        return response
+
+    def turn_off(self, force=False):
+        """Turn off the device.
+
+        Args:
+            force (bool): Send the call even if the device is known to be off.
+        """
+        if not force and self.already_in_state("off"):
+            return []
+        response = self.connector.turn_off(self.device_id, self.device_type)
+        self.expire_state()
+        return response
 
     def call_function(self, function_name, function_args=None):
         """Call a function of the device.
@@ -136,15 +219,24 @@ class HomeAssistantDevice:
             function_name (str): The name of the function to call.
             function_args (dict): The arguments to pass to the function.
         """
-        return self.connector.call_function(self.device_id, self.device_type, function_name, function_args)
+        response = self.connector.call_function(self.device_id, self.device_type, function_name, function_args)
+        self.expire_state()
+        return response
 
     def update_device(self):
-        """Update the device."""
+        """Update the device.
+
+        If its state cannot be fetched, e.g. while Home Assistant is unreachable and calls are
+        queued, the cached state is kept.
+        """
         device = self.connector.get_device_state(self.device_id)
-        self.device_state = device["state"]
-        self.device_attributes = device["attributes"]
-        self.device_icon = device["attributes"].get("icon", "")
-        self.device_name = device["attributes"].get("friendly_name", "")
+        if not isinstance(device, dict) or not device:
+            LOG.warning(f"Could not refresh {self.device_id}, keeping its cached state")
+            return
+        self.apply_state(device)
+        attributes = device.get("attributes") or {}
+        self.device_icon = intern(attributes.get("icon") or "")
+        self.device_name = attributes.get("friendly_name", "")
 
     def set_device_attribute(self, device_id, attribute, value):
         """Set an attribute of the device.
@@ -155,13 +247,24 @@ class HomeAssistantDevice:
             value (str): The value to set the attribute to.
         """
         device = self.get_state_json_object()
-        attributes = device["attributes"]
-        attributes[attribute] = value
+        attributes = {**device["attributes"], attribute: value}
         self.connector.set_device_state(device_id, device["state"], attributes)
+        self.expire_state()
 
-    def poll(self):
-        """Poll the device."""
-        full_state_json = self.connector.get_device_state(self.device_id)
+    def state_age(self):
+        """Get the seconds since the device's state was last refreshed."""
+        return monotonic() - self.last_refreshed
+
+    def needs_poll(self):
+        """Check if the cached state is older than the domain's poll max-age."""
+        return self.state_age() > self.connector.poll_max_age.get(self.device_type, 0)
+
+    def apply_state(self, full_state_json):
+        """Update the cached state from a state object fetched from Home Assistant.
+
+        Args:
+            full_state_json (dict): The state object.
+        """
         if full_state_json:
             if full_state_json == "unavailable":
                 LOG.warning(f"State unavailable for device: {self.device_id}")
@@ -169,11 +272,26 @@ class HomeAssistantDevice:
                 LOG.error(f"({self.device_name}) Expected dict state but got: " f"{full_state_json}")
             else:
                 self.device_state = full_state_json.get("state", "unknown")
-                self.device_attributes = full_state_json.get("attributes", {})
+                self.device_attributes = intern_attributes(full_state_json.get("attributes", {}))
+                self.last_refreshed = monotonic()
+
+    def poll(self, force=False):
+        """Poll the device, unless its cached state is within the domain's poll max-age.
 
-    def get_device_display_model(self):
-        """Get the display model of the device."""
-        self.poll()
+        Args:
+            force (bool): Fetch the state even if the cached state is fresh.
+        """
+        if force or self.needs_poll():
+            self.apply_state(self.connector.get_device_state(self.device_id))
+
+    def get_device_display_model(self, poll=True):
+        """Get the display model of the device, with the age of its state in seconds.
+
+        Args:
+            poll (bool): Poll the device first if its state is stale. Default True.
+        """
+        if poll:
+            self.poll()
         return {
             "id": self.device_id,
             "name": self.device_name,
@@ -182,14 +300,14 @@ class HomeAssistantDevice:
             "type": self.device_type,
             "attributes": self.device_attributes,
             "host": self.connector.host,
+            "age": round(self.state_age(), 1),
         }
 
 
 class HomeAssistantLight(HomeAssistantDevice):
     """Home Assistant Light"""
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+    __slots__ = ()
 
     def get_brightness(self):
         """Get the brightness of the light."""
@@ -227,14 +345,17 @@ class HomeAssistantLight(HomeAssistantDevice):
         """Get the rgb color of the light."""
         return self.device_attributes.get("rgb_color", [0, 0, 0])
 
-    def get_spoken_color(self):
-        """Get the spoken color value of the light."""
-        color = tuple(self.get_rgb_color())
-        try:
-            color = rgb_to_name(color)
-        except ValueError:
-            color = f"RGB code {color[0]}, {color[1]}, {color[2]}"
-        return color
+    def get_spoken_color(self, color_index=None):
+        """Get the spoken color value of the light.
+
+        Args:
+            color_index (ColorIndex): The palette to name the color from. Default None uses CSS3 names.
+        """
+        color = tuple(self.get_rgb_color() or (0, 0, 0))
+        name = (color_index or DEFAULT_COLOR_INDEX).name(color)
+        if name is None:
+            return f"RGB code {color[0]}, {color[1]}, {color[2]}"
+        return name
 
     def get_supported_color_modes(self):
         """Get the supported color modes of the light."""
@@ -244,12 +365,15 @@ class HomeAssistantLight(HomeAssistantDevice):
         """Get the xy color of the light."""
         return self.device_attributes.get("xy_color", [0, 0])
 
-    def set_brightness(self, brightness):
+    def set_brightness(self, brightness, force=False):
         """Set the brightness of the light.
 
         Args:
             brightness (int): The brightness to set the light to.
+            force (bool): Send the call even if the light is known to be at this brightness.
         """
+        if not force and self.already_in_state("on", brightness=brightness):
+            return
         LOG.debug(f"Setting brightness to {brightness}")
         self.call_function("turn_on", {"brightness": brightness})
         self.update_device()
@@ -266,68 +390,92 @@ class HomeAssistantLight(HomeAssistantDevice):
         self.update_device()
         return decreased_value
 
-    def set_color(self, color):
+    def set_color(self, color, force=False):
         """Set the color of the light.
 
         Args:
-            color (str): The color to set the light to.
-        """
-        rgb = name_to_rgb(color)
-        LOG.debug(f"Setting color to [{rgb.red}, {rgb.green}, {rgb.blue}]")
-        self.set_rgb_color([rgb.red, rgb.green, rgb.blue])
-        self.update_device()
+            color (str): The color to set the light to, as a name understood by the color resolver.
+            force (bool): Send the call even if the light is known to have this color.
 
-    def set_color_mode(self, color_mode):
+        Raises:
+            ValueError: If the color cannot be resolved.
+        """
+        resolved = DEFAULT_COLOR_RESOLVER.resolve(color)
+        if resolved is None:
+            raise ValueError(f"Unknown color: {color}")
+        rgb = list(resolved[1])
+        LOG.debug(f"Setting color to {rgb}")
+        self.set_rgb_color(rgb, force=force)
+
+    def set_color_mode(self, color_mode, force=False):
         """Set the color mode of the light.
 
         Args:
             color_mode (str): The color mode to set the light to.
+            force (bool): Send the call even if the light is known to have this color mode.
         """
+        if not force and self.already_in_state("on", color_mode=color_mode):
+            return
         self.call_function("set_color_mode", {"color_mode": color_mode})
         self.update_device()
 
-    def set_color_temp(self, color_temp):
+    def set_color_temp(self, color_temp, force=False):
         """Set the color temperature of the light.
 
         Args:
             color_temp (int): The color temperature to set the light to.
+            force (bool): Send the call even if the light is known to have this color temperature.
         """
+        if not force and self.already_in_state("on", color_temp=color_temp):
+            return
         self.call_function("set_color_temp", {"color_temp": color_temp})
         self.update_device()
 
-    def set_effect(self, effect):
+    def set_effect(self, effect, force=False):
         """Set the effect of the light.
 
         Args:
             effect (str): The effect to set the light to.
+            force (bool): Send the call even if the light is known to have this effect.
         """
+        if not force and self.already_in_state("on", effect=effect):
+            return
         self.call_function("set_effect", {"effect": effect})
         self.update_device()
 
-    def set_hs_color(self, hs_color):
+    def set_hs_color(self, hs_color, force=False):
         """Set the hs color of the light.
 
         Args:
             hs_color (list): The hs color to set the light to.
+            force (bool): Send the call even if the light is known to have this hs color.
         """
+        if not force and self.already_in_state("on", hs_color=hs_color):
+            return
         self.call_function("set_hs_color", {"hs_color": hs_color})
         self.update_device()
 
-    def set_rgb_color(self, rgb_color):
+    def set_rgb_color(self, rgb_color, force=False):
         """Set the rgb color of the light.
 
         Args:
             rgb_color (list): The rgb color to set the light to.
+            force (bool): Send the call even if the light is known to have this rgb color.
         """
+        if not force and self.already_in_state("on", rgb_color=rgb_color):
+            return
         self.call_function("turn_on", {"rgb_color": rgb_color})
         self.update_device()
 
-    def set_xy_color(self, xy_color):
+    def set_xy_color(self, xy_color, force=False):
         """Set the xy color of the light.
 
         Args:
             xy_color (list): The xy color to set the light to.
+            force (bool): Send the call even if the light is known to have this xy color.
         """
+        if not force and self.already_in_state("on", xy_color=xy_color):
+            return
         self.call_function("set_xy_color", {"xy_color": xy_color})
         self.update_device()
 
@@ -335,15 +483,13 @@ class HomeAssistantLight(HomeAssistantDevice):
 class HomeAssistantSwitch(HomeAssistantDevice):
     """Home Assistant Switch"""
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+    __slots__ = ()
 
 
 class HomeAssistantSensor(HomeAssistantDevice):
     """Home Assistant Sensor"""
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+    __slots__ = ()
 
     def get_device_class(self):
         """Get the device class of the sensor."""
@@ -373,8 +519,7 @@ class HomeAssistantSensor(HomeAssistantDevice):
 class HomeAssistantBinarySensor(HomeAssistantDevice):
     """Home Assistant Binary Sensor"""
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+    __slots__ = ()
 
     def get_device_class(self):
         """Get the device class of the binary sensor."""
@@ -384,8 +529,7 @@ class HomeAssistantBinarySensor(HomeAssistantDevice):
 class HomeAssistantCover(HomeAssistantDevice):
     """Home Assistant Cover"""
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+    __slots__ = ()
 
     def open(self):
         """Open the cover."""
@@ -432,8 +576,7 @@ class HomeAssistantCover(HomeAssistantDevice):
 class HomeAssistantMediaPlayer(HomeAssistantDevice):
     """Home Assistant Media Player"""
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+    __slots__ = ()
 
     def get_media_title(self):
         """Get the media title of the media player."""
@@ -491,6 +634,15 @@ class HomeAssistantMediaPlayer(HomeAssistantDevice):
         """Get the volume level of the media player."""
         return self.device_attributes["volume_level"]
 
+    def set_volume_level(self, volume_level):
+        """Set the volume level of the media player.
+
+        Args:
+            volume_level (float): The volume level to set, from 0 to 1.
+        """
+        self.call_function("volume_set", {"volume_level": volume_level})
+        self.update_device()
+
     def get_app_id(self):
         """Get the app id of the media player."""
         return self.device_attributes["app_id"]
@@ -503,8 +655,7 @@ class HomeAssistantMediaPlayer(HomeAssistantDevice):
 class HomeAssistantClimate(HomeAssistantDevice):
     """Home Assistant Climate"""
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+    __slots__ = ()
 
     def set_temperature(self, temperature):
         """Set the temperature of the climate device.
@@ -652,8 +803,7 @@ class HomeAssistantClimate(HomeAssistantDevice):
 class HomeAssistantVacuum(HomeAssistantDevice):
     """Home Assistant Vacuum"""
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+    __slots__ = ()
 
     def start(self):
         """Start the vacuum."""
@@ -709,17 +859,15 @@ class HomeAssistantVacuum(HomeAssistantDevice):
 class HomeAssistantCamera(HomeAssistantDevice):
     """Home Assistant Camera"""
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+    __slots__ = ()
 
 
 class HomeAssistantScene(HomeAssistantDevice):
     """Home Assistant Scene"""
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+    __slots__ = ()
 
-    def turn_off(self):
+    def turn_off(self, force=False):  # pylint: disable=unused-argument
         LOG.warning("Request to turn off a scene. This is not supported - scenes can only be activated.")
         return
 
@@ -727,9 +875,8 @@ class HomeAssistantScene(HomeAssistantDevice):
 class HomeAssistantAutomation(HomeAssistantDevice):
     """Home Assistant Automation"""
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+    __slots__ = ()
 
-    def turn_off(self):
+    def turn_off(self, force=False):  # pylint: disable=unused-argument
         LOG.warning("Request to turn off an automation. This is not supported, as it will disable it instead.")
         return
@@ -0,0 +1,153 @@
+"""Home Assistant Endpoint Selection Module.
+
+This module picks which base URL of an instance to use when it is reachable in more
+than one way, typically on the LAN and through a remote URL. Each URL's health and
+latency come from the requests sent to it and from a light probe of ``/api/`` in the
+background. Requests go to the fastest healthy URL; if it cannot be reached, the same
+request moves on to the next one.
+"""
+
+from threading import Lock, Timer
+from typing import Callable, Dict, List, Optional, Sequence
+
+# Weight of the newest latency sample in the moving average
+LATENCY_SMOOTHING = 0.3
+
+
+class _Endpoint:
+    __slots__ = ("url", "healthy", "latency", "failures")
+
+    def __init__(self, url: str):
+        self.url = url
+        self.healthy = True
+        self.latency: Optional[float] = None
+        self.failures = 0
+
+
+class EndpointPool:
+    """Ordered base URLs of one instance, ranked by health and latency."""
+
+    def __init__(self, urls: Sequence[str], probe_interval: float = 30):
+        """Constructor
+
+        Args:
+            urls (Sequence[str]): Base URLs in order of preference, used while latencies are unknown.
+            probe_interval (float): Seconds between background probes; 0 disables probing.
+        """
+        self._endpoints = [_Endpoint(url.rstrip("/")) for url in urls]
+        self.probe_interval = probe_interval
+        self.failovers = 0
+        self._lock = Lock()
+        self._timer: Optional[Timer] = None
+        self._probe: Optional[Callable[[str], float]] = None
+        self._stopped = False
+
+    @property
+    def urls(self) -> List[str]:
+        """The base URLs in configured order."""
+        return [endpoint.url for endpoint in self._endpoints]
+
+    def candidates(self) -> List[str]:
+        """Get the URLs to try for a request: healthy ones fastest first, then the rest in configured order."""
+        with self._lock:
+            ranked = sorted(
+                enumerate(self._endpoints),
+                key=lambda item: (
+                    not item[1].healthy,
+                    item[1].latency if item[1].healthy and item[1].latency is not None else float("inf"),
+                    item[0],
+                ),
+            )
+            return [endpoint.url for _, endpoint in ranked]
+
+    def _get(self, url: str) -> Optional[_Endpoint]:
+        for endpoint in self._endpoints:
+            if endpoint.url == url:
+                return endpoint
+        return None
+
+    def record_success(self, url: str, latency: float) -> None:
+        """Mark a URL healthy and add a latency sample.
+
+        Args:
+            url (str): The base URL.
+            latency (float): Seconds until the response arrived.
+        """
+        with self._lock:
+            endpoint = self._get(url)
+            if endpoint is None:
+                return
+            endpoint.healthy = True
+            if endpoint.latency is None:
+                endpoint.latency = latency
+            else:
+                endpoint.latency += LATENCY_SMOOTHING * (latency - endpoint.latency)
+
+    def record_failure(self, url: str, failover: bool = False) -> None:
+        """Mark a URL unreachable.
+
+        Args:
+            url (str): The base URL.
+            failover (bool): Whether a request moved on to another URL because of it.
+        """
+        with self._lock:
+            endpoint = self._get(url)
+            if endpoint is None:
+                return
+            endpoint.healthy = False
+            endpoint.failures += 1
+            if failover:
+                self.failovers += 1
+
+    def start_probing(self, probe: Callable[[str], float]) -> None:
+        """Probe every URL periodically in the background.
+
+        Args:
+            probe (Callable): Requests a URL and returns its latency in seconds, raising if it is unreachable.
+        """
+        self._probe = probe
+        self._schedule_probe()
+
+    def _schedule_probe(self) -> None:
+        with self._lock:
+            if self._stopped or self.probe_interval <= 0 or self._probe is None:
+                return
+            self._timer = Timer(self.probe_interval, self.probe_all)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def probe_all(self) -> None:
+        """Probe every URL now, then schedule the next round."""
+        probe = self._probe
+        if probe is None:
+            return
+        for url in self.urls:
+            try:
+                latency = probe(url)
+            except Exception:  # pylint: disable=broad-exception-caught
+                self.record_failure(url)
+            else:
+                self.record_success(url, latency)
+        self._schedule_probe()
+
+    def stop(self) -> None:
+        """Stop probing."""
+        with self._lock:
+            self._stopped = True
+            if self._timer is not None:
+                self._timer.cancel()
+
+    def get_stats(self) -> Dict[str, object]:
+        """Get the failover count and the health, latency and failures of each URL."""
+        with self._lock:
+            return {
+                "failovers": self.failovers,
+                "endpoints": {
+                    endpoint.url: {
+                        "healthy": endpoint.healthy,
+                        "latency": endpoint.latency,
+                        "failures": endpoint.failures,
+                    }
+                    for endpoint in self._endpoints
+                },
+            }
@@ -0,0 +1,82 @@
+"""Home Assistant Event Routing Module.
+
+This module hands Home Assistant's state change events to the listeners of the
+entity that changed. Each event message is decoded once, its entity id looked up
+in the listener registry, and only that entity's listeners are called, with the
+already decoded ``new_state``. The cost of an event therefore does not grow with
+the number of registered devices, which matters on installs where power meters and
+other sensors report every second.
+"""
+
+from typing import Any, Dict, Union
+
+from ovos_utils.log import LOG
+
+from skill_homeassistant.ha_client.logic.codec import DEFAULT_CODEC, JSONCodec
+from skill_homeassistant.ha_client.logic.listeners import ListenerRegistry
+
+STATE_CHANGED = "state_changed"
+
+
+class EventRouter:
+    """Routes state change events to the listeners of their entity."""
+
+    def __init__(self, listeners: ListenerRegistry, codec: JSONCodec = DEFAULT_CODEC):
+        """Constructor
+
+        Args:
+            listeners (ListenerRegistry): The listeners per entity id.
+            codec (JSONCodec): Decodes event messages received as bytes or str.
+        """
+        self.listeners = listeners
+        self.codec = codec
+        # Updated by the single thread receiving events
+        self.stats = {"events": 0, "delivered": 0, "unrouted": 0, "ignored": 0, "invalid": 0, "errors": 0}
+
+    def dispatch(self, message: Union[bytes, str, Dict[str, Any]]) -> int:
+        """Deliver an event to the listeners of the entity it is about.
+
+        Args:
+            message: A WebSocket event message ({"type": "event", "event": {...}}) or a bare
+                event, either decoded or as received.
+
+        Returns:
+            int: The number of listeners called
+        """
+        stats = self.stats
+        stats["events"] += 1
+        if isinstance(message, (bytes, bytearray, str)):
+            try:
+                message = self.codec.loads(message)
+            except self.codec.decode_errors:
+                stats["invalid"] += 1
+                LOG.warning("Ignoring an event message that is not valid JSON")
+                return 0
+        event = message.get("event", message) if isinstance(message, dict) else None
+        if not isinstance(event, dict) or event.get("event_type") != STATE_CHANGED:
+            stats["ignored"] += 1
+            return 0
+        data = event.get("data") or {}
+        new_state = data.get("new_state")
+        entity_id = data.get("entity_id") or (new_state or {}).get("entity_id")
+        callbacks = self.listeners.listeners(entity_id) if entity_id else []
+        if not callbacks:
+            stats["unrouted"] += 1
+            return 0
+        for callback in callbacks:
+            try:
+                callback(new_state)
+            except Exception:  # pylint: disable=broad-exception-caught
+                stats["errors"] += 1
+                LOG.exception(f"Error handling the state change of {entity_id}")
+        stats["delivered"] += len(callbacks)
+        return len(callbacks)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get the event counters.
+
+        Returns:
+            dict: "events" received, "delivered" to listeners, "unrouted" for want of a listener,
+                "ignored" as not state changes, "invalid" JSON, and listener "errors"
+        """
+        return dict(self.stats)
@@ -0,0 +1,179 @@
+"""Home Assistant Request Executor Module.
+
+This module runs Home Assistant requests on a small pool of worker threads with
+one bounded queue per priority. Workers always take the most urgent queued request,
+so a voice command waits behind at most the requests already running, never behind
+a backlog of refreshes. Background priorities also share a concurrency cap below
+the pool size, which keeps a worker free for interactive calls.
+"""
+
+from collections import deque
+from concurrent.futures import Future
+from contextlib import contextmanager
+from contextvars import ContextVar
+from queue import Full
+from threading import Condition, Thread
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+# From most to least urgent
+PRIORITIES = ("interactive", "gui", "refresh", "metrics")
+
+_REQUEST_PRIORITY: ContextVar[str] = ContextVar("request_priority", default="interactive")
+
+
+@contextmanager
+def request_priority(priority: str) -> Iterator[None]:
+    """Send the requests made inside the block with a priority.
+
+    Args:
+        priority (str): One of PRIORITIES.
+    """
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown request priority {priority}")
+    token = _REQUEST_PRIORITY.set(priority)
+    try:
+        yield
+    finally:
+        _REQUEST_PRIORITY.reset(token)
+
+
+def current_priority() -> str:
+    """Get the priority requests made here are sent with, "interactive" unless set by request_priority."""
+    return _REQUEST_PRIORITY.get()
+
+
+_Task = Tuple[Future, Callable[..., Any], tuple, dict]
+
+
+class PriorityExecutor:
+    """Worker pool taking tasks from per-priority bounded queues, most urgent first."""
+
+    def __init__(self, max_workers: int = 4, max_queued: int = 64, background_workers: Optional[int] = None):
+        """Constructor
+
+        Args:
+            max_workers (int): Most tasks running at once, i.e. concurrent requests to Home Assistant.
+            max_queued (int): Most tasks waiting per priority; submitting more raises queue.Full.
+            background_workers (int): Most non-interactive tasks running at once.
+                Default None leaves one worker for interactive tasks.
+        """
+        self.max_workers = max(1, max_workers)
+        self.max_queued = max_queued
+        if background_workers is None:
+            background_workers = self.max_workers - 1
+        self.background_workers = max(1, min(background_workers, self.max_workers))
+        self._queues: Dict[str, Deque[_Task]] = {priority: deque() for priority in PRIORITIES}
+        self._running = dict.fromkeys(PRIORITIES, 0)
+        self._condition = Condition()
+        self._workers: List[Thread] = []
+        self._idle = 0
+        self._shutdown = False
+        self.stats = {"submitted": 0, "completed": 0, "rejected": 0}
+        self.max_depth = dict.fromkeys(PRIORITIES, 0)
+
+    @classmethod
+    def from_config(cls, config: Any) -> Optional["PriorityExecutor"]:
+        """Build from the ``io_executor`` setting.
+
+        Args:
+            config: False or None to disable, True for the defaults, or a dict with
+                workers, max_queued and background_workers.
+        """
+        if not config:
+            return None
+        if not isinstance(config, dict):
+            config = {}
+        background_workers = config.get("background_workers")
+        return cls(
+            max_workers=int(config.get("workers", 4)),
+            max_queued=int(config.get("max_queued", 64)),
+            background_workers=None if background_workers is None else int(background_workers),
+        )
+
+    def submit(self, priority: str, function: Callable[..., Any], *args, **kwargs) -> Future:
+        """Queue a task.
+
+        Args:
+            priority (str): One of PRIORITIES.
+            function (Callable): The task.
+            *args: Positional arguments for the task.
+            **kwargs: Keyword arguments for the task.
+
+        Returns:
+            Future: Resolves to the task's result or exception
+
+        Raises:
+            queue.Full: If the priority's queue already holds max_queued tasks.
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown request priority {priority}")
+        future: Future = Future()
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("Cannot submit to a shut down executor")
+            queue = self._queues[priority]
+            if len(queue) >= self.max_queued:
+                self.stats["rejected"] += 1
+                raise Full(f"Too many queued {priority} requests")
+            queue.append((future, function, args, kwargs))
+            self.stats["submitted"] += 1
+            self.max_depth[priority] = max(self.max_depth[priority], len(queue))
+            if self._idle == 0 and len(self._workers) < self.max_workers:
+                worker = Thread(target=self._work, name=f"ha-io-{len(self._workers)}", daemon=True)
+                self._workers.append(worker)
+                worker.start()
+            self._condition.notify()
+        return future
+
+    def _next_task(self) -> Optional[Tuple[str, _Task]]:
+        """Take the most urgent task allowed to run; call with the condition held."""
+        background_running = sum(self._running[priority] for priority in PRIORITIES[1:])
+        for priority in PRIORITIES:
+            queue = self._queues[priority]
+            if queue and (priority == PRIORITIES[0] or background_running < self.background_workers):
+                return priority, queue.popleft()
+        return None
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                task = self._next_task()
+                while task is None:
+                    if self._shutdown:
+                        return
+                    self._idle += 1
+                    self._condition.wait()
+                    self._idle -= 1
+                    task = self._next_task()
+                priority, (future, function, args, kwargs) = task
+                self._running[priority] += 1
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(function(*args, **kwargs))
+                except BaseException as error:  # pylint: disable=broad-exception-caught
+                    future.set_exception(error)
+            with self._condition:
+                self._running[priority] -= 1
+                self.stats["completed"] += 1
+                # A freed background slot may let a waiting worker take a queued task
+                self._condition.notify_all()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the queue depths, running tasks and counters per priority."""
+        with self._condition:
+            return {
+                **self.stats,
+                "workers": len(self._workers),
+                "depth": {priority: len(queue) for priority, queue in self._queues.items()},
+                "max_depth": dict(self.max_depth),
+                "running": dict(self._running),
+            }
+
+    def shutdown(self) -> None:
+        """Stop the workers once the running tasks finish, cancelling every queued task."""
+        with self._condition:
+            self._shutdown = True
+            for queue in self._queues.values():
+                while queue:
+                    queue.popleft()[0].cancel()
+            self._condition.notify_all()
@@ -0,0 +1,225 @@
+"""Home Assistant Entity Filter Module.
+
+This module compiles the ``entity_filter`` setting into a matcher that decides which
+entities become devices. It runs on the raw state objects, before any device is built,
+so excluded entities cost no device allocation at all.
+"""
+
+import re
+from collections import Counter
+from fnmatch import translate
+from typing import Any, Dict, Iterable, Optional, Pattern, Tuple
+
+from ovos_utils.log import LOG
+
+FILTER_REASONS = ("domain", "entity", "area", "integration", "attribute")
+
+
+def compile_patterns(patterns: Iterable[str]) -> Optional[Pattern]:
+    """Compile entity_id patterns into a single regular expression.
+
+    Args:
+        patterns (Iterable[str]): Glob patterns such as ``sensor.*_battery``, or regular
+            expressions prefixed with ``re:`` (matched from the start of the entity_id).
+
+    Returns:
+        Pattern: A regex matching any of the patterns, or None if there are none. Invalid
+            regular expressions are logged and left out.
+    """
+    parts = []
+    for pattern in patterns or ():
+        if not pattern.startswith("re:"):
+            parts.append(translate(pattern))
+            continue
+        try:
+            re.compile(pattern[3:])
+        except re.error as e:
+            LOG.error(f"Ignoring invalid entity_filter pattern {pattern!r}: {e}")
+            continue
+        parts.append(pattern[3:])
+    if not parts:
+        return None
+    return re.compile("|".join(f"(?:{part})" for part in parts))
+
+
+def compile_attributes(rules: Optional[Dict[str, Any]]) -> Tuple[Tuple[str, frozenset], ...]:
+    """Normalise attribute predicates to (attribute, allowed values) pairs.
+
+    Args:
+        rules (dict): Attribute name to a value or a list of values.
+    """
+    compiled = []
+    for attribute, values in (rules or {}).items():
+        if not isinstance(values, (list, tuple, set, frozenset)):
+            values = [values]
+        compiled.append((attribute, frozenset(values)))
+    return tuple(compiled)
+
+
+def _attribute_in(attributes: dict, name: str, values: frozenset) -> bool:
+    try:
+        return attributes.get(name) in values
+    except TypeError:  # unhashable attribute values such as lists never match
+        return False
+
+
+class EntityFilter:
+    """Include/exclude matcher for Home Assistant state objects.
+
+    An entity is kept when it satisfies every configured include rule and no exclude
+    rule. Rules left empty do not constrain anything, so the default filter keeps
+    every entity.
+    """
+
+    __slots__ = (
+        "include_domains",
+        "exclude_domains",
+        "include_entities",
+        "exclude_entities",
+        "include_areas",
+        "exclude_areas",
+        "include_integrations",
+        "exclude_integrations",
+        "include_attributes",
+        "exclude_attributes",
+        "stats",
+    )
+
+    def __init__(
+        self,
+        include_domains: Iterable[str] = (),
+        exclude_domains: Iterable[str] = (),
+        include_entities: Iterable[str] = (),
+        exclude_entities: Iterable[str] = (),
+        include_areas: Iterable[str] = (),
+        exclude_areas: Iterable[str] = (),
+        include_integrations: Iterable[str] = (),
+        exclude_integrations: Iterable[str] = (),
+        include_attributes: Optional[Dict[str, Any]] = None,
+        exclude_attributes: Optional[Dict[str, Any]] = None,
+    ):
+        """Constructor
+
+        Args:
+            include_domains (Iterable[str]): Only keep entities from these domains.
+            exclude_domains (Iterable[str]): Drop entities from these domains.
+            include_entities (Iterable[str]): Only keep entity_ids matching one of these patterns.
+            exclude_entities (Iterable[str]): Drop entity_ids matching one of these patterns.
+            include_areas (Iterable[str]): Only keep entities in these areas.
+            exclude_areas (Iterable[str]): Drop entities in these areas.
+            include_integrations (Iterable[str]): Only keep entities provided by these integrations.
+            exclude_integrations (Iterable[str]): Drop entities provided by these integrations.
+            include_attributes (dict): Only keep entities whose attributes match every entry.
+            exclude_attributes (dict): Drop entities whose attributes match any entry.
+        """
+        self.include_domains = frozenset(include_domains or ())
+        self.exclude_domains = frozenset(exclude_domains or ())
+        self.include_entities = compile_patterns(include_entities)
+        self.exclude_entities = compile_patterns(exclude_entities)
+        self.include_areas = frozenset(include_areas or ())
+        self.exclude_areas = frozenset(exclude_areas or ())
+        self.include_integrations = frozenset(include_integrations or ())
+        self.exclude_integrations = frozenset(exclude_integrations or ())
+        self.include_attributes = compile_attributes(include_attributes)
+        self.exclude_attributes = compile_attributes(exclude_attributes)
+        self.stats = Counter()
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> "EntityFilter":
+        """Build a filter from the ``entity_filter`` setting.
+
+        Args:
+            config (dict): The setting value; unknown keys are ignored.
+        """
+        config = config or {}
+        return cls(
+            include_domains=config.get("include_domains", ()),
+            exclude_domains=config.get("exclude_domains", ()),
+            include_entities=config.get("include_entities", ()),
+            exclude_entities=config.get("exclude_entities", ()),
+            include_areas=config.get("include_areas", ()),
+            exclude_areas=config.get("exclude_areas", ()),
+            include_integrations=config.get("include_integrations", ()),
+            exclude_integrations=config.get("exclude_integrations", ()),
+            include_attributes=config.get("include_attributes"),
+            exclude_attributes=config.get("exclude_attributes"),
+        )
+
+    def __bool__(self) -> bool:
+        """Whether any rule is configured."""
+        return bool(
+            self.include_domains
+            or self.exclude_domains
+            or self.include_entities
+            or self.exclude_entities
+            or self.include_areas
+            or self.exclude_areas
+            or self.include_integrations
+            or self.exclude_integrations
+            or self.include_attributes
+            or self.exclude_attributes
+        )
+
+    @property
+    def uses_areas(self) -> bool:
+        """Whether any area rule is configured, so states need their area_id resolved."""
+        return bool(self.include_areas or self.exclude_areas)
+
+    @property
+    def integrations(self) -> frozenset:
+        """The integrations named by the integration rules, whose entities states need resolved."""
+        return self.include_integrations | self.exclude_integrations
+
+    def rejects(self, state: dict, check_areas: bool = True, check_integrations: bool = True) -> Optional[str]:
+        """Check a state object against the filter.
+
+        Args:
+            state (dict): A Home Assistant state object. Area rules read its "area_id", which
+                /api/states does not include: the caller resolves it first.
+            check_areas (bool): Apply the area rules. False when areas could not be resolved.
+            check_integrations (bool): Apply the integration rules, which read the state's
+                "integrations", the configured integrations providing it, resolved by the caller.
+                False when they could not be resolved.
+
+        Returns:
+            str: The reason the entity is filtered out, one of FILTER_REASONS, or None to keep it
+        """
+        entity_id = state["entity_id"]
+        domain = entity_id.split(".", 1)[0]
+        if (self.include_domains and domain not in self.include_domains) or domain in self.exclude_domains:
+            return "domain"
+        if (self.include_entities is not None and self.include_entities.match(entity_id) is None) or (
+            self.exclude_entities is not None and self.exclude_entities.match(entity_id) is not None
+        ):
+            return "entity"
+        if check_areas and self.uses_areas:
+            area = state.get("area_id")
+            if (self.include_areas and area not in self.include_areas) or area in self.exclude_areas:
+                return "area"
+        if check_integrations and self.integrations:
+            integrations = state.get("integrations") or ()
+            if (self.include_integrations and self.include_integrations.isdisjoint(integrations)) or not (
+                self.exclude_integrations.isdisjoint(integrations)
+            ):
+                return "integration"
+        if self.include_attributes or self.exclude_attributes:
+            attributes = state.get("attributes") or {}
+            if not all(_attribute_in(attributes, name, values) for name, values in self.include_attributes) or any(
+                _attribute_in(attributes, name, values) for name, values in self.exclude_attributes
+            ):
+                return "attribute"
+        return None
+
+    def __call__(self, state: dict, check_areas: bool = True, check_integrations: bool = True) -> bool:
+        """Return True if the entity should be kept, counting the reason when it is not.
+
+        Args:
+            state (dict): A Home Assistant state object.
+            check_areas (bool): Apply the area rules. False when areas could not be resolved.
+            check_integrations (bool): Apply the integration rules. False when they could not be resolved.
+        """
+        reason = self.rejects(state, check_areas, check_integrations)
+        if reason is None:
+            return True
+        self.stats[reason] += 1
+        return False
@@ -0,0 +1,130 @@
+"""Home Assistant Listener Registry Module.
+
+This module keeps the callbacks interested in each entity's state changes. Callbacks
+are held by weak reference, so registering a device's bound method never keeps the
+device alive: once the registry rebuilds and drops a device, its listener goes with
+it. Entities may have any number of listeners. Listeners should still be unregistered
+explicitly; the counters tell how many were only cleaned up by garbage collection,
+which points at a missing unregister.
+"""
+
+from collections import deque
+from threading import Lock
+from typing import Any, Callable, Deque, Dict, List, Union
+from weakref import WeakMethod, ref
+
+_Reference = Union[WeakMethod, ref]
+
+
+class ListenerRegistry:
+    """Weakly referenced state change listeners per entity id."""
+
+    def __init__(self):
+        self._listeners: Dict[str, List[_Reference]] = {}
+        self._lock = Lock()
+        # Entities whose listeners were garbage collected; pruned on the next call, since a weakref
+        # callback can run during garbage collection on any thread, even one holding the lock
+        self._collected: Deque[str] = deque()
+        self.stats = {"registered": 0, "unregistered": 0, "collected": 0}
+
+    def _reference(self, entity_id: str, callback: Callable) -> _Reference:
+        collected = self._collected
+
+        def on_collected(_reference):
+            collected.append(entity_id)
+
+        if hasattr(callback, "__self__") and hasattr(callback, "__func__"):
+            return WeakMethod(callback, on_collected)
+        return ref(callback, on_collected)
+
+    def register(self, entity_id: str, callback: Callable[[Any], None]) -> None:
+        """Add a listener for an entity's state changes; registering it again has no effect.
+
+        Args:
+            entity_id (str): The entity.
+            callback (Callable): Called with each state change. Only weakly referenced: the
+                caller keeps it alive, e.g. a device registering one of its methods.
+        """
+        with self._lock:
+            self._prune()
+            references = self._listeners.setdefault(entity_id, [])
+            if any(reference() == callback for reference in references):
+                return
+            references.append(self._reference(entity_id, callback))
+            self.stats["registered"] += 1
+
+    def unregister(self, entity_id: str, callback: Callable[[Any], None]) -> bool:
+        """Remove a listener.
+
+        Args:
+            entity_id (str): The entity.
+            callback (Callable): The listener given to register.
+
+        Returns:
+            bool: True if the listener was registered
+        """
+        with self._lock:
+            self._prune()
+            references = self._listeners.get(entity_id, [])
+            for reference in references:
+                if reference() == callback:
+                    references.remove(reference)
+                    if not references:
+                        del self._listeners[entity_id]
+                    self.stats["unregistered"] += 1
+                    return True
+            return False
+
+    def listeners(self, entity_id: str) -> List[Callable[[Any], None]]:
+        """Get the live listeners of an entity, in registration order."""
+        with self._lock:
+            references = self._listeners.get(entity_id)
+            if not references:
+                return []
+            return [callback for callback in (reference() for reference in references) if callback is not None]
+
+    def __contains__(self, entity_id: str) -> bool:
+        return bool(self.listeners(entity_id))
+
+    def __len__(self) -> int:
+        """The number of entities with listeners."""
+        with self._lock:
+            self._prune()
+            return len(self._listeners)
+
+    def clear(self) -> None:
+        """Unregister every listener."""
+        with self._lock:
+            self._prune()
+            self.stats["unregistered"] += sum(len(references) for references in self._listeners.values())
+            self._listeners = {}
+
+    def _prune(self) -> None:
+        """Drop the references of garbage collected listeners; call with the lock held."""
+        while self._collected:
+            entity_id = self._collected.popleft()
+            references = self._listeners.get(entity_id)
+            if not references:
+                continue
+            alive = [reference for reference in references if reference() is not None]
+            self.stats["collected"] += len(references) - len(alive)
+            if alive:
+                self._listeners[entity_id] = alive
+            else:
+                del self._listeners[entity_id]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get the listener counters.
+
+        Returns:
+            dict: "registered" and "unregistered" listeners; "collected", listeners garbage collected
+                without being unregistered (a leak in the caller's cleanup); "entities" and "listeners"
+                currently held
+        """
+        with self._lock:
+            self._prune()
+            return {
+                **self.stats,
+                "entities": len(self._listeners),
+                "listeners": sum(len(references) for references in self._listeners.values()),
+            }
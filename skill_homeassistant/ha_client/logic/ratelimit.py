@@ -0,0 +1,184 @@
+"""Home Assistant Rate Limiting Module.
+
+This module paces service calls so a burst of bus messages from a script cannot
+flood Home Assistant, or the Zigbee/Z-Wave radios behind it. A call needs a token
+from the global bucket and from its domain's bucket, if one is configured, and may
+be held back by a minimum interval between calls to the same entity. When a call
+has to wait it is either delayed until it may go, up to a limit, or rejected.
+Rates must be above 0 and bursts at least 1; the setting's invalid values are logged
+and ignored.
+"""
+
+from threading import Lock
+from time import monotonic, sleep
+from typing import Any, Dict, Optional
+
+from ovos_utils.log import LOG
+
+RATE_LIMIT_MODES = ("queue", "reject")
+
+
+def _limit(limits: Dict[str, Any], key: str, default: float, setting: str) -> Optional[float]:
+    """Read a rate (above 0) or burst (at least 1) from a setting, or None if it is invalid."""
+    value = limits.get(key, default)
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        value = None
+    if value is None or (value <= 0 if key == "rate" else value < 1):
+        LOG.error(f"Ignoring invalid {key} {limits.get(key)!r} in {setting}")
+        return None
+    return value
+
+
+class RateLimited(Exception):
+    """A service call was refused by the rate limiter."""
+
+
+class TokenBucket:
+    """Allows `rate` calls per second on average, in bursts of up to `burst` calls."""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float):
+        """Constructor
+
+        Args:
+            rate (float): Tokens added per second.
+            burst (float): Most tokens held, i.e. calls allowed back to back.
+
+        Raises:
+            ValueError: If rate is not above 0.
+        """
+        if not rate > 0:
+            raise ValueError(f"Rate must be above 0, got {rate}")
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self.updated = monotonic()
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until a token is available."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def consume(self) -> None:
+        """Take a token; call right after wait_time returned 0."""
+        self.tokens -= 1
+
+
+class RateLimiter:
+    """Global, per-domain and per-entity limits for service calls."""
+
+    def __init__(
+        self,
+        rate: float = 10,
+        burst: float = 20,
+        domains: Optional[Dict[str, Dict[str, float]]] = None,
+        entity_interval: float = 0,
+        mode: str = "queue",
+        max_wait: float = 5,
+    ):  # pylint: disable=too-many-arguments
+        """Constructor
+
+        Args:
+            rate (float): Service calls per second across all entities.
+            burst (float): Calls allowed back to back before the rate applies.
+            domains (dict): Per-domain limits, e.g. {"light": {"rate": 5, "burst": 10}}.
+            entity_interval (float): Minimum seconds between calls to the same entity; 0 for none.
+            mode (str): "queue" delays calls until they may go, "reject" refuses them.
+            max_wait (float): Longest delay in queue mode before the call is refused.
+        """
+        self.bucket = TokenBucket(rate, burst)
+        self.domain_buckets = {
+            domain: TokenBucket(float(limits.get("rate", rate)), float(limits.get("burst", limits.get("rate", rate))))
+            for domain, limits in (domains or {}).items()
+        }
+        self.entity_interval = entity_interval
+        self.mode = mode if mode in RATE_LIMIT_MODES else "queue"
+        self.max_wait = max_wait
+        self._last_call: Dict[str, float] = {}
+        self._lock = Lock()
+        self.stats = {"allowed": 0, "delayed": 0, "rejected": 0}
+
+    @classmethod
+    def from_config(cls, config: Any) -> Optional["RateLimiter"]:
+        """Build from the ``rate_limit`` setting.
+
+        Args:
+            config: False or None to disable, True for the defaults, or a dict with
+                rate, burst, domains, entity_interval, mode and max_wait. An invalid
+                global rate or burst is replaced by its default, and a domain with an
+                invalid rate or burst is left to the global limit.
+        """
+        if not config:
+            return None
+        if not isinstance(config, dict):
+            config = {}
+        rate = _limit(config, "rate", 10, "rate_limit") or 10.0
+        burst = _limit(config, "burst", 20, "rate_limit") or 20.0
+        domains = {}
+        for domain, limits in (config.get("domains") or {}).items():
+            limits = limits if isinstance(limits, dict) else {}
+            domain_rate = _limit(limits, "rate", rate, f"rate_limit for {domain}")
+            domain_burst = _limit(limits, "burst", max(1.0, domain_rate or 1), f"rate_limit for {domain}")
+            if domain_rate is None or domain_burst is None:
+                LOG.warning(f"Ignoring the rate_limit for {domain}; the global limit applies")
+                continue
+            domains[domain] = {"rate": domain_rate, "burst": domain_burst}
+        return cls(
+            rate=rate,
+            burst=burst,
+            domains=domains,
+            entity_interval=float(config.get("entity_interval", 0)),
+            mode=config.get("mode", "queue"),
+            max_wait=float(config.get("max_wait", 5)),
+        )
+
+    def _wait_time(self, domain: str, entity_id: str, now: float) -> float:
+        """Seconds until every limit allows the call; call with the lock held."""
+        wait = self.bucket.wait_time(now)
+        domain_bucket = self.domain_buckets.get(domain)
+        if domain_bucket is not None:
+            wait = max(wait, domain_bucket.wait_time(now))
+        if self.entity_interval > 0 and entity_id in self._last_call:
+            wait = max(wait, self._last_call[entity_id] + self.entity_interval - now)
+        return wait
+
+    def acquire(self, domain: str, entity_id: str) -> None:
+        """Wait until a service call may be sent, and count it as sent.
+
+        Args:
+            domain (str): The service domain, e.g. "light".
+            entity_id (str): The target entity.
+
+        Raises:
+            RateLimited: If the call is refused.
+        """
+        deadline = None
+        while True:
+            with self._lock:
+                now = monotonic()
+                wait = self._wait_time(domain, entity_id, now)
+                if wait <= 0:
+                    self.bucket.consume()
+                    if domain in self.domain_buckets:
+                        self.domain_buckets[domain].consume()
+                    if self.entity_interval > 0:
+                        self._last_call[entity_id] = now
+                    self.stats["allowed"] += 1
+                    if deadline is not None:
+                        self.stats["delayed"] += 1
+                    return
+                if deadline is None:
+                    deadline = now + self.max_wait
+                if self.mode == "reject" or now + wait > deadline:
+                    self.stats["rejected"] += 1
+                    raise RateLimited(f"Rate limit reached for {entity_id}")
+            sleep(wait)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get how many calls were allowed, delayed (and then allowed) and rejected."""
+        with self._lock:
+            return dict(self.stats)
@@ -0,0 +1,81 @@
+"""Home Assistant Single-Flight Module.
+
+This module collapses concurrent identical reads into one request. The first caller
+for a key runs the request; callers arriving while it is in flight wait for it and
+receive the same result (or exception) instead of sending a duplicate. After a
+write, invalidate() keeps later callers from joining calls already in flight, which
+may have read the state from before the write.
+"""
+
+from threading import Event, Lock
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Per-key deduplication of concurrent calls.
+
+    Results are shared between the callers of one flight, so they must be treated
+    as read-only.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Tuple[Hashable, int], _Call] = {}
+        self._lock = Lock()
+        self._generation = 0
+        self.stats = {"executed": 0, "shared": 0}
+
+    def do(self, key: Hashable, function: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run function once per key among concurrent callers.
+
+        Args:
+            key (Hashable): Identifies identical calls, e.g. ("state", entity_id).
+            function (Callable): The call to make.
+            *args: Positional arguments for the call.
+            **kwargs: Keyword arguments for the call.
+
+        Returns:
+            The result of the call, shared with every caller that joined it
+        """
+        with self._lock:
+            key = (key, self._generation)
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.stats["executed"] += 1
+            else:
+                self.stats["shared"] += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = function(*args, **kwargs)
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def invalidate(self) -> None:
+        """Start a new generation: calls made from now on no longer join calls already in flight."""
+        with self._lock:
+            self._generation += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get how many calls were executed and how many joined an in-flight call (requests saved)."""
+        with self._lock:
+            return dict(self.stats)
@@ -0,0 +1,108 @@
+"""Home Assistant Streaming Module.
+
+This module provides an incremental parser for the /api/states response, so the
+state list can be turned into devices one entity at a time instead of holding the
+raw body, the decoded text and the full object tree in memory at once.
+"""
+
+import codecs
+import json
+import re
+from typing import Container, Iterable, Iterator, Optional
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_SEPARATOR = re.compile(r"[\s,]*")
+_DOMAIN = re.compile(r'\{\s*"entity_id"\s*:\s*"([^".]*)\.')
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.S)
+_TOKEN = re.compile(r'["{}\[\]]')
+_DECODER = json.JSONDecoder()
+
+
+class _Incomplete(ValueError):
+    """Raised when the buffer ends before the current value does."""
+
+
+def _skip_value(buf: str, pos: int) -> int:
+    """Return the end index of the object or array starting at pos, without decoding it.
+
+    Args:
+        buf (str): The text buffer.
+        pos (int): Index of the opening brace or bracket.
+    """
+    depth = 0
+    while True:
+        token = _TOKEN.search(buf, pos)
+        if token is None:
+            raise _Incomplete
+        char = token.group()
+        if char == '"':
+            string = _STRING.match(buf, token.start())
+            if string is None:
+                raise _Incomplete
+            pos = string.end()
+            continue
+        pos = token.end()
+        if char in "{[":
+            depth += 1
+            continue
+        depth -= 1
+        if depth == 0:
+            return pos
+
+
+def iter_states(chunks: Iterable[bytes], domains: Optional[Container[str]] = None) -> Iterator[dict]:
+    """Yield the state objects of a streamed /api/states body one at a time.
+
+    Home Assistant serialises ``entity_id`` as the first key of every state, so when
+    ``domains`` is given the domain is read from the raw text and entities from other
+    domains are skipped without being decoded.
+
+    Args:
+        chunks (Iterable[bytes]): The response body, e.g. ``response.iter_content()``.
+        domains (Container[str]): Domains to decode. Default None decodes every entity.
+
+    Raises:
+        ValueError: If the body is not a JSON array.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buf, pos, eof = "", 0, False
+
+    def read() -> str:
+        nonlocal eof
+        for chunk in chunks:
+            if chunk:
+                return decoder.decode(chunk)
+        eof = True
+        return decoder.decode(b"", final=True)
+
+    while "[" not in buf:
+        if eof:
+            raise ValueError("Expected a JSON array of states")
+        buf += read()
+    if buf.lstrip()[0] != "[":
+        raise ValueError("Expected a JSON array of states")
+    pos = buf.index("[") + 1
+
+    while True:
+        pos = _SEPARATOR.match(buf, pos).end()
+        if pos == len(buf):
+            if eof:
+                raise ValueError("Unterminated JSON array of states")
+            buf, pos = read(), 0
+            continue
+        if buf[pos] == "]":
+            return
+        try:
+            domain = _DOMAIN.match(buf, pos) if domains is not None else None
+            if domain is not None and domain.group(1) not in domains:
+                pos = _skip_value(buf, pos)
+                continue
+            state, pos = _DECODER.raw_decode(buf, pos)
+        except (_Incomplete, json.JSONDecodeError):
+            if eof:
+                raise
+            buf, pos = buf[pos:] + read(), 0
+            continue
+        yield state
@@ -0,0 +1,141 @@
+"""Home Assistant Adaptive Timeout Module.
+
+This module derives request timeouts from observed latency. Each endpoint class
+keeps a window of recent response times; the read timeout is a high percentile of
+that window with headroom, clamped between a floor and a ceiling, so quick reads
+fail fast while state downloads get the time they usually need. Service calls have a
+higher floor, as Home Assistant answers them only once the service has run. A request
+that times out counts as a sample at its timeout, so repeated timeouts raise the
+timeout instead of keeping it at the level that failed. The connect timeout is fixed,
+since connecting costs the same whatever is requested.
+"""
+
+from collections import deque
+from math import ceil
+from threading import Lock
+from typing import Any, Deque, Dict, Optional, Tuple
+
+# Floors above the general one, for endpoint classes whose latency varies with the work requested
+DEFAULT_FLOORS = {"service": 5.0}
+
+
+class AdaptiveTimeouts:
+    """Per-endpoint (connect, read) timeouts from recent latency percentiles."""
+
+    def __init__(
+        self,
+        connect: float = 2.0,
+        floor: float = 1.0,
+        ceiling: float = 30.0,
+        percentile: float = 95,
+        headroom: float = 3.0,
+        window: int = 50,
+        min_samples: int = 5,
+        floors: Optional[Dict[str, float]] = None,
+    ):  # pylint: disable=too-many-arguments
+        """Constructor
+
+        Args:
+            connect (float): Connect timeout in seconds, used for every endpoint.
+            floor (float): Lowest read timeout in seconds.
+            ceiling (float): Highest read timeout in seconds.
+            percentile (float): Latency percentile the read timeout is based on.
+            headroom (float): Multiplier applied to that percentile.
+            window (int): Recent latencies kept per endpoint class.
+            min_samples (int): Latencies needed before the window is trusted.
+            floors (dict): Lowest read timeout per endpoint class, overriding floor; defaults to
+                DEFAULT_FLOORS.
+        """
+        self.connect = connect
+        self.floor = floor
+        self.ceiling = ceiling
+        self.percentile = percentile
+        self.headroom = headroom
+        self.window = window
+        self.min_samples = min_samples
+        self.floors = dict(DEFAULT_FLOORS if floors is None else floors)
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._lock = Lock()
+
+    @classmethod
+    def from_config(cls, config: Any) -> Optional["AdaptiveTimeouts"]:
+        """Build from the ``adaptive_timeouts`` setting.
+
+        Args:
+            config: False or None to disable, True for the defaults, or a dict of
+                constructor arguments (connect, floor, ceiling, percentile...); "floors" is
+                merged into DEFAULT_FLOORS.
+        """
+        if not config:
+            return None
+        if not isinstance(config, dict):
+            return cls()
+        defaults = cls()
+        return cls(
+            connect=float(config.get("connect", defaults.connect)),
+            floor=float(config.get("floor", defaults.floor)),
+            ceiling=float(config.get("ceiling", defaults.ceiling)),
+            percentile=float(config.get("percentile", defaults.percentile)),
+            headroom=float(config.get("headroom", defaults.headroom)),
+            window=int(config.get("window", defaults.window)),
+            min_samples=int(config.get("min_samples", defaults.min_samples)),
+            floors={
+                **defaults.floors,
+                **{endpoint: float(floor) for endpoint, floor in (config.get("floors") or {}).items()},
+            },
+        )
+
+    def record(self, endpoint: str, seconds: float) -> None:
+        """Record the latency of a successful request.
+
+        Args:
+            endpoint (str): The endpoint class, e.g. "states" or "service".
+            seconds (float): The time until the response arrived.
+        """
+        with self._lock:
+            latencies = self._latencies.get(endpoint)
+            if latencies is None:
+                latencies = self._latencies[endpoint] = deque(maxlen=self.window)
+            latencies.append(seconds)
+
+    def record_timeout(self, endpoint: str, timeout: float) -> None:
+        """Record a request that timed out, as a latency of its read timeout.
+
+        Args:
+            endpoint (str): The endpoint class.
+            timeout (float): The read timeout the request gave up after.
+        """
+        self.record(endpoint, timeout)
+
+    def read_timeout(self, endpoint: str, default: float) -> float:
+        """Get the read timeout for an endpoint class.
+
+        Args:
+            endpoint (str): The endpoint class.
+            default (float): Used until enough latencies have been recorded.
+        """
+        with self._lock:
+            latencies = sorted(self._latencies.get(endpoint, ()))
+        if len(latencies) < self.min_samples:
+            timeout = default
+        else:
+            timeout = latencies[max(0, ceil(self.percentile / 100 * len(latencies)) - 1)] * self.headroom
+        return min(self.ceiling, max(self.floors.get(endpoint, self.floor), timeout))
+
+    def timeout_for(self, endpoint: str, default: float) -> Tuple[float, float]:
+        """Get the (connect, read) timeout pair for requests to an endpoint class.
+
+        Args:
+            endpoint (str): The endpoint class.
+            default (float): The read timeout used until enough latencies have been recorded.
+        """
+        return (self.connect, self.read_timeout(endpoint, default))
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Get the sample count and current read timeout per endpoint class."""
+        with self._lock:
+            samples = {endpoint: len(latencies) for endpoint, latencies in self._latencies.items()}
+        return {
+            endpoint: {"samples": count, "read_timeout": self.read_timeout(endpoint, self.ceiling)}
+            for endpoint, count in samples.items()
+        }
@@ -0,0 +1,54 @@
+"""Home Assistant Connection Validation Module.
+
+This module describes the outcome of checking an instance's URL and access token,
+as done while setting an instance up. The check only requests ``/api/`` and
+``/api/config``, so it answers within a short timeout however many entities the
+instance has, and tells an unreachable instance apart from a rejected token.
+"""
+
+from typing import Any, Dict, Optional
+
+# Seconds each validation request may take
+VALIDATION_TIMEOUT = 5.0
+
+
+class ConnectionValidation:
+    """Result of validating a connection; truthy when every check passed."""
+
+    __slots__ = ("reachable", "auth_ok", "version", "latency", "error")
+
+    def __init__(
+        self,
+        reachable: bool = False,
+        auth_ok: bool = False,
+        version: Optional[str] = None,
+        latency: Optional[float] = None,
+        error: Optional[str] = None,
+    ):
+        """Constructor
+
+        Args:
+            reachable (bool): Whether Home Assistant answered at all.
+            auth_ok (bool): Whether it accepted the access token.
+            version (str): The Home Assistant version, if /api/config reported one.
+            latency (float): Seconds until /api/ answered.
+            error (str): Why the validation failed, None if it passed.
+        """
+        self.reachable = reachable
+        self.auth_ok = auth_ok
+        self.version = version
+        self.latency = latency
+        self.error = error
+
+    def __bool__(self) -> bool:
+        return self.reachable and self.auth_ok and self.error is None
+
+    def __repr__(self) -> str:
+        return (
+            f"ConnectionValidation(reachable={self.reachable}, auth_ok={self.auth_ok}, "
+            f"version={self.version!r}, latency={self.latency!r}, error={self.error!r})"
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialise, e.g. for a bus response."""
+        return {slot: getattr(self, slot) for slot in self.__slots__}
@@ -0,0 +1,31 @@
+"""Decode time of a 10k-entity /api/states payload for each JSON codec.
+
+The baseline is what ``response.json()`` does: decode the body to str, then
+parse it with the stdlib. Codecs whose library is not installed are skipped.
+
+Run with ``python -m test.benchmarks.bench_codec``.
+"""
+
+import json
+import timeit
+
+from skill_homeassistant.ha_client.logic.codec import CODEC_PREFERENCE, get_codec
+from test.benchmarks.payload import make_states_bytes
+
+
+def main(count=10_000, repeat=7):
+    body = make_states_bytes(count)
+    print(f"entities: {count}, /api/states body: {len(body) / 1e6:.1f} MB")
+    baseline = min(timeit.repeat(lambda: json.loads(body.decode("utf-8")), number=1, repeat=repeat))
+    print(f"baseline: {baseline * 1000:6.1f} ms (str copy + json.loads)")
+    for name in CODEC_PREFERENCE:
+        codec = get_codec(name)
+        if codec.name != name:
+            print(f"{name:>8}: not installed, skipped")
+            continue
+        best = min(timeit.repeat(lambda: codec.loads(body), number=1, repeat=repeat))
+        print(f"{name:>8}: {best * 1000:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""State change event throughput against a 10k-entity registry.
+
+Each event is a raw WebSocket ``state_changed`` message for a random entity. The
+router decodes it once and calls only that entity's device; the baseline fans the
+decoded event out to every device, each checking the entity id itself, as the
+listeners did before events were routed. The paced run then feeds the router
+1k events per second and reports how busy that keeps the receiving thread.
+
+Run with ``python -m test.benchmarks.bench_events``.
+"""
+
+import json
+import random
+from time import perf_counter, sleep
+
+from skill_homeassistant.ha_client.constants import SUPPORTED_DEVICES
+from skill_homeassistant.ha_client.logic.connector import HomeAssistantRESTConnector
+from skill_homeassistant.ha_client.logic.utils import map_entity_to_device_type
+from test.benchmarks.payload import make_states
+
+ENTITIES = 10_000
+BASELINE_EVENTS = 200
+
+
+def build_registry(connector, states):
+    devices = []
+    for state in states:
+        device_class = SUPPORTED_DEVICES.get(map_entity_to_device_type(state["entity_id"]))
+        if device_class is not None:
+            devices.append(
+                device_class(
+                    connector,
+                    state["entity_id"],
+                    "mdi:bench",
+                    state["attributes"].get("friendly_name", state["entity_id"]),
+                    state["state"],
+                    state["attributes"],
+                )
+            )
+    return devices
+
+
+def make_events(states, count, seed=2):
+    rng = random.Random(seed)
+    events = []
+    for index in range(count):
+        state = rng.choice(states)
+        new_state = {**state, "state": str(index % 100)}
+        message = {
+            "id": 1,
+            "type": "event",
+            "event": {
+                "event_type": "state_changed",
+                "data": {"entity_id": state["entity_id"], "old_state": state, "new_state": new_state},
+                "origin": "LOCAL",
+                "time_fired": "2026-10-19T07:00:00.000000+00:00",
+            },
+        }
+        events.append(json.dumps(message).encode("utf-8"))
+    return events
+
+
+def fan_out(devices, raw_message):
+    """Deliver an event the way unrouted listeners did: every device gets it and checks the entity id."""
+    message = json.loads(raw_message)
+    event = message.get("event")
+    if event.get("event_type") == "state_changed":
+        new_state = event.get("data").get("new_state")
+        for device in devices:
+            if new_state.get("entity_id") == device.device_id:
+                device.callback_listener(new_state)
+
+
+def main(rate=1000, seconds=2.0):
+    states = make_states(ENTITIES)
+    connector = HomeAssistantRESTConnector("http://bench.local", "bench")
+    devices = build_registry(connector, states)
+    events = make_events(states, int(rate * seconds))
+    print(f"devices: {len(devices)}, events: {len(events)}")
+
+    started = perf_counter()
+    for message in events[:BASELINE_EVENTS]:
+        fan_out(devices, message)
+    baseline = (perf_counter() - started) / BASELINE_EVENTS
+    print(f"fan-out: {baseline * 1e6:8.1f} us/event, {1 / baseline:10.0f} events/s")
+
+    started = perf_counter()
+    for message in events:
+        connector.dispatch_event(message)
+    routed = (perf_counter() - started) / len(events)
+    print(f" routed: {routed * 1e6:8.1f} us/event, {1 / routed:10.0f} events/s")
+
+    interval = 1 / rate
+    busy = 0.0
+    started = perf_counter()
+    for index, message in enumerate(events):
+        delay = started + index * interval - perf_counter()
+        if delay > 0:
+            sleep(delay)
+        dispatch_started = perf_counter()
+        connector.dispatch_event(message)
+        busy += perf_counter() - dispatch_started
+    wall = perf_counter() - started
+    print(f"  paced: {len(events) / wall:.0f} events/s for {wall:.1f} s, receiving thread busy {busy / wall:.1%}")
+    print(f"  stats: {connector.get_event_stats()}")
+    connector.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Retained memory of the device registry for a 10k-entity install.
+
+Compares the registry as built by HomeAssistantClient against the previous
+layout (per-instance ``__dict__``, per-device key strings and the raw
+/api/states list kept alive in ``client.devices``).
+
+Run with ``python -m test.benchmarks.bench_registry_memory``.
+"""
+
+# pylint: disable=missing-class-docstring,missing-function-docstring,too-few-public-methods
+import gc
+import json
+import tracemalloc
+
+from skill_homeassistant.ha_client import HomeAssistantClient
+from skill_homeassistant.ha_client.logic.utils import map_entity_to_device_type
+from test.benchmarks.payload import make_states_bytes
+
+
+class NullConnector:
+    host = "http://bench.local"
+    assist_only = False
+
+    def register_callback(self, *args):
+        pass
+
+    def unregister_callback(self, *args):
+        pass
+
+
+class LegacyDevice:
+    """Mirror of the pre-__slots__ device layout."""
+
+    def __init__(self, connector, device_id, device_icon, device_name, device_state, device_attributes, area):
+        self.connector = connector
+        self.device_id = device_id
+        self.device_icon = device_icon
+        self.device_name = device_name
+        self.device_state = device_state
+        self.device_attributes = device_attributes
+        self.device_area = area
+        self.has_device_class = "device_class" in device_attributes
+        self.device_class = device_attributes.get("device_class")
+        self.device_type = self.device_id.split(".")[0]
+
+
+def build_legacy(body):
+    devices = json.loads(body)
+    registry = []
+    for device in devices:
+        device_type = map_entity_to_device_type(device["entity_id"])
+        if device_type is not None:
+            attributes = device.get("attributes", {})
+            registry.append(
+                LegacyDevice(
+                    NullConnector,
+                    device["entity_id"],
+                    f"mdi:{device_type}",
+                    attributes.get("friendly_name", device["entity_id"]),
+                    device.get("state"),
+                    attributes,
+                    None,
+                )
+            )
+    return devices, registry
+
+
+def build_current(body):
+    client = HomeAssistantClient(config={"assist_only": False})
+    client.connector = NullConnector()
+    client.devices = json.loads(body)
+    client.build_devices()
+    return client
+
+
+def retained(builder, body):
+    gc.collect()
+    tracemalloc.start()
+    result = builder(body)
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current, peak
+
+
+def main(count=10_000):
+    body = make_states_bytes(count)
+    legacy, legacy_peak = retained(build_legacy, body)
+    current, current_peak = retained(build_current, body)
+    print(f"entities: {count}, payload: {len(body) / 1e6:.1f} MB")
+    print(f"legacy registry retained:  {legacy / 1e6:7.2f} MB (peak {legacy_peak / 1e6:.2f} MB)")
+    print(f"current registry retained: {current / 1e6:7.2f} MB (peak {current_peak / 1e6:.2f} MB)")
+    print(f"reduction: {100 * (1 - current / legacy):.0f}%")
+
+
+if __name__ == "__main__":
+    main()
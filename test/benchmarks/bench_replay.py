@@ -0,0 +1,75 @@
+"""Registry build and command round trips replayed from a cassette.
+
+Pass a cassette recorded from a real instance (see the ``cassette`` setting) to
+benchmark against its payloads and, with ``--latency``, its recorded timings.
+Without one, a cassette is recorded from a synthetic 10k-entity install first.
+
+Run with ``python -m test.benchmarks.bench_replay [cassette.json] [--latency]``.
+"""
+
+# pylint: disable=missing-function-docstring
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import Mock, patch
+
+from skill_homeassistant.ha_client import HomeAssistantClient
+from test.benchmarks.payload import make_states_bytes
+
+COMMANDS = 200
+
+
+def command_targets(client):
+    return [device for device in client.registered_devices if device.device_type in ("light", "switch")][:COMMANDS]
+
+
+def record_synthetic(path, count=10_000):
+    response = Mock(status_code=200, headers={"Content-Type": "application/json"})
+    response.content = make_states_bytes(count)
+    service = Mock(status_code=200, headers={"Content-Type": "application/json"}, content=b"[]")
+    client = HomeAssistantClient(config={})
+    client.config.update(
+        {
+            "host": "http://bench.local",
+            "api_key": "bench",
+            "assist_only": False,
+            "cassette": {"path": path, "mode": "record"},
+        }
+    )
+    with patch("requests.Session.get", return_value=response), patch("requests.Session.post", return_value=service):
+        client.init_configuration()
+        for device in command_targets(client):
+            device.turn_off(force=True)
+    client.close()
+
+
+def main(path=None, latency_scale=0):
+    with tempfile.TemporaryDirectory() as directory:
+        if path is None:
+            path = os.path.join(directory, "synthetic.json")
+            record_synthetic(path)
+        client = HomeAssistantClient(config={})
+        client.config.update(
+            {
+                "host": "http://bench.local",
+                "api_key": "bench",
+                "assist_only": False,
+                "cassette": {"path": path, "mode": "replay", "latency_scale": latency_scale},
+            }
+        )
+        start = time.perf_counter()
+        client.init_configuration()
+        build = time.perf_counter() - start
+        devices = command_targets(client)
+        start = time.perf_counter()
+        for device in devices:
+            device.turn_off(force=True)
+        commands = time.perf_counter() - start
+    print(f"registry: {len(client.registered_devices)} devices in {build * 1000:6.0f} ms")
+    print(f"commands: {len(devices)} turn_off in {commands * 1000:6.0f} ms")
+
+
+if __name__ == "__main__":
+    arguments = [argument for argument in sys.argv[1:] if argument != "--latency"]
+    main(arguments[0] if arguments else None, 1 if "--latency" in sys.argv else 0)
@@ -0,0 +1,98 @@
+"""Bytes, peak memory and time to build the registry for a 10k-entity install.
+
+Each fetch mode is run against canned responses with ``requests`` patched out,
+so only decoding and device construction are measured. The template body is
+what Home Assistant renders for the projection template on the same states.
+
+Run with ``python -m test.benchmarks.bench_state_fetch``.
+"""
+
+# pylint: disable=missing-class-docstring,missing-function-docstring
+import gc
+import json
+import time
+import tracemalloc
+from unittest.mock import patch
+
+from skill_homeassistant.ha_client import HomeAssistantClient
+from skill_homeassistant.ha_client.constants import PROJECTED_ATTRIBUTES, SUPPORTED_DEVICES
+from skill_homeassistant.ha_client.logic.streaming import STREAM_CHUNK_SIZE
+from test.benchmarks.payload import make_states, make_states_bytes
+
+
+class CannedResponse:
+    """Stand-in for requests.Response that hands out copies of a fixed body."""
+
+    status_code = 200
+
+    def __init__(self, body):
+        self._body = body
+        self.headers = {"Content-Length": str(len(body))}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    @property
+    def content(self):
+        return bytes(bytearray(self._body))
+
+    def json(self):
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size=STREAM_CHUNK_SIZE):
+        for start in range(0, len(self._body), chunk_size):
+            yield self._body[start : start + chunk_size]
+
+
+def make_projection_bytes(count=10_000, seed=1):
+    rows = [
+        [
+            state["entity_id"],
+            state["state"],
+            [[k, v] for k, v in state["attributes"].items() if k in PROJECTED_ATTRIBUTES],
+        ]
+        for state in make_states(count, seed)
+        if state["entity_id"].split(".")[0] in SUPPORTED_DEVICES
+    ]
+    return json.dumps(rows).encode("utf-8")
+
+
+def measure(mode, body):
+    client = HomeAssistantClient(config={})
+    client.config.update({"host": "http://bench.local", "api_key": "bench", "assist_only": False, "state_fetch": mode})
+    with patch("requests.Session.get", return_value=CannedResponse(body)), patch(
+        "requests.Session.post", return_value=CannedResponse(body)
+    ):
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        client.init_configuration()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return len(client.registered_devices), elapsed, peak
+
+
+def main(count=10_000):
+    bodies = {
+        "full": make_states_bytes(count),
+        "stream": make_states_bytes(count),
+        "template": make_projection_bytes(count),
+    }
+    print(f"entities: {count}")
+    for mode, body in bodies.items():
+        devices, elapsed, peak = measure(mode, body)
+        print(
+            f"{mode:>8}: {len(body) / 1e6:5.2f} MB body, {devices} devices in {elapsed * 1000:6.0f} ms, "
+            f"peak {peak / 1e6:6.2f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Synthetic /api/states payloads for the benchmarks.
+
+The mix roughly follows a large real install: mostly sensors (power meters,
+diagnostics, batteries), a few hundred lights and switches, and a tail of
+entities with very large attributes (media source lists, weather forecasts).
+"""
+
+import json
+import random
+
+DOMAIN_MIX = (
+    ("sensor", 0.55),
+    ("binary_sensor", 0.12),
+    ("light", 0.08),
+    ("switch", 0.08),
+    ("media_player", 0.02),
+    ("climate", 0.01),
+    ("automation", 0.05),
+    ("scene", 0.02),
+    ("weather", 0.01),
+    ("update", 0.04),
+    ("device_tracker", 0.02),
+)
+
+
+def _attributes(domain, index, rng):
+    attributes = {"friendly_name": f"{domain.replace('_', ' ').title()} {index}"}
+    if domain == "sensor":
+        attributes.update(
+            {
+                "state_class": "measurement",
+                "unit_of_measurement": rng.choice(["W", "kWh", "°C", "%", "V"]),
+                "device_class": rng.choice(["power", "energy", "temperature", "battery", "voltage"]),
+            }
+        )
+    elif domain == "light":
+        attributes.update(
+            {
+                "brightness": rng.randint(0, 255),
+                "color_mode": "rgb",
+                "rgb_color": [rng.randint(0, 255) for _ in range(3)],
+                "supported_color_modes": ["color_temp", "rgb"],
+                "effect_list": [f"Effect {n}" for n in range(40)],
+                "supported_features": 44,
+            }
+        )
+    elif domain == "media_player":
+        attributes.update(
+            {
+                "volume_level": round(rng.random(), 2),
+                "source_list": [f"Source {n}" for n in range(150)],
+                "sound_mode_list": [f"Mode {n}" for n in range(20)],
+                "supported_features": 152461,
+            }
+        )
+    elif domain == "climate":
+        attributes.update(
+            {
+                "temperature": 21,
+                "current_temperature": 20.5,
+                "hvac_modes": ["off", "heat", "cool", "auto"],
+                "min_temp": 7,
+                "max_temp": 35,
+            }
+        )
+    elif domain == "weather":
+        attributes["forecast"] = [
+            {"datetime": f"2026-10-{day:02d}T12:00:00", "temperature": rng.randint(0, 30), "condition": "cloudy"}
+            for day in range(1, 29)
+        ]
+    elif domain == "update":
+        attributes["release_summary"] = "Lorem ipsum " * 40
+    return attributes
+
+
+def make_states(count=10_000, seed=1):
+    """Build a list of Home Assistant state objects.
+
+    Args:
+        count (int): Number of entities to generate.
+        seed (int): Random seed, so every run sees the same payload.
+    """
+    rng = random.Random(seed)
+    domains = [domain for domain, _ in DOMAIN_MIX]
+    weights = [weight for _, weight in DOMAIN_MIX]
+    states = []
+    for index in range(count):
+        domain = rng.choices(domains, weights)[0]
+        states.append(
+            {
+                "entity_id": f"{domain}.entity_{index}",
+                "state": rng.choice(["on", "off", "12.3", "unavailable"]),
+                "attributes": _attributes(domain, index, rng),
+                "last_changed": "2026-10-19T07:00:00.000000+00:00",
+                "last_reported": "2026-10-19T07:00:00.000000+00:00",
+                "last_updated": "2026-10-19T07:00:00.000000+00:00",
+                "context": {"id": f"01J{index:023d}", "parent_id": None, "user_id": None},
+            }
+        )
+    return states
+
+
+def make_states_bytes(count=10_000, seed=1):
+    """Build the raw /api/states response body, as Home Assistant sends it."""
+    return json.dumps(make_states(count, seed)).encode("utf-8")
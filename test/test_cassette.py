@@ -0,0 +1,164 @@
+# pylint: disable=missing-function-docstring,missing-class-docstring,missing-module-docstring
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+from skill_homeassistant.ha_client.logic.cassette import CassetteConnector, CassetteMiss
+
+HOST = "http://homeassistant.local"
+STATES = [{"entity_id": "light.kitchen", "state": "on", "attributes": {"friendly_name": "Kitchen"}}]
+
+
+def make_response(body, status=200):
+    response = Mock(status_code=status, headers={"Content-Type": "application/json"})
+    response.content = json.dumps(body).encode()
+    return response
+
+
+class TestCassetteConnector(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "cassettes", "home.json")
+
+    def record(self, **kwargs):
+        connector = CassetteConnector(HOST, "secret_key", cassette_path=self.path, mode="record", **kwargs)
+        with patch("requests.Session.get", return_value=make_response(STATES)), patch(
+            "requests.Session.post", return_value=make_response([])
+        ):
+            connector.get_all_devices()
+            connector.turn_on("light.kitchen", "light")
+        connector.close()
+        return connector
+
+    def test_replays_recorded_exchanges_offline(self):
+        self.record()
+
+        connector = CassetteConnector(HOST, "secret_key", cassette_path=self.path)
+        with patch("requests.Session.get") as mock_get, patch("requests.Session.post") as mock_post:
+            self.assertEqual(connector.get_all_devices(), STATES)
+            self.assertEqual(connector.turn_on("light.kitchen", "light"), [])
+        mock_get.assert_not_called()
+        mock_post.assert_not_called()
+
+    def test_cassette_holds_no_credentials_or_host(self):
+        self.record()
+        with open(self.path, encoding="utf-8") as cassette_file:
+            text = cassette_file.read()
+        self.assertNotIn("secret_key", text)
+        self.assertNotIn(HOST, text)
+
+    def test_streamed_replay(self):
+        self.record()
+        connector = CassetteConnector(HOST, "secret_key", cassette_path=self.path)
+        self.assertEqual(list(connector.iter_all_devices()), STATES)
+
+    def test_unrecorded_request_raises(self):
+        self.record()
+        connector = CassetteConnector(HOST, "secret_key", cassette_path=self.path)
+        with self.assertRaises(CassetteMiss):
+            connector.call_function("light.kitchen", "light", "toggle")
+
+    def test_latency_scale(self):
+        self.record()
+        connector = CassetteConnector(HOST, "secret_key", cassette_path=self.path, latency_scale=2)
+        with patch("skill_homeassistant.ha_client.logic.cassette.sleep") as mock_sleep:
+            connector.get_all_devices()
+        with open(self.path, encoding="utf-8") as cassette_file:
+            elapsed = json.load(cassette_file)["interactions"][0]["elapsed"]
+        mock_sleep.assert_called_once_with(elapsed * 2)
+
+    def test_scrub_anonymises_bodies(self):
+        self.record(scrub=lambda path, body: body.replace(b"Kitchen", b"Room 1"))
+        connector = CassetteConnector(HOST, "secret_key", cassette_path=self.path)
+        self.assertEqual(connector.get_all_devices()[0]["attributes"]["friendly_name"], "Room 1")
+
+    def test_redact_covers_every_recorded_body(self):
+        connector = CassetteConnector(
+            HOST, "secret_key", cassette_path=self.path, mode="record", redact=["friendly_name", "entity_id"]
+        )
+        with patch("requests.Session.get", return_value=make_response(STATES)), patch(
+            "requests.Session.post", return_value=make_response([])
+        ), patch("skill_homeassistant.ha_client.logic.connector.create_connection") as mock_ws:
+            mock_ws.return_value.recv.side_effect = [
+                '{"type": "auth_required"}',
+                '{"type": "auth_ok"}',
+                '{"id": 1, "type": "result", "success": true, "result": {"exposed_entities": '
+                '{"light.kitchen": {"conversation": true, "entity_id": "light.kitchen"}}}}',
+            ]
+            self.assertEqual(connector.get_all_devices(), STATES)
+            connector.turn_on("light.kitchen", "light")
+            self.assertEqual(connector.get_exposed_entities(), {"light.kitchen"})
+        connector.close()
+        with open(self.path, encoding="utf-8") as cassette_file:
+            states, service, websocket = json.load(cassette_file)["interactions"]
+        self.assertNotIn("Kitchen", states["response"]["body"])
+        self.assertNotIn("light.kitchen", states["response"]["body"])
+        self.assertNotIn("light.kitchen", service["request"]["body"])
+        exposed = websocket["response"]["result"]["exposed_entities"]["light.kitchen"]
+        self.assertTrue(exposed["entity_id"].startswith("redacted-"))
+
+        replay = CassetteConnector(HOST, "secret_key", cassette_path=self.path, redact=["friendly_name", "entity_id"])
+        self.assertTrue(replay.get_all_devices()[0]["attributes"]["friendly_name"].startswith("redacted-"))
+        self.assertEqual(replay.turn_on("light.kitchen", "light"), [])
+
+    def test_missing_cassette_replays_nothing(self):
+        connector = CassetteConnector(HOST, "secret_key", cassette_path=self.path)
+        with self.assertRaises(CassetteMiss):
+            connector.call_function("light.kitchen", "light", "toggle")
+
+    def test_invalid_cassette_replays_nothing(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w", encoding="utf-8") as cassette_file:
+            cassette_file.write("{not json")
+        connector = CassetteConnector(HOST, "secret_key", cassette_path=self.path)
+        with self.assertRaises(CassetteMiss):
+            connector.call_function("light.kitchen", "light", "toggle")
+
+    def test_websocket_commands(self):
+        connector = CassetteConnector(HOST, "secret_key", cassette_path=self.path, mode="record")
+        with patch("skill_homeassistant.ha_client.logic.connector.create_connection") as mock_ws:
+            mock_ws.return_value.recv.side_effect = [
+                '{"type": "auth_required"}',
+                '{"type": "auth_ok"}',
+                '{"id": 1, "type": "result", "success": true, "result": {"exposed_entities": '
+                '{"light.kitchen": {"conversation": true}}}}',
+            ]
+            self.assertEqual(connector.get_exposed_entities(), {"light.kitchen"})
+        connector.close()
+
+        replay = CassetteConnector(HOST, "secret_key", cassette_path=self.path)
+        self.assertEqual(replay.get_exposed_entities(), {"light.kitchen"})
+
+    def test_json_bodies_keyed_canonically(self):
+        self.assertEqual(
+            CassetteConnector._key("POST", "/api/template", b'{"template": "x", "area": null}'),
+            CassetteConnector._key("POST", "/api/template", '{"area":null,"template":"x"}'),
+        )
+        self.assertEqual(CassetteConnector._key("POST", "/api/x", b"not json"), ("POST", "/api/x", "not json"))
+
+    def test_validation_replayed_offline(self):
+        connector = CassetteConnector(HOST, "secret_key", cassette_path=self.path, mode="record")
+        responses = [make_response({}), make_response({"version": "2024.6.0"}), make_response({})]
+        with patch("requests.Session.get", side_effect=responses):
+            self.assertEqual(connector.validate().version, "2024.6.0")
+            self.assertTrue(connector._probe(HOST) >= 0)
+        connector.close()
+
+        replay = CassetteConnector(HOST, "secret_key", cassette_path=self.path)
+        with patch("requests.Session.get") as mock_get:
+            result = replay.validate()
+            replay._probe(HOST)
+        mock_get.assert_not_called()
+        self.assertTrue(result)
+        self.assertEqual(result.version, "2024.6.0")
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            CassetteConnector(HOST, "secret_key", cassette_path=self.path, mode="live")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,19 +1,33 @@
 # pylint: disable=missing-function-docstring,missing-class-docstring,missing-module-docstring
+import json
+import time
 import unittest
+from threading import Event
 from unittest.mock import Mock, patch
 
+import requests
+
 from ovos_utils.messagebus import FakeBus, FakeMessage
 from skill_homeassistant.ha_client import HomeAssistantClient, SUPPORTED_DEVICES
+from skill_homeassistant.ha_client.logic.connector import HomeAssistantRESTConnector
+from skill_homeassistant.ha_client.logic.utils import map_entity_to_device_type
+from skill_homeassistant.ha_client.logic.validation import ConnectionValidation
+from test.benchmarks.payload import make_states
 
 
 class FakeConnector:
     def __init__(self):
         self.callbacks = []
         self.host = "http://fake.homeassistant.local"
+        self.state_max_age = 0
+        self.poll_max_age = {}
 
     def register_callback(self, callback, *args):
         self.callbacks.append(callback)
 
+    def unregister_callback(self, callback, *args):
+        self.callbacks.remove(callback)
+
     def turn_off(self, *args):
         return
 
@@ -420,6 +434,54 @@ class TestHomeAssistantClient(unittest.TestCase):
                 self.assertFalse(mock_call.called)
                 self.assertTrue(mock_fuzzy_search.called)
 
+    def test_handle_increase_light_brightness_coalesced(self):
+        # Repeated adjustments within the window become one absolute call
+        fake_message = FakeMessage("test.message", {"device_id": "test_light"}, None)
+        self.plugin.coalescer.window = 60
+        try:
+            with patch.object(self.plugin.device_types["light"], "set_brightness") as mock_set:
+                with patch.object(self.plugin.device_types["light"], "increase_brightness") as mock_step:
+                    first = self.plugin.handle_increase_light_brightness(fake_message)
+                    second = self.plugin.handle_increase_light_brightness(fake_message)
+                    self.assertEqual((first["brightness"], second["brightness"]), (10, 20))
+                    mock_set.assert_not_called()
+                    self.plugin.coalescer.flush()
+                    mock_set.assert_called_once_with(51)
+                    mock_step.assert_not_called()
+        finally:
+            self.plugin.coalescer.window = 0
+
+    def test_handle_adjust_media_volume(self):
+        fake_message = FakeMessage("test.message", {"device_id": "test_media_player", "volume_step": 0.25}, None)
+        with patch.object(self.plugin.device_types["media_player"], "set_volume_level") as mock_set:
+            response = self.plugin.handle_adjust_media_volume(fake_message)
+            mock_set.assert_called_once_with(0.25)
+            self.assertEqual(response["volume"], 25)
+
+    def test_handle_adjust_climate_temperature(self):
+        thermostat = self.plugin.device_types["climate"](
+            FakeConnector(),
+            "climate.test",
+            "mdi:thermostat",
+            "Thermostat",
+            "heat",
+            {"temperature": 20, "min_temp": 7, "max_temp": 21},
+        )
+        fake_message = FakeMessage("test.message", {"device_id": "climate.test", "temperature_step": 2}, None)
+        self.plugin.registered_devices.append(thermostat)
+        try:
+            with patch.object(self.plugin.device_types["climate"], "set_temperature") as mock_set:
+                response = self.plugin.handle_adjust_climate_temperature(fake_message)
+                mock_set.assert_called_once_with(21)
+                self.assertEqual(response["temperature"], 21)
+        finally:
+            self.plugin.registered_devices.remove(thermostat)
+
+    def test_handle_adjust_climate_temperature_without_setpoint(self):
+        fake_message = FakeMessage("test.message", {"device_id": "test_media_player"}, None)
+        response = self.plugin.handle_adjust_climate_temperature(fake_message)
+        self.assertIn("response", response)
+
     # Decrease light brightness
     def test_handle_decrease_light_brightness_with_device_id(self):
         # Device passed explicitly
@@ -527,6 +589,22 @@ class TestHomeAssistantClient(unittest.TestCase):
                 self.assertTrue(mock_fuzzy_search.called)
                 self.assertTrue(mock_call.called)
 
+    def test_handle_set_light_color_resolves_localised_name(self):
+        fake_message = FakeMessage(
+            "test.message", {"device_id": "test_light", "color": "azul claro", "lang": "es-es"}, None
+        )
+        with patch.object(self.plugin.device_types["light"], "set_color") as mock_call:
+            response = self.plugin.handle_set_light_color(fake_message)
+            mock_call.assert_called_once_with("lightblue")
+            self.assertEqual(response["color"], "azul claro")
+
+    def test_handle_set_light_color_unknown_color(self):
+        fake_message = FakeMessage("test.message", {"device_id": "test_light", "color": "banana"}, None)
+        with patch.object(self.plugin.device_types["light"], "set_color") as mock_call:
+            response = self.plugin.handle_set_light_color(fake_message)
+            mock_call.assert_not_called()
+            self.assertEqual(response["unknown_color"], "banana")
+
     def test_handle_set_light_color_device_does_not_exist(self):
         # Device does not exist
         bad_message = FakeMessage(
@@ -550,8 +628,8 @@ class TestHomeAssistantClient(unittest.TestCase):
             {"friendly_name": "Test Light"},
             "Living Room",
         )
-        with patch.object(fake_bulb, "call_function") as mock_call:
-            with patch.object(fake_bulb, "update_device"):
+        with patch.object(self.plugin.device_types["light"], "call_function") as mock_call:
+            with patch.object(self.plugin.device_types["light"], "update_device"):
                 fake_bulb.increase_brightness(20)
                 mock_call.assert_called_with("turn_on", {"brightness_step_pct": 20})
                 fake_bulb.increase_brightness(50)
@@ -567,17 +645,18 @@ class TestHomeAssistantClient(unittest.TestCase):
             {"friendly_name": "Test Light"},
             "Living Room",
         )
-        with patch.object(fake_bulb, "call_function") as mock_call:
-            with patch.object(fake_bulb, "update_device"):
+        with patch.object(self.plugin.device_types["light"], "call_function") as mock_call:
+            with patch.object(self.plugin.device_types["light"], "update_device"):
                 fake_bulb.decrease_brightness(20)
                 mock_call.assert_called_with("turn_on", {"brightness_step_pct": -20})
                 fake_bulb.decrease_brightness(50)
                 mock_call.assert_called_with("turn_on", {"brightness_step_pct": -50})
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_verify_ssl(self, mock_get):
         # Use a separate plugin instance to avoid mutating shared state
         test_plugin = HomeAssistantClient(config={})
+        mock_get.return_value.content = b"[]"
 
         # Set config directly, then call init_configuration
         test_plugin.config["host"] = "http://homeassistant.local"
@@ -585,7 +664,11 @@ class TestHomeAssistantClient(unittest.TestCase):
         test_plugin.init_configuration()
         mock_get.assert_called_with(
             "http://homeassistant.local/api/states",
-            headers={"Authorization": "Bearer FAKE_API_KEY", "content-type": "application/json"},
+            headers={
+                "Authorization": "Bearer FAKE_API_KEY",
+                "content-type": "application/json",
+                "Accept-Encoding": "gzip, deflate",
+            },
             timeout=3,
             verify=True,
         )
@@ -597,7 +680,11 @@ class TestHomeAssistantClient(unittest.TestCase):
         # Verify that verify_ssl is now False
         mock_get.assert_called_with(
             "http://homeassistant.local/api/states",
-            headers={"Authorization": "Bearer FAKE_API_KEY", "content-type": "application/json"},
+            headers={
+                "Authorization": "Bearer FAKE_API_KEY",
+                "content-type": "application/json",
+                "Accept-Encoding": "gzip, deflate",
+            },
             timeout=3,
             verify=False,
         )
@@ -619,11 +706,68 @@ class TestHomeAssistantClient(unittest.TestCase):
         self.assertIsInstance(result["devices"], list)
         self.assertGreater(len(result["devices"]), 0)
 
+    def test_handle_get_devices_batches_stale_states_per_instance(self):
+        """Test handle_get_devices refreshes the stale devices of each instance with one multi-get."""
+        plugin = HomeAssistantClient(config={})
+        house, garage = Mock(poll_max_age={}), Mock(poll_max_age={})
+        house.name, garage.name = "", "garage"
+        house.get_device_states.return_value = {
+            "light.porch": {"entity_id": "light.porch", "state": "on", "attributes": {}},
+            "switch.fan": {"entity_id": "switch.fan", "state": "on", "attributes": {}},
+        }
+        garage.get_device_states.return_value = {
+            "light.porch": {"entity_id": "light.porch", "state": "off", "attributes": {}},
+            "switch.heater": {"entity_id": "switch.heater", "state": "off", "attributes": {}},
+        }
+        plugin.registered_devices = [
+            plugin.device_types[entity_id.split(".")[0]](connector, entity_id, "", entity_id, "unknown", {})
+            for connector, entity_id in (
+                (house, "light.porch"),
+                (house, "switch.fan"),
+                (garage, "light.porch"),
+                (garage, "switch.heater"),
+            )
+        ]
+
+        result = plugin.handle_get_devices()
+
+        self.assertEqual(list(house.get_device_states.call_args[0][0]), ["light.porch", "switch.fan"])
+        self.assertEqual(list(garage.get_device_states.call_args[0][0]), ["light.porch", "switch.heater"])
+        house.get_device_state.assert_not_called()
+        garage.get_device_state.assert_not_called()
+        states = {model["id"]: model["state"] for model in result["devices"]}
+        self.assertEqual(
+            states,
+            {"light.porch": "on", "switch.fan": "on", "garage/light.porch": "off", "garage/switch.heater": "off"},
+        )
+
+    def test_brightness_adjustments_coalesced_per_instance(self):
+        """Test pending adjustments of one entity id on two instances are kept apart."""
+        plugin = HomeAssistantClient(config={})
+        plugin.coalescer.window = 60
+        house, garage = Mock(name="house", state_max_age=0), Mock(name="garage", state_max_age=0)
+        house.name, garage.name = "", "garage"
+        plugin.registered_devices = [
+            plugin.device_types["light"](connector, "light.porch", "", "Porch", "on", {"brightness": brightness})
+            for connector, brightness in ((house, 0), (garage, 255))
+        ]
+
+        with patch.object(plugin.device_types["light"], "update_device"):
+            house_pct = plugin.handle_increase_light_brightness(FakeMessage("", {"device_id": "light.porch"}))
+            garage_pct = plugin.handle_decrease_light_brightness(
+                FakeMessage("", {"device_id": "garage/light.porch"})
+            )
+            plugin.coalescer.flush()
+
+        self.assertEqual((house_pct["brightness"], garage_pct["brightness"]), (10, 90))
+        house.call_function.assert_called_once_with("light.porch", "light", "turn_on", {"brightness": 26})
+        garage.call_function.assert_called_once_with("light.porch", "light", "turn_on", {"brightness": 230})
+
     @patch("skill_homeassistant.ha_client.HomeAssistantRESTConnector")
     def test_validate_instance_connection_success(self, mock_connector_class):
-        """Test validate_instance_connection returns True on success."""
+        """Test validate_instance_connection returns a truthy result on success."""
         mock_connector = Mock()
-        mock_connector.get_all_devices.return_value = [{"entity_id": "light.test"}]
+        mock_connector.validate.return_value = ConnectionValidation(True, True, "2024.6.0", 0.01)
         mock_connector_class.return_value = mock_connector
 
         result = self.plugin.validate_instance_connection(
@@ -631,11 +775,15 @@ class TestHomeAssistantClient(unittest.TestCase):
         )
 
         self.assertTrue(result)
-        mock_connector.get_all_devices.assert_called_once()
+        self.assertEqual(result.version, "2024.6.0")
+        mock_connector.validate.assert_called_once()
+        mock_connector.get_all_devices.assert_not_called()
+        self.assertIs(self.plugin.temporary_instance, mock_connector)
+        self.plugin.temporary_instance = None
 
     @patch("skill_homeassistant.ha_client.HomeAssistantRESTConnector")
     def test_validate_instance_connection_failure(self, mock_connector_class):
-        """Test validate_instance_connection returns False on exception."""
+        """Test validate_instance_connection returns a falsy result on exception."""
         mock_connector_class.side_effect = Exception("Connection failed")
 
         result = self.plugin.validate_instance_connection(
@@ -643,6 +791,19 @@ class TestHomeAssistantClient(unittest.TestCase):
         )
 
         self.assertFalse(result)
+        self.assertEqual(result.error, "Connection failed")
+
+    def test_validated_session_is_reused(self):
+        """Test the connector built for a validated instance keeps the validation's connections."""
+        with patch.object(HomeAssistantRESTConnector, "validate", return_value=ConnectionValidation(True, True)):
+            self.assertTrue(self.plugin.validate_instance_connection("http://ha.local/", "api_key", True, True))
+        session = self.plugin.temporary_instance.session
+
+        connector = self.plugin._build_connector("", "http://ha.local", "api_key", True, True)
+
+        self.assertIs(connector.session, session)
+        self.assertIsNone(self.plugin.temporary_instance)
+        connector.close()
 
     def test_handle_call_supported_function_without_args(self):
         """Test calling a function without additional arguments."""
@@ -762,7 +923,7 @@ class TestHomeAssistantClient(unittest.TestCase):
         # May be None if no device_class attribute
         _ = device.get_device_class()
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_config_removal_clears_state(self, mock_get):
         """Test that removing config clears connector and device state."""
         # Use a separate plugin instance to avoid mutating shared state
@@ -771,7 +932,7 @@ class TestHomeAssistantClient(unittest.TestCase):
         # First, set up a valid connection
         test_plugin.config["host"] = "http://homeassistant.local"
         test_plugin.config["api_key"] = "FAKE_API_KEY"
-        mock_get.return_value.json.return_value = [{"entity_id": "light.test", "state": "on"}]
+        mock_get.return_value.content = json.dumps([{"entity_id": "light.test", "state": "on"}]).encode()
         test_plugin.init_configuration()
 
         # Verify we have a connection
@@ -790,7 +951,7 @@ class TestHomeAssistantClient(unittest.TestCase):
         self.assertEqual(test_plugin.registered_devices, [])
         self.assertEqual(test_plugin.registered_device_names, [])
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_update_config(self, mock_get):
         """Test that update_config updates config and reinitializes."""
         # Use a separate plugin instance to avoid mutating shared state
@@ -800,7 +961,7 @@ class TestHomeAssistantClient(unittest.TestCase):
         self.assertFalse(test_plugin.instance_available)
 
         # Use update_config to add configuration
-        mock_get.return_value.json.return_value = [{"entity_id": "light.test", "state": "on"}]
+        mock_get.return_value.content = json.dumps([{"entity_id": "light.test", "state": "on"}]).encode()
         new_config = {"host": "http://new-ha.local", "api_key": "NEW_KEY"}
         test_plugin.update_config(new_config)
 
@@ -810,7 +971,32 @@ class TestHomeAssistantClient(unittest.TestCase):
         self.assertTrue(test_plugin.instance_available)
         self.assertIsNotNone(test_plugin.connector)
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
+    def test_update_config_does_only_the_needed_work(self, mock_get):
+        """Test runtime settings skip the reconnect and registry settings reuse the connector."""
+        mock_get.return_value.content = json.dumps(
+            [{"entity_id": "light.test", "state": "on"}, {"entity_id": "switch.test", "state": "off"}]
+        ).encode()
+        config = {"host": "http://ha.local", "api_key": "KEY", "assist_only": False}
+        test_plugin = HomeAssistantClient(config=dict(config))
+        connector = test_plugin.connector
+        fetches = mock_get.call_count
+
+        with patch.object(test_plugin, "init_configuration") as mock_init:
+            test_plugin.update_config({**config, "brightness_increment": 25, "silent_entities": {"light.test"}})
+            mock_init.assert_not_called()
+        self.assertEqual(test_plugin.brightness_increment, 25)
+        self.assertEqual(mock_get.call_count, fetches)
+
+        test_plugin.update_config({**config, "entity_filter": {"exclude_domains": ["switch"]}})
+        self.assertIs(test_plugin.connector, connector)
+        self.assertEqual([device.device_id for device in test_plugin.registered_devices], ["light.test"])
+
+        test_plugin.update_config({**config, "timeout": 10})
+        self.assertIsNot(test_plugin.connector, connector)
+        test_plugin.close()
+
+    @patch("requests.Session.get")
     def test_refresh_devices_fetches_fresh_data(self, mock_get):
         """Test that refresh_devices fetches fresh data from HA and rebuilds list."""
         test_plugin = HomeAssistantClient(config={})
@@ -818,9 +1004,9 @@ class TestHomeAssistantClient(unittest.TestCase):
         # Set up initial config with one device
         test_plugin.config["host"] = "http://homeassistant.local"
         test_plugin.config["api_key"] = "FAKE_API_KEY"
-        mock_get.return_value.json.return_value = [
+        mock_get.return_value.content = json.dumps([
             {"entity_id": "light.test", "state": "on", "attributes": {"friendly_name": "Test Light"}}
-        ]
+        ]).encode()
         test_plugin.init_configuration()
 
         # Verify initial state
@@ -828,11 +1014,11 @@ class TestHomeAssistantClient(unittest.TestCase):
         self.assertEqual(test_plugin.registered_device_names, ["Test Light"])
 
         # Now simulate HA returning more devices
-        mock_get.return_value.json.return_value = [
+        mock_get.return_value.content = json.dumps([
             {"entity_id": "light.test", "state": "on", "attributes": {"friendly_name": "Test Light"}},
             {"entity_id": "light.new", "state": "off", "attributes": {"friendly_name": "New Light"}},
             {"entity_id": "switch.test", "state": "on", "attributes": {"friendly_name": "Test Switch"}},
-        ]
+        ]).encode()
 
         # Call refresh_devices
         count = test_plugin.refresh_devices()
@@ -842,6 +1028,309 @@ class TestHomeAssistantClient(unittest.TestCase):
         self.assertEqual(len(test_plugin.registered_devices), 3)
         self.assertIn("New Light", test_plugin.registered_device_names)
         self.assertIn("Test Switch", test_plugin.registered_device_names)
+        # The replaced devices were released rather than left for garbage collection
+        stats = test_plugin.connector.get_listener_stats()
+        self.assertEqual((stats["entities"], stats["unregistered"], stats["collected"]), (3, 1, 0))
+
+    @patch("requests.Session.post")
+    @patch("requests.Session.get")
+    def test_area_rules_resolve_areas(self, mock_get, mock_post):
+        """Test area rules work on a real /api/states payload, which carries no area ids."""
+        states = make_states(40)
+        self.assertFalse(any("area_id" in state for state in states))
+        lights = [state["entity_id"] for state in states if state["entity_id"].startswith("light.")]
+        kitchen = set(lights[:2])
+        mock_get.return_value.content = json.dumps(states).encode()
+        mock_post.return_value.content = json.dumps([[entity_id, "kitchen"] for entity_id in kitchen]).encode()
+        config = {
+            "host": "http://ha.local",
+            "api_key": "KEY",
+            "assist_only": False,
+            "entity_filter": {"include_areas": ["kitchen"]},
+        }
+        test_plugin = HomeAssistantClient(config=config)
+
+        self.assertEqual({device.device_id for device in test_plugin.registered_devices}, kitchen)
+        self.assertEqual({device.device_area for device in test_plugin.registered_devices}, {"kitchen"})
+        self.assertIn("area_id(s.entity_id)", json.loads(mock_post.call_args[1]["data"])["template"])
+
+        # The state list can be shared between callers, so resolving areas must not modify it
+        test_plugin.devices = states
+        test_plugin.build_devices()
+        self.assertFalse(any("area_id" in state for state in states))
+
+        # Without areas, the area rules are skipped rather than dropping every entity
+        mock_post.side_effect = requests.exceptions.ConnectionError("Connection refused")
+        test_plugin.refresh_devices()
+        self.assertGreater(len(test_plugin.registered_devices), len(kitchen))
+        test_plugin.close()
+
+    @patch("requests.Session.post")
+    @patch("requests.Session.get")
+    def test_integration_rules_resolve_integration_entities(self, mock_get, mock_post):
+        """Test integration rules work on a real /api/states payload, which names no integrations."""
+        states = make_states(40)
+        supported = [state["entity_id"] for state in states if map_entity_to_device_type(state["entity_id"])]
+        hue = set(supported[:2])
+        mock_get.return_value.content = json.dumps(states).encode()
+        mock_post.return_value.content = json.dumps([[entity_id, "hue"] for entity_id in hue]).encode()
+        config = {
+            "host": "http://ha.local",
+            "api_key": "KEY",
+            "assist_only": False,
+            "entity_filter": {"exclude_integrations": ["hue"]},
+        }
+        test_plugin = HomeAssistantClient(config=config)
+
+        registered = {device.device_id for device in test_plugin.registered_devices}
+        self.assertTrue(registered)
+        self.assertFalse(registered & hue)
+        self.assertEqual(test_plugin.entity_filter.stats["integration"], 2)
+        template = json.loads(mock_post.call_args[1]["data"])["template"]
+        self.assertIn('for name in ["hue"]', template)
+        self.assertIn("integration_entities(name)", template)
+
+        # Without the integration entities, the integration rules are skipped
+        mock_post.side_effect = requests.exceptions.ConnectionError("Connection refused")
+        test_plugin.refresh_devices()
+        self.assertTrue(hue <= {device.device_id for device in test_plugin.registered_devices})
+        test_plugin.close()
+
+    @patch("requests.Session.get")
+    def test_build_devices_releases_raw_states(self, mock_get):
+        """Test the raw /api/states list is not kept once the registry is built."""
+        test_plugin = HomeAssistantClient(config={})
+        test_plugin.config["host"] = "http://homeassistant.local"
+        test_plugin.config["api_key"] = "FAKE_API_KEY"
+        mock_get.return_value.content = json.dumps([
+            {"entity_id": "light.test", "state": "on", "attributes": {"friendly_name": "Test Light"}}
+        ]).encode()
+        test_plugin.init_configuration()
+
+        self.assertTrue(test_plugin.instance_available)
+        self.assertEqual(len(test_plugin.registered_devices), 1)
+        self.assertEqual(test_plugin.devices, [])
+
+    @patch("requests.Session.get")
+    def test_stream_state_fetch(self, mock_get):
+        """Test the stream fetch mode builds the registry from the streamed body."""
+        test_plugin = HomeAssistantClient(config={"state_fetch": "stream"})
+        test_plugin.config["host"] = "http://homeassistant.local"
+        test_plugin.config["api_key"] = "FAKE_API_KEY"
+        mock_get.return_value.iter_content.return_value = [
+            b'[{"entity_id": "light.test", "state": "on", "attributes": {"friendly_name": "Test Light"}},',
+            b' {"entity_id": "update.core", "state": "off", "attributes": {}}]',
+        ]
+        test_plugin.init_configuration()
+
+        self.assertTrue(test_plugin.instance_available)
+        self.assertEqual(test_plugin.registered_device_names, ["Test Light"])
+        self.assertTrue(mock_get.call_args.kwargs["stream"])
+
+    @patch("requests.Session.get")
+    @patch("requests.Session.post")
+    def test_template_state_fetch(self, mock_post, mock_get):
+        """Test the template fetch mode builds the registry from the projection."""
+        test_plugin = HomeAssistantClient(config={"state_fetch": "template"})
+        test_plugin.config["host"] = "http://homeassistant.local"
+        test_plugin.config["api_key"] = "FAKE_API_KEY"
+        mock_post.return_value.content = json.dumps([["light.test", "on", [["friendly_name", "Test Light"]]]]).encode()
+        test_plugin.init_configuration()
+
+        self.assertTrue(test_plugin.instance_available)
+        self.assertEqual(test_plugin.registered_device_names, ["Test Light"])
+        mock_get.assert_not_called()
+
+    @patch("requests.Session.get")
+    @patch("requests.Session.post")
+    def test_template_state_fetch_falls_back(self, mock_post, mock_get):
+        """Test the template fetch mode falls back to /api/states when rendering fails."""
+        test_plugin = HomeAssistantClient(config={"state_fetch": "template"})
+        test_plugin.config["host"] = "http://homeassistant.local"
+        test_plugin.config["api_key"] = "FAKE_API_KEY"
+        mock_post.return_value.content = b"not JSON"
+        mock_get.return_value.content = json.dumps([
+            {"entity_id": "light.test", "state": "on", "attributes": {"friendly_name": "Test Light"}}
+        ]).encode()
+        test_plugin.init_configuration()
+
+        self.assertEqual(test_plugin.registered_device_names, ["Test Light"])
+        self.assertEqual(mock_get.call_args[0][0], "http://homeassistant.local/api/states")
+
+    @patch("skill_homeassistant.ha_client.logic.connector.create_connection")
+    @patch("requests.Session.get")
+    def test_assist_only_registers_exposed_entities(self, mock_get, mock_ws):
+        """Test assist_only registers only the entities exposed to Assist."""
+        test_plugin = HomeAssistantClient(config={"assist_only": True})
+        test_plugin.config["host"] = "http://homeassistant.local"
+        test_plugin.config["api_key"] = "FAKE_API_KEY"
+        mock_ws.return_value.recv.side_effect = [
+            '{"type": "auth_required"}',
+            '{"type": "auth_ok"}',
+            '{"id": 1, "type": "result", "success": true, "result": {"exposed_entities": '
+            '{"light.exposed": {"conversation": true}, "light.hidden": {"conversation": false}}}}',
+        ]
+        mock_get.return_value.content = json.dumps(
+            [
+                {"entity_id": "light.exposed", "state": "on", "attributes": {"friendly_name": "Exposed"}},
+                {"entity_id": "light.hidden", "state": "on", "attributes": {"friendly_name": "Hidden"}},
+            ]
+        ).encode()
+        test_plugin.init_configuration()
+
+        self.assertEqual(test_plugin.registered_device_names, ["Exposed"])
+
+    @patch("skill_homeassistant.ha_client.logic.connector.create_connection")
+    @patch("requests.Session.get")
+    def test_assist_only_falls_back_to_all_entities(self, mock_get, mock_ws):
+        """Test assist_only registers every entity when the exposed list cannot be loaded."""
+        test_plugin = HomeAssistantClient(config={"assist_only": True})
+        test_plugin.config["host"] = "http://homeassistant.local"
+        test_plugin.config["api_key"] = "FAKE_API_KEY"
+        mock_ws.side_effect = ConnectionRefusedError
+        mock_get.return_value.content = json.dumps(
+            [
+                {"entity_id": "light.exposed", "state": "on", "attributes": {"friendly_name": "Exposed"}},
+                {"entity_id": "light.hidden", "state": "on", "attributes": {"friendly_name": "Hidden"}},
+            ]
+        ).encode()
+        test_plugin.init_configuration()
+
+        self.assertEqual(test_plugin.registered_device_names, ["Exposed", "Hidden"])
+
+    @patch("requests.Session.get")
+    def test_entity_filter_skips_entities(self, mock_get):
+        """Test the entity_filter setting is applied before devices are built."""
+        test_plugin = HomeAssistantClient(
+            config={"assist_only": False, "entity_filter": {"exclude_entities": ["sensor.*_battery"]}}
+        )
+        test_plugin.config["host"] = "http://homeassistant.local"
+        test_plugin.config["api_key"] = "FAKE_API_KEY"
+        mock_get.return_value.content = json.dumps([
+            {"entity_id": "sensor.temperature", "state": "20", "attributes": {"friendly_name": "Temperature"}},
+            {"entity_id": "sensor.phone_battery", "state": "80", "attributes": {"friendly_name": "Phone"}},
+        ]).encode()
+        test_plugin.init_configuration()
+
+        self.assertEqual(test_plugin.registered_device_names, ["Temperature"])
+        self.assertEqual(test_plugin.entity_filter.stats, {"entity": 1})
+
+    @patch("requests.Session.post")
+    @patch("requests.Session.get")
+    def test_offline_queue_replays_when_home_assistant_returns(self, mock_get, mock_post):
+        """Test commands that fail to connect are queued and replayed once /api/ answers."""
+        test_plugin = HomeAssistantClient(
+            config={"assist_only": False, "offline_queue": {"path": "", "retry_interval": 60}}
+        )
+        test_plugin.config["host"] = "http://homeassistant.local"
+        test_plugin.config["api_key"] = "FAKE_API_KEY"
+        mock_get.return_value.content = json.dumps([
+            {"entity_id": "switch.fan", "state": "off", "attributes": {"friendly_name": "Fan"}}
+        ]).encode()
+        test_plugin.init_configuration()
+        mock_post.side_effect = requests.exceptions.ConnectionError("Connection refused")
+
+        test_plugin.handle_turn_on(FakeMessage("", {"device_id": "switch.fan"}))
+
+        self.assertEqual(len(test_plugin.command_queue), 1)
+        self.assertIsNotNone(test_plugin._replay_timer)  # pylint: disable=protected-access
+        test_plugin._replay_timer.cancel()  # pylint: disable=protected-access
+
+        mock_post.side_effect = None
+        mock_post.return_value.content = b"[]"
+        test_plugin._replay_queued_commands()  # pylint: disable=protected-access
+
+        self.assertEqual(len(test_plugin.command_queue), 0)
+        self.assertEqual(mock_post.call_args[0][0], "http://homeassistant.local/api/services/switch/turn_on")
+
+    @patch("requests.Session.post")
+    @patch("requests.Session.get")
+    def test_multiple_instances_merge_into_one_registry(self, mock_get, mock_post):
+        """Test entities of every instance are registered and commands go to the owning instance."""
+        states = {
+            "http://house.local/api/states": [
+                {"entity_id": "light.porch", "state": "on", "attributes": {"friendly_name": "Porch Light"}}
+            ],
+            "http://garage.local/api/states": [
+                {"entity_id": "light.porch", "state": "off", "attributes": {"friendly_name": "Garage Porch"}},
+                {"entity_id": "switch.heater", "state": "off", "attributes": {"friendly_name": "Heater"}},
+            ],
+        }
+
+        def get(url, **kwargs):
+            response = Mock()
+            response.content = json.dumps(states[url]).encode()
+            return response
+
+        mock_get.side_effect = get
+        mock_post.return_value.content = b"[]"
+        test_plugin = HomeAssistantClient(
+            config={
+                "host": "http://house.local",
+                "api_key": "HOUSE_KEY",
+                "assist_only": False,
+                "instances": [
+                    {"name": "garage", "host": "http://garage.local", "api_key": "GARAGE_KEY"},
+                    {"name": "garage", "host": "http://duplicate.local", "api_key": "KEY"},
+                ],
+            }
+        )
+
+        self.assertEqual(list(test_plugin.connectors), ["", "garage"])
+        self.assertEqual(test_plugin.registered_device_names, ["Porch Light", "Garage Porch", "Heater"])
+        ids = [device["id"] for device in test_plugin.handle_get_devices()["devices"]]
+        self.assertEqual(ids, ["light.porch", "garage/light.porch", "garage/switch.heater"])
+
+        test_plugin.handle_turn_on(FakeMessage("", {"device": "heater"}))
+        self.assertEqual(mock_post.call_args[0][0], "http://garage.local/api/services/switch/turn_on")
+        self.assertEqual(mock_post.call_args.kwargs["headers"]["Authorization"], "Bearer GARAGE_KEY")
+
+        test_plugin.handle_turn_off(FakeMessage("", {"device_id": "light.porch"}))
+        self.assertEqual(mock_post.call_args[0][0], "http://house.local/api/services/light/turn_off")
+        test_plugin.handle_turn_off(FakeMessage("", {"device_id": "garage/light.porch"}))
+        self.assertEqual(mock_post.call_args[0][0], "http://garage.local/api/services/light/turn_off")
+
+    @patch("requests.Session.get")
+    def test_slow_instance_registers_late(self, mock_get):
+        """Test a blocked instance delays none of the others' devices and fills in once it answers."""
+        states = {
+            "http://house.local/api/states": [
+                {"entity_id": "light.porch", "state": "on", "attributes": {"friendly_name": "Porch Light"}}
+            ],
+            "http://garage.local/api/states": [
+                {"entity_id": "switch.heater", "state": "off", "attributes": {"friendly_name": "Heater"}}
+            ],
+        }
+        unblock = Event()
+
+        def get(url, **kwargs):
+            if url.startswith("http://house.local"):
+                unblock.wait(5)
+            response = Mock()
+            response.content = json.dumps(states[url]).encode()
+            return response
+
+        mock_get.side_effect = get
+        test_plugin = HomeAssistantClient(
+            config={
+                "host": "http://house.local",
+                "api_key": "HOUSE_KEY",
+                "assist_only": False,
+                "fetch_deadline": 0.1,
+                "io_executor": True,
+                "instances": [{"name": "garage", "host": "http://garage.local", "api_key": "GARAGE_KEY"}],
+            }
+        )
+        self.assertEqual(test_plugin.registered_device_names, ["Heater"])
+        self.assertNotEqual(test_plugin.connector.executor, test_plugin.connectors["garage"].executor)
+
+        unblock.set()
+        for _ in range(50):
+            if len(test_plugin.registered_devices) == 2:
+                break
+            time.sleep(0.05)
+        # The main instance still comes first
+        self.assertEqual(test_plugin.registered_device_names, ["Porch Light", "Heater"])
 
     def test_refresh_devices_no_connector(self):
         """Test that refresh_devices returns 0 when no connector is configured."""
@@ -0,0 +1,55 @@
+# pylint: disable=missing-function-docstring,missing-class-docstring,missing-module-docstring
+import time
+import unittest
+from unittest.mock import Mock
+
+from skill_homeassistant.ha_client.logic.coalesce import AdjustmentCoalescer
+
+
+class TestAdjustmentCoalescer(unittest.TestCase):
+    def test_no_window_applies_immediately(self):
+        apply = Mock()
+        coalescer = AdjustmentCoalescer()
+        self.assertEqual(coalescer.adjust("light.a", 50, 10, apply), 60)
+        self.assertEqual(coalescer.adjust("light.a", 60, 10, apply), 70)
+        self.assertEqual(apply.call_count, 2)
+        apply.assert_called_with(70)
+
+    def test_window_merges_adjustments(self):
+        apply = Mock()
+        coalescer = AdjustmentCoalescer(window=0.05)
+        coalescer.adjust("light.a", 50, 10, apply)
+        coalescer.adjust("light.a", 50, 10, apply)
+        self.assertEqual(coalescer.adjust("light.a", 50, -5, apply), 65)
+        self.assertEqual(coalescer.pending_value("light.a"), 65)
+        apply.assert_not_called()
+        time.sleep(0.2)
+        apply.assert_called_once_with(65)
+        self.assertIsNone(coalescer.pending_value("light.a"))
+
+    def test_bounds(self):
+        apply = Mock()
+        coalescer = AdjustmentCoalescer(window=60)
+        self.assertEqual(coalescer.adjust("light.a", 95, 10, apply, lower=0, upper=100), 100)
+        self.assertEqual(coalescer.adjust("light.a", 95, -150, apply, lower=0, upper=100), 0)
+        coalescer.flush()
+        apply.assert_called_once_with(0)
+
+    def test_keys_are_independent(self):
+        first, second = Mock(), Mock()
+        coalescer = AdjustmentCoalescer(window=60)
+        coalescer.adjust(("light.a", "brightness"), 10, 10, first)
+        coalescer.adjust(("media_player.b", "volume_level"), 0.5, 0.1, second)
+        coalescer.flush()
+        first.assert_called_once_with(20)
+        second.assert_called_once_with(0.6)
+
+    def test_apply_errors_are_logged(self):
+        coalescer = AdjustmentCoalescer(window=60)
+        coalescer.adjust("light.a", 10, 10, Mock(side_effect=RuntimeError))
+        coalescer.flush()
+        self.assertIsNone(coalescer.pending_value("light.a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+# pylint: disable=missing-function-docstring,missing-class-docstring,missing-module-docstring
+import unittest
+from unittest.mock import patch
+
+from skill_homeassistant.ha_client.logic.codec import CODEC_PREFERENCE, get_codec
+
+PAYLOAD = [{"entity_id": "sensor.power", "state": "12.5", "attributes": {"friendly_name": "Pöwer ⚡"}}]
+
+
+class TestCodec(unittest.TestCase):
+    def test_every_available_codec_round_trips_bytes(self):
+        for name in CODEC_PREFERENCE:
+            codec = get_codec(name)
+            encoded = codec.dumps(PAYLOAD)
+            self.assertIsInstance(encoded, bytes, codec)
+            self.assertEqual(codec.loads(encoded), PAYLOAD, codec)
+
+    def test_stdlib_codec(self):
+        codec = get_codec("json")
+        self.assertEqual(codec.name, "json")
+        with self.assertRaises(codec.decode_errors):
+            codec.loads(b"<html>")
+
+    def test_auto_without_fast_libraries_uses_stdlib(self):
+        with patch.dict("sys.modules", {"orjson": None, "msgspec": None}):
+            self.assertEqual(get_codec().name, "json")
+            self.assertEqual(get_codec("auto").name, "json")
+
+    def test_missing_library_falls_back_to_stdlib(self):
+        with patch.dict("sys.modules", {"orjson": None}):
+            self.assertEqual(get_codec("orjson").name, "json")
+
+    def test_unknown_name_falls_back_to_stdlib(self):
+        self.assertEqual(get_codec("simplejson").name, "json")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+# pylint: disable=missing-function-docstring,missing-class-docstring,missing-module-docstring
+import os
+import random
+import tempfile
+import unittest
+
+from skill_homeassistant.ha_client.logic.colors import (
+    CSS3_PALETTE,
+    DEFAULT_COLOR_INDEX,
+    ColorIndex,
+    ColorResolver,
+    get_color_index,
+    normalize_color_name,
+    rgb_to_lab,
+)
+
+
+class TestRgbToLab(unittest.TestCase):
+    def test_reference_values(self):
+        for rgb, expected in (
+            ((0, 0, 0), (0, 0, 0)),
+            ((255, 255, 255), (100, 0, 0)),
+            ((255, 0, 0), (53.2, 80.1, 67.2)),
+        ):
+            for value, reference in zip(rgb_to_lab(rgb), expected):
+                self.assertAlmostEqual(value, reference, delta=0.2)
+
+
+class TestColorIndex(unittest.TestCase):
+    def test_exact_names(self):
+        self.assertEqual(DEFAULT_COLOR_INDEX.name((255, 0, 0)), "red")
+        self.assertEqual(DEFAULT_COLOR_INDEX.nearest((0, 128, 0)), ("green", 0.0))
+
+    def test_near_colour_is_named(self):
+        self.assertEqual(DEFAULT_COLOR_INDEX.name((250, 5, 3)), "red")
+        self.assertEqual(DEFAULT_COLOR_INDEX.name((254, 213, 161)), "navajowhite")
+
+    def test_cutoff(self):
+        self.assertIsNone(DEFAULT_COLOR_INDEX.name((123, 45, 67)))
+        self.assertEqual(get_color_index("css3", 50).name((123, 45, 67)), "indianred")
+
+    def test_extended_palette(self):
+        self.assertEqual(get_color_index("extended").name((254, 213, 161)), "soft white")
+        self.assertIs(get_color_index("unknown"), get_color_index("unknown"))
+        self.assertEqual(get_color_index("unknown").size, len(CSS3_PALETTE))
+
+    def test_matches_linear_scan(self):
+        palette = {name: rgb for name, rgb in list(CSS3_PALETTE.items())[::3]}
+        index = ColorIndex(palette)
+        labs = {name: rgb_to_lab(rgb) for name, rgb in palette.items()}
+        generator = random.Random(7)
+        for _ in range(500):
+            rgb = tuple(generator.randrange(256) for _ in range(3))
+            target = rgb_to_lab(rgb)
+            expected = min(labs, key=lambda name: sum((a - b) ** 2 for a, b in zip(labs[name], target)))
+            self.assertEqual(index.nearest(rgb)[0], expected)
+
+
+class TestColorResolver(unittest.TestCase):
+    def setUp(self):
+        self.resolver = ColorResolver()
+
+    def test_normalize(self):
+        self.assertEqual(normalize_color_name("The Light-Blue colour"), "lightblue")
+        self.assertEqual(normalize_color_name("Bleu Électrique"), "bleuelectrique")
+
+    def test_spelling_variants(self):
+        self.assertEqual(self.resolver.resolve("light blue"), ("lightblue", (173, 216, 230)))
+        self.assertEqual(self.resolver.resolve("grey")[1], self.resolver.resolve("gray")[1])
+        self.assertEqual(self.resolver.resolve("warm white")[0], "warm white")
+        self.assertEqual(self.resolver.resolve("#00ff00")[1], (0, 255, 0))
+
+    def test_fuzzy_fallback(self):
+        self.assertEqual(self.resolver.resolve("yelow")[0], "yellow")
+        self.assertIsNone(self.resolver.resolve("banana"))
+        self.assertIsNone(self.resolver.resolve(""))
+
+    def test_memoised(self):
+        self.resolver.resolve("light blue")
+        self.resolver.resolve("light blue")
+        self.assertEqual(self.resolver.resolve.cache_info().hits, 1)
+
+    def test_shipped_vocabularies(self):
+        self.assertEqual(self.resolver.resolve("rojo", "es-es")[0], "red")
+        self.assertEqual(self.resolver.resolve("blanc chaud", "fr-fr")[0], "warm white")
+        self.assertEqual(self.resolver.resolve("żółty", "pl-pl")[0], "yellow")
+        self.assertEqual(self.resolver.resolve("złoty", "pl-pl")[0], "gold")
+        self.assertEqual(self.resolver.resolve("azul", "es")[0], "blue")
+
+    def test_vocabulary_loaded_lazily(self):
+        with tempfile.TemporaryDirectory() as locale_dir:
+            os.makedirs(os.path.join(locale_dir, "de-de", "vocab"))
+            with open(os.path.join(locale_dir, "de-de", "vocab", "colors.value"), "w", encoding="utf-8") as value_file:
+                value_file.write("rot,red\nhimmelblau,#87ceeb\nkaputt,notacolor\n")
+            resolver = ColorResolver(locale_dir=locale_dir)
+            self.assertEqual(resolver._vocabularies, {})
+            self.assertEqual(resolver.resolve("rot", "de-de")[1], (255, 0, 0))
+            self.assertEqual(resolver.resolve("Himmelblau", "de-de")[1], (135, 206, 235))
+            self.assertEqual(set(resolver._vocabularies["de-de"]), {"rot", "himmelblau"})
+            self.assertEqual(resolver.vocabulary("it-it"), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+# pylint: disable=missing-function-docstring,missing-class-docstring,missing-module-docstring
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from skill_homeassistant.ha_client.logic.command_queue import CommandQueue
+
+
+class TestCommandQueue(unittest.TestCase):
+    def test_power_commands_supersede_each_other(self):
+        queue = CommandQueue()
+        queue.add("light.kitchen", "light", "turn_on")
+        queue.add("switch.fan", "switch", "turn_on")
+        queue.add("light.kitchen", "light", "turn_off")
+
+        pending = queue.pending()
+
+        self.assertEqual(
+            [(c.entity_id, c.service) for c in pending], [("switch.fan", "turn_on"), ("light.kitchen", "turn_off")]
+        )
+        self.assertEqual(queue.get_stats()["superseded"], 1)
+
+    def test_consecutive_turn_on_arguments_are_merged(self):
+        queue = CommandQueue()
+        queue.add("light.kitchen", "light", "turn_on", {"rgb_color": [255, 0, 0], "brightness": 10})
+        queue.add("light.kitchen", "light", "turn_on", {"brightness": 200})
+
+        (command,) = queue.pending()
+
+        self.assertEqual(command.arguments, {"rgb_color": [255, 0, 0], "brightness": 200})
+
+    def test_other_services_only_supersede_themselves(self):
+        queue = CommandQueue()
+        queue.add("media_player.tv", "media_player", "volume_set", {"volume_level": 0.2})
+        queue.add("media_player.tv", "media_player", "turn_on")
+        queue.add("media_player.tv", "media_player", "volume_set", {"volume_level": 0.5})
+
+        pending = queue.pending()
+
+        self.assertEqual([c.service for c in pending], ["turn_on", "volume_set"])
+        self.assertEqual(pending[1].arguments, {"volume_level": 0.5})
+
+    def test_expired_commands_are_dropped(self):
+        queue = CommandQueue(ttl=10)
+        with patch("skill_homeassistant.ha_client.logic.command_queue.time", return_value=1000):
+            queue.add("light.kitchen", "light", "turn_on")
+        with patch("skill_homeassistant.ha_client.logic.command_queue.time", return_value=1011):
+            self.assertEqual(queue.pending(), [])
+        self.assertEqual(queue.get_stats()["expired"], 1)
+
+    def test_bounded_drops_oldest(self):
+        queue = CommandQueue(max_size=2)
+        for entity_id in ("light.a", "light.b", "light.c"):
+            queue.add(entity_id, "light", "turn_on")
+
+        self.assertEqual([c.entity_id for c in queue.pending()], ["light.b", "light.c"])
+        self.assertEqual(queue.get_stats()["dropped"], 1)
+
+    def test_replay_stops_while_unreachable(self):
+        queue = CommandQueue()
+        queue.add("light.a", "light", "turn_on")
+        queue.add("light.b", "light", "turn_on")
+
+        self.assertEqual(queue.replay(lambda command: False), 0)
+        self.assertEqual(len(queue), 2)
+
+        sent = []
+        self.assertEqual(queue.replay(lambda command: sent.append(command.entity_id) or True), 2)
+        self.assertEqual(sent, ["light.a", "light.b"])
+        self.assertEqual(len(queue), 0)
+
+    def test_replay_skips_only_unreachable_instances(self):
+        queue = CommandQueue()
+        queue.add("light.a", "light", "turn_on", instance="garage")
+        queue.add("light.a", "light", "turn_on")
+        queue.add("light.b", "light", "turn_on", instance="garage")
+
+        sent = []
+
+        def send(command):
+            if command.instance == "garage":
+                return False
+            sent.append(command.entity_id)
+            return True
+
+        self.assertEqual(queue.replay(send), 1)
+        self.assertEqual(sent, ["light.a"])
+        self.assertEqual(
+            [(c.instance, c.entity_id) for c in queue.pending()], [("garage", "light.a"), ("garage", "light.b")]
+        )
+
+    def test_replay_drops_failing_commands(self):
+        queue = CommandQueue()
+        queue.add("light.a", "light", "turn_on")
+
+        def fail(command):
+            raise ValueError(command.entity_id)
+
+        self.assertEqual(queue.replay(fail), 0)
+        self.assertEqual(len(queue), 0)
+        self.assertEqual(queue.get_stats()["failed"], 1)
+
+    def test_persisted_between_instances(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "queue", "offline_queue.json")
+            queue = CommandQueue(path=path)
+            queue.add("light.kitchen", "light", "turn_on", {"brightness": 100})
+
+            restored = CommandQueue(path=path)
+
+            (command,) = restored.pending()
+            self.assertEqual((command.entity_id, command.arguments), ("light.kitchen", {"brightness": 100}))
+
+    def test_on_add_is_called(self):
+        queue = CommandQueue()
+        calls = []
+        queue.on_add = lambda: calls.append(1)
+        queue.add("light.kitchen", "light", "turn_on")
+        self.assertEqual(calls, [1])
+
+    def test_from_config(self):
+        self.assertIsNone(CommandQueue.from_config(False))
+        self.assertIsNotNone(CommandQueue.from_config(True).path)
+        queue = CommandQueue.from_config({"ttl": 60, "path": ""})
+        self.assertEqual((queue.ttl, queue.path), (60.0, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,20 @@
 # pylint: disable=missing-function-docstring,missing-class-docstring,missing-module-docstring
+import json
+import ssl
+import threading
 import unittest
 from unittest.mock import Mock, patch, MagicMock
 
 import requests
 
+from skill_homeassistant.ha_client.logic.codec import get_codec
+from skill_homeassistant.ha_client.logic.command_queue import CommandQueue
 from skill_homeassistant.ha_client.logic.connector import HomeAssistantRESTConnector
+from skill_homeassistant.ha_client.logic.device import HomeAssistantLight
+from skill_homeassistant.ha_client.logic.endpoints import EndpointPool
+from skill_homeassistant.ha_client.logic.executor import PriorityExecutor, request_priority
+from skill_homeassistant.ha_client.logic.ratelimit import RateLimiter
+from skill_homeassistant.ha_client.logic.timeouts import AdaptiveTimeouts
 
 
 class TestHomeAssistantRESTConnector(unittest.TestCase):
@@ -32,14 +42,85 @@ class TestHomeAssistantRESTConnector(unittest.TestCase):
         """Test registering a callback for device events."""
         callback = Mock()
         self.connector.register_callback("light.living_room", callback)
-        self.assertEqual(self.connector.event_listeners["light.living_room"], callback)
+        self.assertEqual(self.connector.event_listeners.listeners("light.living_room"), [callback])
+
+        self.connector.unregister_callback("light.living_room", callback)
+        self.assertNotIn("light.living_room", self.connector.event_listeners)
+        self.assertEqual(self.connector.get_listener_stats()["unregistered"], 1)
+
+    def test_dispatch_event_updates_device(self):
+        """Test a state change event reaches the device of its entity."""
+        light = HomeAssistantLight(self.connector, "light.kitchen", "mdi:lightbulb", "Kitchen", "off", {})
+        event = {
+            "type": "event",
+            "event": {
+                "event_type": "state_changed",
+                "data": {
+                    "entity_id": "light.kitchen",
+                    "new_state": {"entity_id": "light.kitchen", "state": "on", "attributes": {"brightness": 255}},
+                },
+            },
+        }
+
+        self.assertEqual(self.connector.dispatch_event(json.dumps(event)), 1)
+
+        self.assertEqual(light.device_state, "on")
+        self.assertEqual(light.get_brightness(), 255)
+        self.assertEqual(self.connector.get_event_stats()["delivered"], 1)
+
+    def test_compression_bulk_only_on_bulk_endpoints(self):
+        """Test the default mode negotiates compression only for bulk endpoints."""
+        self.assertEqual(self.connector._headers_for("states")["Accept-Encoding"], "gzip, deflate")
+        self.assertEqual(self.connector._headers_for("template")["Accept-Encoding"], "gzip, deflate")
+        self.assertEqual(self.connector._headers_for("service")["Accept-Encoding"], "identity")
+        self.assertEqual(self.connector._headers_for("state")["Accept-Encoding"], "identity")
+
+    def test_compression_all_and_off(self):
+        """Test the low-bandwidth and disabled compression modes."""
+        connector = HomeAssistantRESTConnector(host="http://ha.local", api_key="key", compression="all")
+        self.assertEqual(connector._headers_for("service")["Accept-Encoding"], "gzip, deflate")
+        connector = HomeAssistantRESTConnector(host="http://ha.local", api_key="key", compression="off")
+        self.assertEqual(connector._headers_for("states")["Accept-Encoding"], "identity")
+
+    def test_unknown_compression_mode_uses_bulk(self):
+        connector = HomeAssistantRESTConnector(host="http://ha.local", api_key="key", compression="brotli")
+        self.assertEqual(connector.compression, "bulk")
+
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.get")
+    def test_transfer_stats_record_wire_and_decoded_bytes(self, mock_get):
+        """Test compressed and decoded byte counts are recorded per endpoint class."""
+        body = json.dumps([{"entity_id": "light.test", "state": "on"}]).encode()
+        mock_get.return_value.content = body
+        mock_get.return_value.raw.tell.return_value = 20
+
+        self.connector.get_all_devices()
+        self.connector.get_all_devices()
+        self.connector.get_device_state("light.test")
+
+        stats = self.connector.get_transfer_stats()
+        self.assertEqual(stats["states"], {"requests": 2, "wire_bytes": 40, "decoded_bytes": 2 * len(body)})
+        self.assertEqual(stats["state"]["requests"], 1)
+
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.get")
+    def test_transfer_stats_for_streamed_states(self, mock_get):
+        """Test the streamed state list is accounted once it has been read."""
+        chunks = [b'[{"entity_id": "light.test", ', b'"state": "on"}]']
+        mock_get.return_value.iter_content.return_value = chunks
+        mock_get.return_value.raw.tell.return_value = 12
+
+        list(self.connector.iter_all_devices())
+
+        self.assertEqual(
+            self.connector.get_transfer_stats()["states"],
+            {"requests": 1, "wire_bytes": 12, "decoded_bytes": sum(len(chunk) for chunk in chunks)},
+        )
 
     # --- get_all_devices tests ---
-    @patch("skill_homeassistant.ha_client.logic.connector.requests.get")
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.get")
     def test_get_all_devices_success(self, mock_get):
         """Test successful retrieval of all devices."""
         mock_response = Mock()
-        mock_response.json.return_value = [{"entity_id": "light.test", "state": "on"}]
+        mock_response.content = json.dumps([{"entity_id": "light.test", "state": "on"}]).encode()
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
 
@@ -48,12 +129,12 @@ class TestHomeAssistantRESTConnector(unittest.TestCase):
         self.assertEqual(result, [{"entity_id": "light.test", "state": "on"}])
         mock_get.assert_called_once_with(
             "http://homeassistant.local/api/states",
-            headers=self.connector.headers,
+            headers={**self.connector.headers, "Accept-Encoding": "gzip, deflate"},
             timeout=3,
             verify=True,
         )
 
-    @patch("skill_homeassistant.ha_client.logic.connector.requests.get")
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.get")
     def test_get_all_devices_connection_error(self, mock_get):
         """Test get_all_devices handles ConnectionError."""
         mock_get.side_effect = requests.exceptions.ConnectionError("Connection refused")
@@ -62,7 +143,7 @@ class TestHomeAssistantRESTConnector(unittest.TestCase):
 
         self.assertEqual(result, [])
 
-    @patch("skill_homeassistant.ha_client.logic.connector.requests.get")
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.get")
     def test_get_all_devices_request_exception(self, mock_get):
         """Test get_all_devices handles RequestException."""
         mock_get.side_effect = requests.exceptions.RequestException("Request failed")
@@ -71,12 +152,204 @@ class TestHomeAssistantRESTConnector(unittest.TestCase):
 
         self.assertEqual(result, [])
 
+    # --- get_all_devices_projected tests ---
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.post")
+    def test_get_all_devices_projected_success(self, mock_post):
+        """Test projected rows are expanded back into state objects."""
+        mock_response = Mock()
+        mock_response.content = json.dumps(
+            [["light.test", "on", [["friendly_name", "Test"], ["brightness", 128]]]]
+        ).encode()
+        mock_response.raise_for_status = Mock()
+        mock_post.return_value = mock_response
+
+        result = self.connector.get_all_devices_projected(["light"], ["friendly_name", "brightness"])
+
+        self.assertEqual(
+            result,
+            [{"entity_id": "light.test", "state": "on", "attributes": {"friendly_name": "Test", "brightness": 128}}],
+        )
+        call_args = mock_post.call_args
+        self.assertEqual(call_args[0][0], "http://homeassistant.local/api/template")
+        template = json.loads(call_args[1]["data"])["template"]
+        self.assertIn('["light"]', template)
+        self.assertIn('["brightness", "friendly_name"]', template)
+
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.post")
+    def test_get_all_devices_projected_request_exception(self, mock_post):
+        """Test get_all_devices_projected returns None so callers can fall back."""
+        mock_post.side_effect = requests.exceptions.RequestException("Request failed")
+
+        self.assertIsNone(self.connector.get_all_devices_projected(["light"], ["friendly_name"]))
+
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.post")
+    def test_get_all_devices_projected_invalid_json(self, mock_post):
+        """Test get_all_devices_projected returns None when the render is not JSON."""
+        mock_response = Mock()
+        mock_response.content = b"<html>Not JSON</html>"
+        mock_post.return_value = mock_response
+
+        self.assertIsNone(self.connector.get_all_devices_projected(["light"], ["friendly_name"]))
+
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.get")
+    def test_get_device_state_concurrent_reads_share_request(self, mock_get):
+        """Test concurrent reads of one entity send a single request."""
+        release = threading.Event()
+
+        def slow_get(*args, **kwargs):
+            release.wait(5)
+            return Mock(content=b'{"entity_id": "sensor.a", "state": "20"}')
+
+        mock_get.side_effect = slow_get
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.connector.get_device_state("sensor.a")))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        while sum(self.connector.get_single_flight_stats().values()) < 4:
+            threading.Event().wait(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        mock_get.assert_called_once()
+        self.assertEqual([result["state"] for result in results], ["20"] * 4)
+        self.assertEqual(self.connector.get_single_flight_stats(), {"executed": 1, "shared": 3})
+
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.post")
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.get")
+    def test_get_device_state_after_write_does_not_join_earlier_read(self, mock_get, mock_post):
+        """Test a read issued after a write is sent, not served by a read in flight before the write."""
+        release = threading.Event()
+        responses = iter([b'{"entity_id": "light.a", "state": "off"}', b'{"entity_id": "light.a", "state": "on"}'])
+
+        def get(*args, **kwargs):
+            content = next(responses)
+            if b"off" in content:
+                release.wait(5)
+            return Mock(content=content)
+
+        mock_get.side_effect = get
+        mock_post.return_value.content = b"[]"
+        earlier = []
+        thread = threading.Thread(target=lambda: earlier.append(self.connector.get_device_state("light.a")))
+        thread.start()
+        while not self.connector.get_single_flight_stats()["executed"]:
+            threading.Event().wait(0.001)
+        self.connector.turn_on("light.a", "light")
+        later = self.connector.get_device_state("light.a")
+        release.set()
+        thread.join()
+
+        self.assertEqual(later["state"], "on")
+        self.assertEqual(earlier[0]["state"], "off")
+        self.assertEqual(mock_get.call_count, 2)
+
+    # --- get_device_states tests ---
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.post")
+    def test_get_device_states_renders_template(self, mock_post):
+        """Test several entity states are fetched in one template render."""
+        mock_post.return_value.content = json.dumps(
+            [["light.a", "on", [["brightness", 10]]], ["sensor.b", "20", []]]
+        ).encode()
+
+        result = self.connector.get_device_states(["sensor.b", "light.a", "light.a"])
+
+        self.assertEqual(
+            result,
+            {
+                "light.a": {"entity_id": "light.a", "state": "on", "attributes": {"brightness": 10}},
+                "sensor.b": {"entity_id": "sensor.b", "state": "20", "attributes": {}},
+            },
+        )
+        mock_post.assert_called_once()
+        self.assertIn('["light.a", "sensor.b"]', json.loads(mock_post.call_args[1]["data"])["template"])
+
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.get")
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.post")
+    def test_get_device_states_falls_back_to_snapshot(self, mock_post, mock_get):
+        """Test a failed render falls back to one filtered /api/states fetch."""
+        mock_post.return_value.content = b"not JSON"
+        mock_get.return_value.content = json.dumps(
+            [{"entity_id": "light.a", "state": "on"}, {"entity_id": "light.other", "state": "off"}]
+        ).encode()
+
+        result = self.connector.get_device_states(["light.a", "light.missing"])
+
+        self.assertEqual(result, {"light.a": {"entity_id": "light.a", "state": "on"}})
+        mock_get.assert_called_once()
+
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.post")
+    def test_get_device_states_empty(self, mock_post):
+        self.assertEqual(self.connector.get_device_states([]), {})
+        mock_post.assert_not_called()
+
+    # --- iter_all_devices tests ---
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.get")
+    def test_iter_all_devices_streams_response(self, mock_get):
+        """Test iter_all_devices parses the streamed body and skips other domains."""
+        body = b'[{"entity_id": "light.test", "state": "on"}, {"entity_id": "update.core", "state": "off"}]'
+        mock_response = MagicMock()
+        mock_response.iter_content.return_value = [body[:20], body[20:]]
+        mock_get.return_value = mock_response
+
+        result = list(self.connector.iter_all_devices(domains={"light"}))
+
+        self.assertEqual(result, [{"entity_id": "light.test", "state": "on"}])
+        mock_get.assert_called_once_with(
+            "http://homeassistant.local/api/states",
+            headers={**self.connector.headers, "Accept-Encoding": "gzip, deflate"},
+            timeout=3,
+            verify=True,
+            stream=True,
+        )
+
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.get")
+    def test_iter_all_devices_connection_error(self, mock_get):
+        """Test iter_all_devices yields nothing on ConnectionError."""
+        mock_get.side_effect = requests.exceptions.ConnectionError("Connection refused")
+
+        self.assertEqual(list(self.connector.iter_all_devices()), [])
+
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.get")
+    def test_iter_all_devices_malformed_body(self, mock_get):
+        """Test iter_all_devices stops cleanly on a malformed body."""
+        mock_response = MagicMock()
+        mock_response.iter_content.return_value = [b'{"message": "nope"}']
+        mock_get.return_value = mock_response
+
+        self.assertEqual(list(self.connector.iter_all_devices()), [])
+
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.get")
+    def test_get_all_devices_invalid_json(self, mock_get):
+        """Test get_all_devices handles a body that is not JSON."""
+        mock_response = Mock()
+        mock_response.content = b"<html>502 Bad Gateway</html>"
+        mock_response.raise_for_status = Mock()
+        mock_get.return_value = mock_response
+
+        result = self.connector.get_all_devices()
+
+        self.assertEqual(result, [])
+
+    def test_payloads_are_encoded_with_connector_codec(self):
+        """Test the connector sends bytes produced by its codec."""
+        codec = get_codec("json")
+        connector = HomeAssistantRESTConnector(host="http://homeassistant.local", api_key="key", codec=codec)
+        self.assertIs(connector.codec, codec)
+        with patch("skill_homeassistant.ha_client.logic.connector.requests.Session.post") as mock_post:
+            mock_post.return_value.content = b"[]"
+            connector.turn_on("light.test", "light")
+        self.assertEqual(mock_post.call_args[1]["data"], b'{"entity_id": "light.test"}')
+
     # --- get_device_state tests ---
-    @patch("skill_homeassistant.ha_client.logic.connector.requests.get")
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.get")
     def test_get_device_state_success(self, mock_get):
         """Test successful retrieval of device state."""
         mock_response = Mock()
-        mock_response.json.return_value = {"entity_id": "light.test", "state": "on"}
+        mock_response.content = json.dumps({"entity_id": "light.test", "state": "on"}).encode()
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
 
@@ -85,12 +358,12 @@ class TestHomeAssistantRESTConnector(unittest.TestCase):
         self.assertEqual(result, {"entity_id": "light.test", "state": "on"})
         mock_get.assert_called_once_with(
             "http://homeassistant.local/api/states/light.test",
-            headers=self.connector.headers,
+            headers={**self.connector.headers, "Accept-Encoding": "identity"},
             timeout=3,
             verify=True,
         )
 
-    @patch("skill_homeassistant.ha_client.logic.connector.requests.get")
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.get")
     def test_get_device_state_connection_error(self, mock_get):
         """Test get_device_state handles ConnectionError."""
         mock_get.side_effect = requests.exceptions.ConnectionError("Connection refused")
@@ -99,7 +372,7 @@ class TestHomeAssistantRESTConnector(unittest.TestCase):
 
         self.assertEqual(result, [])
 
-    @patch("skill_homeassistant.ha_client.logic.connector.requests.get")
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.get")
     def test_get_device_state_request_exception(self, mock_get):
         """Test get_device_state handles RequestException."""
         mock_get.side_effect = requests.exceptions.RequestException("Request failed")
@@ -109,11 +382,11 @@ class TestHomeAssistantRESTConnector(unittest.TestCase):
         self.assertEqual(result, {})
 
     # --- set_device_state tests ---
-    @patch("skill_homeassistant.ha_client.logic.connector.requests.post")
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.post")
     def test_set_device_state_success(self, mock_post):
         """Test successful setting of device state."""
         mock_response = Mock()
-        mock_response.json.return_value = {"entity_id": "light.test", "state": "on"}
+        mock_response.content = json.dumps({"entity_id": "light.test", "state": "on"}).encode()
         mock_response.raise_for_status = Mock()
         mock_post.return_value = mock_response
 
@@ -121,11 +394,11 @@ class TestHomeAssistantRESTConnector(unittest.TestCase):
 
         self.assertEqual(result, {"entity_id": "light.test", "state": "on"})
 
-    @patch("skill_homeassistant.ha_client.logic.connector.requests.post")
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.post")
     def test_set_device_state_without_attributes(self, mock_post):
         """Test setting device state without attributes."""
         mock_response = Mock()
-        mock_response.json.return_value = {"entity_id": "light.test", "state": "off"}
+        mock_response.content = json.dumps({"entity_id": "light.test", "state": "off"}).encode()
         mock_response.raise_for_status = Mock()
         mock_post.return_value = mock_response
 
@@ -133,7 +406,7 @@ class TestHomeAssistantRESTConnector(unittest.TestCase):
 
         self.assertEqual(result, {"entity_id": "light.test", "state": "off"})
 
-    @patch("skill_homeassistant.ha_client.logic.connector.requests.post")
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.post")
     def test_set_device_state_request_exception(self, mock_post):
         """Test set_device_state handles RequestException."""
         mock_response = Mock()
@@ -203,11 +476,11 @@ class TestHomeAssistantRESTConnector(unittest.TestCase):
         self.assertEqual(result[0]["entity_id"], "light.bedroom")
 
     # --- turn_on tests ---
-    @patch("skill_homeassistant.ha_client.logic.connector.requests.post")
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.post")
     def test_turn_on_success(self, mock_post):
         """Test successful turn_on call."""
         mock_response = Mock()
-        mock_response.json.return_value = [{"entity_id": "light.test", "state": "on"}]
+        mock_response.content = json.dumps([{"entity_id": "light.test", "state": "on"}]).encode()
         mock_response.raise_for_status = Mock()
         mock_post.return_value = mock_response
 
@@ -218,7 +491,7 @@ class TestHomeAssistantRESTConnector(unittest.TestCase):
         call_args = mock_post.call_args
         self.assertIn("/api/services/light/turn_on", call_args[0][0])
 
-    @patch("skill_homeassistant.ha_client.logic.connector.requests.post")
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.post")
     def test_turn_on_request_exception(self, mock_post):
         """Test turn_on handles RequestException."""
         mock_response = Mock()
@@ -230,11 +503,11 @@ class TestHomeAssistantRESTConnector(unittest.TestCase):
         self.assertIsNone(result)
 
     # --- turn_off tests ---
-    @patch("skill_homeassistant.ha_client.logic.connector.requests.post")
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.post")
     def test_turn_off_success(self, mock_post):
         """Test successful turn_off call."""
         mock_response = Mock()
-        mock_response.json.return_value = [{"entity_id": "light.test", "state": "off"}]
+        mock_response.content = json.dumps([{"entity_id": "light.test", "state": "off"}]).encode()
         mock_response.raise_for_status = Mock()
         mock_post.return_value = mock_response
 
@@ -245,7 +518,7 @@ class TestHomeAssistantRESTConnector(unittest.TestCase):
         call_args = mock_post.call_args
         self.assertIn("/api/services/light/turn_off", call_args[0][0])
 
-    @patch("skill_homeassistant.ha_client.logic.connector.requests.post")
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.post")
     def test_turn_off_request_exception(self, mock_post):
         """Test turn_off handles RequestException."""
         mock_response = Mock()
@@ -257,11 +530,11 @@ class TestHomeAssistantRESTConnector(unittest.TestCase):
         self.assertIsNone(result)
 
     # --- call_function tests ---
-    @patch("skill_homeassistant.ha_client.logic.connector.requests.post")
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.post")
     def test_call_function_without_arguments(self, mock_post):
         """Test call_function without additional arguments."""
         mock_response = Mock()
-        mock_response.json.return_value = {"result": "ok"}
+        mock_response.content = json.dumps({"result": "ok"}).encode()
         mock_response.raise_for_status = Mock()
         mock_post.return_value = mock_response
 
@@ -269,11 +542,11 @@ class TestHomeAssistantRESTConnector(unittest.TestCase):
 
         self.assertEqual(result, {"result": "ok"})
 
-    @patch("skill_homeassistant.ha_client.logic.connector.requests.post")
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.post")
     def test_call_function_with_arguments(self, mock_post):
         """Test call_function with additional arguments."""
         mock_response = Mock()
-        mock_response.json.return_value = {"result": "ok"}
+        mock_response.content = json.dumps({"result": "ok"}).encode()
         mock_response.raise_for_status = Mock()
         mock_post.return_value = mock_response
 
@@ -284,12 +557,11 @@ class TestHomeAssistantRESTConnector(unittest.TestCase):
         self.assertEqual(result, {"result": "ok"})
         # Verify the payload includes the arguments
         call_args = mock_post.call_args
-        import json
         payload = json.loads(call_args[1]["data"])
         self.assertEqual(payload["brightness"], 128)
         self.assertEqual(payload["color_name"], "red")
 
-    @patch("skill_homeassistant.ha_client.logic.connector.requests.post")
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.post")
     def test_call_function_request_exception(self, mock_post):
         """Test call_function handles RequestException."""
         mock_response = Mock()
@@ -301,13 +573,13 @@ class TestHomeAssistantRESTConnector(unittest.TestCase):
         self.assertIsNone(result)
 
     # --- send_assist_command tests ---
-    @patch("skill_homeassistant.ha_client.logic.connector.requests.post")
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.post")
     def test_send_assist_command_success(self, mock_post):
         """Test successful send_assist_command call."""
         mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_response.content = json.dumps({
             "response": {"speech": {"plain": {"speech": "Turned on the kitchen light"}}}
-        }
+        }).encode()
         mock_response.raise_for_status = Mock()
         mock_post.return_value = mock_response
 
@@ -318,38 +590,36 @@ class TestHomeAssistantRESTConnector(unittest.TestCase):
         call_args = mock_post.call_args
         self.assertIn("/api/conversation/process", call_args[0][0])
 
-    @patch("skill_homeassistant.ha_client.logic.connector.requests.post")
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.post")
     def test_send_assist_command_with_language(self, mock_post):
         """Test send_assist_command with custom language."""
         mock_response = Mock()
-        mock_response.json.return_value = {"response": {"speech": {}}}
+        mock_response.content = json.dumps({"response": {"speech": {}}}).encode()
         mock_response.raise_for_status = Mock()
         mock_post.return_value = mock_response
 
         result = self.connector.send_assist_command("enciende la luz", {"language": "es"})
 
         self.assertIsNotNone(result)
-        import json
         call_args = mock_post.call_args
         payload = json.loads(call_args[1]["data"])
         self.assertEqual(payload["language"], "es")
 
-    @patch("skill_homeassistant.ha_client.logic.connector.requests.post")
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.post")
     def test_send_assist_command_default_language(self, mock_post):
         """Test send_assist_command uses default language when not specified."""
         mock_response = Mock()
-        mock_response.json.return_value = {"response": {"speech": {}}}
+        mock_response.content = json.dumps({"response": {"speech": {}}}).encode()
         mock_response.raise_for_status = Mock()
         mock_post.return_value = mock_response
 
         result = self.connector.send_assist_command("turn on light")
 
-        import json
         call_args = mock_post.call_args
         payload = json.loads(call_args[1]["data"])
         self.assertEqual(payload["language"], "en")
 
-    @patch("skill_homeassistant.ha_client.logic.connector.requests.post")
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.post")
     def test_send_assist_command_request_exception(self, mock_post):
         """Test send_assist_command handles RequestException."""
         mock_response = Mock()
@@ -360,6 +630,246 @@ class TestHomeAssistantRESTConnector(unittest.TestCase):
 
         self.assertIsNone(result)
 
+    @patch("skill_homeassistant.ha_client.logic.connector.create_connection")
+    def test_get_exposed_entities(self, mock_ws):
+        """Test the exposed entity list is fetched over the WebSocket API and cached."""
+        mock_ws.return_value.recv.side_effect = [
+            '{"type": "auth_required"}',
+            '{"type": "auth_ok"}',
+            '{"type": "event", "id": 0}',
+            '{"id": 1, "type": "result", "success": true, "result": {"exposed_entities": '
+            '{"light.a": {"conversation": true}, "light.b": {"conversation": false}, "light.c": {}}}}',
+        ]
+        self.assertEqual(self.connector.get_exposed_entities(), {"light.a"})
+        self.assertEqual(self.connector.get_exposed_entities(), {"light.a"})
+
+        mock_ws.assert_called_once_with("ws://homeassistant.local/api/websocket", timeout=3, sslopt=None)
+        sent = [json.loads(call.args[0]) for call in mock_ws.return_value.send.call_args_list]
+        self.assertEqual(sent[0], {"type": "auth", "access_token": "test_api_key"})
+        self.assertEqual(sent[1], {"id": 1, "type": "homeassistant/expose_entity/list"})
+        mock_ws.return_value.close.assert_called_once()
+
+    @patch("skill_homeassistant.ha_client.logic.connector.create_connection")
+    def test_get_exposed_entities_auth_failure(self, mock_ws):
+        """Test a rejected token returns None."""
+        mock_ws.return_value.recv.side_effect = [
+            '{"type": "auth_required"}',
+            '{"type": "auth_invalid", "message": "Invalid access token"}',
+        ]
+        self.assertIsNone(self.connector.get_exposed_entities())
+        mock_ws.return_value.close.assert_called_once()
+
+    @patch("skill_homeassistant.ha_client.logic.connector.create_connection")
+    def test_get_exposed_entities_keeps_cache_on_failure(self, mock_ws):
+        """Test a failed refresh keeps the last known list."""
+        self.connector._exposed_entities = frozenset({"light.a"})
+        mock_ws.side_effect = ConnectionRefusedError
+        self.assertEqual(self.connector.get_exposed_entities(refresh=True), {"light.a"})
+
+    @patch("skill_homeassistant.ha_client.logic.connector.create_connection")
+    def test_get_exposed_entities_wss(self, mock_ws):
+        """Test https hosts use wss and honour verify_ssl."""
+        connector = HomeAssistantRESTConnector("https://ha.example", "key", verify_ssl=False)
+        mock_ws.side_effect = ConnectionRefusedError
+        connector.get_exposed_entities()
+        self.assertEqual(mock_ws.call_args.args[0], "wss://ha.example/api/websocket")
+        self.assertEqual(mock_ws.call_args.kwargs["sslopt"]["cert_reqs"], ssl.CERT_NONE)
+
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.post")
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.get")
+    def test_adaptive_timeouts_per_endpoint(self, mock_get, mock_post):
+        """Test that adaptive timeouts send (connect, read) pairs and learn per endpoint class."""
+        self.connector.adaptive_timeouts = AdaptiveTimeouts(connect=1, floor=2, min_samples=1)
+        mock_get.return_value.content = b"[]"
+        mock_post.return_value.content = b"[]"
+
+        self.connector.get_all_devices()
+        self.connector.turn_on("switch.test", "switch")
+
+        self.assertEqual(mock_get.call_args.kwargs["timeout"], (1, 3))
+        self.assertEqual(mock_post.call_args.kwargs["timeout"], (1, 5))
+        self.connector.get_all_devices()
+        self.assertEqual(mock_get.call_args.kwargs["timeout"], (1, 2))
+        self.assertEqual(set(self.connector.get_timeout_stats()), {"states", "service"})
+
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.get")
+    def test_adaptive_timeouts_record_read_timeouts(self, mock_get):
+        """Test that a request timing out raises the read timeout learned for its endpoint class."""
+        self.connector.adaptive_timeouts = AdaptiveTimeouts(connect=1, floor=0.1, headroom=2, min_samples=1)
+        self.connector.adaptive_timeouts.record("state", 0.1)
+        mock_get.side_effect = requests.exceptions.ReadTimeout("timed out")
+
+        self.assertEqual(self.connector.get_device_state("sensor.test"), {})
+
+        self.assertEqual(mock_get.call_args.kwargs["timeout"], (1, 0.2))
+        self.assertEqual(self.connector.get_timeout_stats()["state"], {"samples": 2, "read_timeout": 0.4})
+
+    def test_timeout_stats_empty_without_adaptive_timeouts(self):
+        self.assertEqual(self.connector.get_timeout_stats(), {})
+
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.post")
+    def test_turn_on_connection_error_raises_without_queue(self, mock_post):
+        mock_post.side_effect = requests.exceptions.ConnectionError("Connection refused")
+
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.connector.turn_on("light.test", "light")
+
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.get")
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.post")
+    def test_setter_queues_offline_without_raising(self, mock_post, mock_get):
+        """Test a setter that refreshes after its call keeps the cached state when the call is queued."""
+        self.connector.command_queue = CommandQueue()
+        mock_post.side_effect = requests.exceptions.ConnectionError("Connection refused")
+        mock_get.side_effect = requests.exceptions.ConnectionError("Connection refused")
+        light = HomeAssistantLight(self.connector, "light.test", "mdi:lightbulb", "Test", "on", {"brightness": 10})
+
+        light.set_brightness(200)
+        light.set_rgb_color([255, 0, 0])
+
+        self.assertEqual(len(self.connector.command_queue), 2)
+        self.assertEqual((light.device_state, light.get_brightness()), ("on", 10))
+
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.post")
+    def test_connection_error_queues_command(self, mock_post):
+        """Test service calls are queued when Home Assistant is unreachable, then replayed."""
+        self.connector.command_queue = CommandQueue()
+        mock_post.side_effect = requests.exceptions.ConnectionError("Connection refused")
+
+        self.assertIsNone(self.connector.call_function("light.test", "light", "turn_on", {"brightness": 50}))
+        (command,) = self.connector.command_queue.pending()
+        self.assertFalse(self.connector.replay_command(command))
+
+        mock_post.side_effect = None
+        mock_post.return_value.content = b"[]"
+        self.assertTrue(self.connector.replay_command(command))
+        self.assertEqual(mock_post.call_args[0][0], "http://homeassistant.local/api/services/light/turn_on")
+        self.assertEqual(json.loads(mock_post.call_args.kwargs["data"]), {"entity_id": "light.test", "brightness": 50})
+
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.get")
+    def test_ping(self, mock_get):
+        self.assertTrue(self.connector.ping())
+        self.assertEqual(mock_get.call_args[0][0], "http://homeassistant.local/api/")
+        mock_get.side_effect = requests.exceptions.ConnectionError("Connection refused")
+        self.assertFalse(self.connector.ping())
+
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.get")
+    def test_requests_sent_through_executor(self, mock_get):
+        """Test requests go through the executor with the priority of the calling context."""
+        self.connector.executor = Mock(wraps=PriorityExecutor())
+        mock_get.return_value.content = b"[]"
+
+        with request_priority("refresh"):
+            self.assertEqual(self.connector.get_all_devices(), [])
+
+        self.assertEqual(self.connector.executor.submit.call_args[0][0], "refresh")
+        self.assertEqual(mock_get.call_args[0][0], "http://homeassistant.local/api/states")
+        self.assertEqual(self.connector.get_executor_stats()["completed"], 1)
+        self.connector.executor.shutdown()
+
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.get")
+    def test_executor_shutdown_fails_queued_requests_as_request_exceptions(self, mock_get):
+        """Test requests cancelled or refused by a shut down executor raise RequestException."""
+        self.connector.executor = PriorityExecutor(max_workers=1)
+        started, release = threading.Event(), threading.Event()
+
+        def slow_get(*args, **kwargs):
+            started.set()
+            release.wait(5)
+            return Mock(content=b"[]")
+
+        mock_get.side_effect = slow_get
+        errors = []
+
+        def request():
+            try:
+                self.connector._request("GET", "state", "/api/states/light.test")
+            except requests.exceptions.RequestException as error:
+                errors.append(error)
+
+        running = threading.Thread(target=request)
+        running.start()
+        started.wait(5)
+        queued = threading.Thread(target=request)
+        queued.start()
+        while not self.connector.get_executor_stats()["depth"]["interactive"]:
+            threading.Event().wait(0.001)
+
+        self.connector.executor.shutdown()
+        queued.join(5)
+        release.set()
+        running.join(5)
+
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(mock_get.call_count, 1)
+        with self.assertRaises(requests.exceptions.RequestException):
+            self.connector._request("GET", "state", "/api/states/light.test")
+        self.assertEqual(self.connector.get_device_state("light.test"), {})
+
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.post")
+    def test_rate_limited_service_call_is_dropped(self, mock_post):
+        self.connector.rate_limiter = RateLimiter(rate=1, burst=1, mode="reject")
+        mock_post.return_value.content = b"[]"
+
+        self.assertEqual(self.connector.turn_on("light.test", "light"), [])
+        self.assertIsNone(self.connector.turn_on("light.test", "light"))
+
+        mock_post.assert_called_once()
+        self.assertEqual(self.connector.get_rate_limit_stats()["rejected"], 1)
+
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.get")
+    def test_fails_over_to_the_next_base_url(self, mock_get):
+        """Test a request moves on to the next base URL when the current one is unreachable."""
+        endpoints = EndpointPool(["http://homeassistant.local", "https://remote.example"], probe_interval=0)
+        connector = HomeAssistantRESTConnector("http://homeassistant.local", "test_api_key", endpoints=endpoints)
+        response = Mock(content=b'{"entity_id": "light.test", "state": "on"}')
+        mock_get.side_effect = [requests.exceptions.ConnectionError("No route to host"), response]
+
+        self.assertEqual(connector.get_device_state("light.test")["state"], "on")
+
+        self.assertEqual(mock_get.call_args[0][0], "https://remote.example/api/states/light.test")
+        self.assertEqual(connector.host, "https://remote.example")
+        self.assertEqual(connector.get_endpoint_stats()["failovers"], 1)
+        self.assertEqual(endpoints.candidates(), ["https://remote.example", "http://homeassistant.local"])
+
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.get")
+    def test_validate(self, mock_get):
+        """Test validation only requests /api/ and /api/config and reports the version."""
+        mock_get.side_effect = [Mock(status_code=200), Mock(status_code=200, content=b'{"version": "2024.6.0"}')]
+
+        result = self.connector.validate(timeout=2)
+
+        self.assertTrue(result)
+        self.assertEqual(result.version, "2024.6.0")
+        self.assertIsNotNone(result.latency)
+        self.assertEqual(
+            [call[0][0] for call in mock_get.call_args_list],
+            ["http://homeassistant.local/api/", "http://homeassistant.local/api/config"],
+        )
+        self.assertEqual(mock_get.call_args[1]["timeout"], 2)
+
+    @patch("skill_homeassistant.ha_client.logic.connector.requests.Session.get")
+    def test_validate_failures(self, mock_get):
+        """Test validation tells a rejected token apart from an unreachable instance."""
+        mock_get.side_effect = None
+        mock_get.return_value = Mock(status_code=401)
+        result = self.connector.validate()
+        self.assertFalse(result)
+        self.assertTrue(result.reachable)
+        self.assertFalse(result.auth_ok)
+        mock_get.assert_called_once()
+
+        mock_get.side_effect = requests.exceptions.ConnectTimeout("Timed out")
+        result = self.connector.validate()
+        self.assertFalse(result)
+        self.assertFalse(result.reachable)
+        self.assertIn("Timed out", result.error)
+
+        mock_get.side_effect = [Mock(status_code=200), requests.exceptions.ReadTimeout("Timed out")]
+        result = self.connector.validate()
+        self.assertFalse(result)
+        self.assertTrue(result.reachable and result.auth_ok)
+        self.assertIn("Timed out", result.error)
+
 
 if __name__ == "__main__":
     unittest.main()
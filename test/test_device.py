@@ -1,7 +1,10 @@
 # pylint: disable=missing-function-docstring,missing-class-docstring,missing-module-docstring
+import inspect
 import unittest
 from unittest.mock import Mock, patch
 
+from skill_homeassistant.ha_client.constants import PROJECTED_ATTRIBUTES, SUPPORTED_DEVICES
+from skill_homeassistant.ha_client.logic.colors import get_color_index
 from skill_homeassistant.ha_client.logic.device import (
     HomeAssistantDevice,
     HomeAssistantLight,
@@ -22,11 +25,17 @@ class FakeConnector:
     def __init__(self):
         self.callbacks = {}
         self.host = "http://fake.homeassistant.local"
+        self.state_max_age = 0
+        self.poll_max_age = {}
         self._device_states = {}
 
     def register_callback(self, device_id, callback):
         self.callbacks[device_id] = callback
 
+    def unregister_callback(self, device_id, callback):
+        if self.callbacks.get(device_id) == callback:
+            del self.callbacks[device_id]
+
     def turn_on(self, device_id, device_type):
         return {"state": "on"}
 
@@ -84,60 +93,46 @@ class TestHomeAssistantDevice(unittest.TestCase):
         self.assertIn("light.test_device", self.connector.callbacks)
         self.assertEqual(self.connector.callbacks["light.test_device"], self.device.callback_listener)
 
+    def test_release_unregisters_callback(self):
+        """Test a released device stops listening for state changes."""
+        self.device.release()
+        self.assertNotIn("light.test_device", self.connector.callbacks)
+
+    def test_device_is_slotted(self):
+        """Test devices carry no per-instance __dict__."""
+        self.assertFalse(hasattr(self.device, "__dict__"))
+        light = HomeAssistantLight(self.connector, "light.other", "mdi:light", "Other", "on", {})
+        self.assertFalse(hasattr(light, "__dict__"))
+
+    def test_device_strings_are_interned(self):
+        """Test domain, icon and attribute keys are shared between devices."""
+        other = HomeAssistantDevice(
+            connector=self.connector,
+            device_id="light.other_device",
+            device_icon="".join(["mdi:", "lightbulb"]),
+            device_name="Other Device",
+            device_state="off",
+            device_attributes={"".join(["friendly_", "name"]): "Other Device"},
+        )
+        self.assertIs(other.device_type, self.device.device_type)
+        self.assertIs(other.device_icon, self.device.device_icon)
+        self.assertIs(next(iter(other.device_attributes)), next(iter(self.device.device_attributes)))
+
     def test_callback_listener_updates_state_on_state_changed(self):
-        """Test callback_listener updates device state when receiving state_changed event."""
-        message = {
-            "event": {
-                "event_type": "state_changed",
-                "data": {
-                    "new_state": {
-                        "entity_id": "light.test_device",
-                        "state": "off",
-                        "attributes": {"brightness": 0},
-                    }
-                },
-            }
+        """Test callback_listener updates device state from the routed new state."""
+        new_state = {
+            "entity_id": "light.test_device",
+            "state": "off",
+            "attributes": {"brightness": 0},
         }
-        self.device.callback_listener(message)
+        self.device.callback_listener(new_state)
         self.assertEqual(self.device.device_state, "off")
         self.assertEqual(self.device.device_attributes["brightness"], 0)
 
-    def test_callback_listener_ignores_events_for_other_entities(self):
-        """Test callback_listener does not update state for different entity_id."""
+    def test_callback_listener_ignores_removed_entity(self):
+        """Test callback_listener keeps the last state when the entity was removed (no new state)."""
         original_state = self.device.device_state
-        original_brightness = self.device.device_attributes["brightness"]
-        message = {
-            "event": {
-                "event_type": "state_changed",
-                "data": {
-                    "new_state": {
-                        "entity_id": "light.other_device",
-                        "state": "off",
-                        "attributes": {"brightness": 0},
-                    }
-                },
-            }
-        }
-        self.device.callback_listener(message)
-        self.assertEqual(self.device.device_state, original_state)
-        self.assertEqual(self.device.device_attributes["brightness"], original_brightness)
-
-    def test_callback_listener_ignores_non_state_changed_events(self):
-        """Test callback_listener ignores events that aren't state_changed."""
-        original_state = self.device.device_state
-        message = {
-            "event": {
-                "event_type": "call_service",  # Not state_changed
-                "data": {
-                    "new_state": {
-                        "entity_id": "light.test_device",
-                        "state": "off",
-                        "attributes": {},
-                    }
-                },
-            }
-        }
-        self.device.callback_listener(message)
+        self.device.callback_listener(None)
         self.assertEqual(self.device.device_state, original_state)
 
     def test_query_device_class_sets_class_when_present(self):
@@ -184,6 +179,60 @@ class TestHomeAssistantDevice(unittest.TestCase):
         result = self.device.turn_off()
         self.assertEqual(result["state"], "off")
 
+    def test_turn_on_skipped_when_fresh_state_matches(self):
+        """Test turn_on is skipped when the fresh cached state is already on."""
+        self.connector.state_max_age = 60
+        self.connector.turn_on = Mock()
+        self.assertEqual(self.device.turn_on(), [])
+        self.connector.turn_on.assert_not_called()
+        self.device.turn_on(force=True)
+        self.connector.turn_on.assert_called_once_with("light.test_device", "light")
+
+    def test_turn_on_sent_when_state_is_stale(self):
+        """Test turn_on is sent when the cached state is older than state_max_age."""
+        self.connector.state_max_age = 60
+        self.connector.turn_on = Mock()
+        self.device.last_refreshed -= 61
+        self.device.turn_on()
+        self.connector.turn_on.assert_called_once()
+
+    def test_turn_off_sent_after_turn_on(self):
+        """Test turn_on expires the cached state, so a following turn_off is not skipped."""
+        self.connector.state_max_age = 30
+        self.device.device_state = "off"
+        self.connector.turn_on = Mock()
+        self.connector.turn_off = Mock()
+        self.device.turn_on()
+        self.assertFalse(self.device.is_fresh())
+        self.device.turn_off()
+        self.connector.turn_on.assert_called_once()
+        self.connector.turn_off.assert_called_once()
+
+    def test_display_model_polls_after_call_function(self):
+        """Test a generic call expires the cached state, so the display model shows the state after it."""
+        self.connector.poll_max_age = {"light": 5}
+        self.device.device_state = "off"
+        self.connector.get_device_state = Mock(
+            return_value={"entity_id": "light.test_device", "state": "on", "attributes": {}}
+        )
+        self.assertEqual(self.device.get_device_display_model()["state"], "off")
+        self.connector.get_device_state.assert_not_called()
+
+        self.device.call_function("toggle")
+
+        self.assertEqual(self.device.get_device_display_model()["state"], "on")
+        self.connector.get_device_state.assert_called_once_with("light.test_device")
+
+    def test_set_device_attribute_expires_state(self):
+        self.connector.state_max_age = 30
+        self.device.set_device_attribute("light.test_device", "brightness", 10)
+        self.assertFalse(self.device.is_fresh())
+
+    def test_turn_off_sent_when_state_differs(self):
+        """Test turn_off is sent when the cached state is on."""
+        self.connector.state_max_age = 60
+        self.assertEqual(self.device.turn_off()["state"], "off")
+
     def test_call_function_delegates_to_connector(self):
         """Test call_function passes through to connector.call_function."""
         result = self.device.call_function("test_function", {"arg": "value"})
@@ -254,6 +303,28 @@ class TestHomeAssistantDevice(unittest.TestCase):
         self.assertEqual(model["host"], "http://fake.homeassistant.local")
         self.assertIn("state", model)
         self.assertIn("attributes", model)
+        self.assertIn("age", model)
+
+    def test_poll_skipped_within_domain_max_age(self):
+        """Test poll serves the cached state while it is within the domain's max-age."""
+        self.connector.poll_max_age = {"light": 60}
+        self.connector.get_device_state = Mock(return_value={"state": "off", "attributes": {}})
+        self.device.poll()
+        self.connector.get_device_state.assert_not_called()
+        self.assertEqual(self.device.get_device_display_model()["state"], "on")
+        self.device.poll(force=True)
+        self.connector.get_device_state.assert_called_once_with("light.test_device")
+        self.assertEqual(self.device.device_state, "off")
+
+    def test_poll_fetches_when_stale(self):
+        """Test poll fetches the state once it is older than the domain's max-age."""
+        self.connector.poll_max_age = {"light": 60, "sensor": 600}
+        self.connector.get_device_state = Mock(return_value={"state": "off", "attributes": {}})
+        self.device.last_refreshed -= 61
+        model = self.device.get_device_display_model()
+        self.connector.get_device_state.assert_called_once()
+        self.assertEqual(model["state"], "off")
+        self.assertLess(model["age"], 1)
 
 
 class TestHomeAssistantLight(unittest.TestCase):
@@ -293,24 +364,39 @@ class TestHomeAssistantLight(unittest.TestCase):
         self.assertIn("45", result)
         self.assertIn("67", result)
 
+    def test_get_spoken_color_names_nearest_color(self):
+        """Test get_spoken_color names a near-miss RGB value after the closest color."""
+        self.light.device_attributes["rgb_color"] = [250, 5, 3]
+        self.assertEqual(self.light.get_spoken_color(), "red")
+        self.light.device_attributes["rgb_color"] = [254, 213, 161]
+        self.assertEqual(self.light.get_spoken_color(get_color_index("extended")), "soft white")
+
     def test_set_color_converts_name_to_rgb(self):
         """Test set_color converts color name to RGB using webcolors."""
-        with patch.object(self.light, "set_rgb_color") as mock_set_rgb:
-            with patch.object(self.light, "update_device"):
+        with patch.object(HomeAssistantLight, "set_rgb_color") as mock_set_rgb:
+            with patch.object(HomeAssistantLight, "update_device"):
                 self.light.set_color("blue")
-                mock_set_rgb.assert_called_with([0, 0, 255])
+                mock_set_rgb.assert_called_with([0, 0, 255], force=False)
+
+    def test_set_color_resolves_spoken_names(self):
+        """Test set_color accepts spoken variants and rejects unknown colors."""
+        with patch.object(HomeAssistantLight, "set_rgb_color") as mock_set_rgb:
+            self.light.set_color("Light Blue")
+            mock_set_rgb.assert_called_with([173, 216, 230], force=False)
+            with self.assertRaises(ValueError):
+                self.light.set_color("banana")
 
     def test_increase_brightness_uses_positive_step(self):
         """Test increase_brightness sends positive brightness_step_pct."""
-        with patch.object(self.light, "call_function") as mock_call:
-            with patch.object(self.light, "update_device"):
+        with patch.object(HomeAssistantLight, "call_function") as mock_call:
+            with patch.object(HomeAssistantLight, "update_device"):
                 self.light.increase_brightness(15)
                 mock_call.assert_called_with("turn_on", {"brightness_step_pct": 15})
 
     def test_decrease_brightness_uses_negative_step(self):
         """Test decrease_brightness sends negative brightness_step_pct."""
-        with patch.object(self.light, "call_function") as mock_call:
-            with patch.object(self.light, "update_device"):
+        with patch.object(HomeAssistantLight, "call_function") as mock_call:
+            with patch.object(HomeAssistantLight, "update_device"):
                 self.light.decrease_brightness(15)
                 mock_call.assert_called_with("turn_on", {"brightness_step_pct": -15})
 
@@ -333,53 +419,66 @@ class TestHomeAssistantLight(unittest.TestCase):
 
     def test_set_brightness(self):
         """Test set_brightness calls turn_on with brightness arg."""
-        with patch.object(self.light, "call_function") as mock_call:
-            with patch.object(self.light, "update_device"):
+        with patch.object(HomeAssistantLight, "call_function") as mock_call:
+            with patch.object(HomeAssistantLight, "update_device"):
                 self.light.set_brightness(128)
                 mock_call.assert_called_with("turn_on", {"brightness": 128})
 
     def test_set_color_mode(self):
         """Test set_color_mode calls connector with color_mode."""
-        with patch.object(self.light, "call_function") as mock_call:
-            with patch.object(self.light, "update_device"):
+        with patch.object(HomeAssistantLight, "call_function") as mock_call:
+            with patch.object(HomeAssistantLight, "update_device"):
                 self.light.set_color_mode("rgb")
                 mock_call.assert_called_with("set_color_mode", {"color_mode": "rgb"})
 
     def test_set_color_temp(self):
         """Test set_color_temp calls connector with color_temp."""
-        with patch.object(self.light, "call_function") as mock_call:
-            with patch.object(self.light, "update_device"):
+        with patch.object(HomeAssistantLight, "call_function") as mock_call:
+            with patch.object(HomeAssistantLight, "update_device"):
                 self.light.set_color_temp(400)
                 mock_call.assert_called_with("set_color_temp", {"color_temp": 400})
 
     def test_set_effect(self):
         """Test set_effect calls connector with effect."""
-        with patch.object(self.light, "call_function") as mock_call:
-            with patch.object(self.light, "update_device"):
+        with patch.object(HomeAssistantLight, "call_function") as mock_call:
+            with patch.object(HomeAssistantLight, "update_device"):
                 self.light.set_effect("rainbow")
                 mock_call.assert_called_with("set_effect", {"effect": "rainbow"})
 
     def test_set_hs_color(self):
         """Test set_hs_color calls connector with hs_color."""
-        with patch.object(self.light, "call_function") as mock_call:
-            with patch.object(self.light, "update_device"):
+        with patch.object(HomeAssistantLight, "call_function") as mock_call:
+            with patch.object(HomeAssistantLight, "update_device"):
                 self.light.set_hs_color([120, 80])
                 mock_call.assert_called_with("set_hs_color", {"hs_color": [120, 80]})
 
     def test_set_rgb_color(self):
         """Test set_rgb_color calls turn_on with rgb_color."""
-        with patch.object(self.light, "call_function") as mock_call:
-            with patch.object(self.light, "update_device"):
+        with patch.object(HomeAssistantLight, "call_function") as mock_call:
+            with patch.object(HomeAssistantLight, "update_device"):
                 self.light.set_rgb_color([100, 150, 200])
                 mock_call.assert_called_with("turn_on", {"rgb_color": [100, 150, 200]})
 
     def test_set_xy_color(self):
         """Test set_xy_color calls connector with xy_color."""
-        with patch.object(self.light, "call_function") as mock_call:
-            with patch.object(self.light, "update_device"):
+        with patch.object(HomeAssistantLight, "call_function") as mock_call:
+            with patch.object(HomeAssistantLight, "update_device"):
                 self.light.set_xy_color([0.5, 0.6])
                 mock_call.assert_called_with("set_xy_color", {"xy_color": [0.5, 0.6]})
 
+    def test_setters_skip_when_fresh_state_matches(self):
+        """Test light setters skip calls that would not change the fresh cached state."""
+        self.connector.state_max_age = 60
+        with patch.object(HomeAssistantLight, "call_function") as mock_call:
+            with patch.object(HomeAssistantLight, "update_device"):
+                self.light.set_brightness(200)
+                self.light.set_rgb_color((255, 100, 50))
+                mock_call.assert_not_called()
+                self.light.set_brightness(100)
+                mock_call.assert_called_once_with("turn_on", {"brightness": 100})
+                self.light.set_rgb_color([255, 100, 50], force=True)
+                mock_call.assert_called_with("turn_on", {"rgb_color": [255, 100, 50]})
+
 
 class TestHomeAssistantSensor(unittest.TestCase):
     """Tests for HomeAssistantSensor attribute defaults."""
@@ -438,7 +537,7 @@ class TestHomeAssistantCover(unittest.TestCase):
 
     def test_cover_calls_correct_functions(self):
         """Test cover methods call connector with correct function names."""
-        with patch.object(self.cover, "call_function") as mock_call:
+        with patch.object(HomeAssistantCover, "call_function") as mock_call:
             self.cover.open()
             mock_call.assert_called_with("open")
             
@@ -450,8 +549,8 @@ class TestHomeAssistantCover(unittest.TestCase):
 
     def test_set_position_includes_position_arg(self):
         """Test set_position passes position to connector."""
-        with patch.object(self.cover, "call_function") as mock_call:
-            with patch.object(self.cover, "update_device"):
+        with patch.object(HomeAssistantCover, "call_function") as mock_call:
+            with patch.object(HomeAssistantCover, "update_device"):
                 self.cover.set_position(50)
                 mock_call.assert_called_with("set_position", {"position": 50})
 
@@ -537,8 +636,8 @@ class TestHomeAssistantClimate(unittest.TestCase):
         ]
         
         for method_name, expected_args in test_cases:
-            with patch.object(self.climate, "call_function") as mock_call:
-                with patch.object(self.climate, "update_device"):
+            with patch.object(HomeAssistantClimate, "call_function") as mock_call:
+                with patch.object(HomeAssistantClimate, "update_device"):
                     method = getattr(self.climate, method_name)
                     arg_value = list(expected_args.values())[0]
                     method(arg_value)
@@ -566,7 +665,7 @@ class TestHomeAssistantVacuum(unittest.TestCase):
 
     def test_vacuum_control_methods(self):
         """Test vacuum control methods call correct functions."""
-        with patch.object(self.vacuum, "call_function") as mock_call:
+        with patch.object(HomeAssistantVacuum, "call_function") as mock_call:
             self.vacuum.start()
             mock_call.assert_called_with("start")
             
@@ -581,7 +680,7 @@ class TestHomeAssistantVacuum(unittest.TestCase):
 
     def test_send_command_passes_command_and_params(self):
         """Test send_command forwards command name and params to connector."""
-        with patch.object(self.vacuum, "call_function") as mock_call:
+        with patch.object(HomeAssistantVacuum, "call_function") as mock_call:
             self.vacuum.send_command("clean_segment", {"segment_id": 1})
             mock_call.assert_called_with(
                 "send_command", 
@@ -590,8 +689,8 @@ class TestHomeAssistantVacuum(unittest.TestCase):
 
     def test_set_fan_speed_uses_set_device_attribute(self):
         """Test set_fan_speed updates attribute rather than calling function."""
-        with patch.object(self.vacuum, "set_device_attribute") as mock_set:
-            with patch.object(self.vacuum, "update_device"):
+        with patch.object(HomeAssistantVacuum, "set_device_attribute") as mock_set:
+            with patch.object(HomeAssistantVacuum, "update_device"):
                 self.vacuum.set_fan_speed("quiet")
                 mock_set.assert_called_with("vacuum.roomba", "fan_speed", "quiet")
 
@@ -644,5 +743,48 @@ class TestHomeAssistantAutomation(unittest.TestCase):
             connector.turn_off.assert_not_called()
 
 
+class RecordingAttributes(dict):
+    """Attribute dict remembering every key read from it."""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.read = set()
+
+    def __getitem__(self, key):
+        self.read.add(key)
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self.read.add(key)
+        return super().get(key, default)
+
+    def __contains__(self, key):
+        self.read.add(key)
+        return super().__contains__(key)
+
+
+class TestProjectedAttributes(unittest.TestCase):
+    def test_getters_only_read_projected_attributes(self):
+        """Test every device type works from a template-projected state."""
+        projected = {
+            key: [0, 0, 0] if key.endswith(("_color", "_list", "_modes")) else 1 for key in PROJECTED_ATTRIBUTES
+        }
+        device_classes = {*SUPPORTED_DEVICES.values(), HomeAssistantCover}
+        for device_class in device_classes:
+            with self.subTest(device_class=device_class.__name__):
+                device = device_class(FakeConnector(), "domain.entity", "mdi:icon", "Entity", "on", projected)
+                attributes = device.device_attributes = RecordingAttributes(device.device_attributes)
+                for name, method in inspect.getmembers(device, inspect.ismethod):
+                    if not name.startswith("get_") or name in ("get_state_json_object", "get_device_display_model"):
+                        continue
+                    if any(
+                        parameter.default is inspect.Parameter.empty
+                        for parameter in inspect.signature(method).parameters.values()
+                    ):
+                        continue
+                    method()
+                self.assertLessEqual(attributes.read, set(PROJECTED_ATTRIBUTES))
+
+
 if __name__ == "__main__":
     unittest.main()
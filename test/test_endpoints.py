@@ -0,0 +1,53 @@
+# pylint: disable=missing-function-docstring,missing-class-docstring,missing-module-docstring
+import unittest
+
+from skill_homeassistant.ha_client.logic.endpoints import EndpointPool
+
+LAN = "http://homeassistant.local:8123"
+REMOTE = "https://example.ui.nabu.casa"
+
+
+class TestEndpointPool(unittest.TestCase):
+    def test_configured_order_until_latency_is_known(self):
+        pool = EndpointPool([LAN + "/", REMOTE], probe_interval=0)
+        self.assertEqual(pool.candidates(), [LAN, REMOTE])
+
+    def test_fastest_healthy_first(self):
+        pool = EndpointPool([LAN, REMOTE], probe_interval=0)
+        pool.record_success(LAN, 0.4)
+        pool.record_success(REMOTE, 0.1)
+        self.assertEqual(pool.candidates(), [REMOTE, LAN])
+
+    def test_unhealthy_last_until_it_recovers(self):
+        pool = EndpointPool([LAN, REMOTE], probe_interval=0)
+        pool.record_failure(LAN, failover=True)
+        self.assertEqual(pool.candidates(), [REMOTE, LAN])
+        pool.record_success(LAN, 0.05)
+        self.assertEqual(pool.candidates(), [LAN, REMOTE])
+        self.assertEqual(pool.get_stats()["failovers"], 1)
+        self.assertEqual(pool.get_stats()["endpoints"][LAN]["failures"], 1)
+
+    def test_latency_is_smoothed(self):
+        pool = EndpointPool([LAN], probe_interval=0)
+        pool.record_success(LAN, 1.0)
+        pool.record_success(LAN, 2.0)
+        self.assertAlmostEqual(pool.get_stats()["endpoints"][LAN]["latency"], 1.3)
+
+    def test_probe_all(self):
+        pool = EndpointPool([LAN, REMOTE], probe_interval=0)
+
+        def probe(url):
+            if url == LAN:
+                raise ConnectionError(url)
+            return 0.2
+
+        pool.start_probing(probe)
+        pool.probe_all()
+
+        self.assertEqual(pool.candidates(), [REMOTE, LAN])
+        self.assertEqual(pool.get_stats()["failovers"], 0)
+        pool.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+# pylint: disable=missing-function-docstring,missing-class-docstring,missing-module-docstring
+import json
+import unittest
+from unittest.mock import Mock
+
+from skill_homeassistant.ha_client.logic.events import EventRouter
+from skill_homeassistant.ha_client.logic.listeners import ListenerRegistry
+
+
+def state_changed(entity_id, state="on"):
+    new_state = {"entity_id": entity_id, "state": state, "attributes": {}}
+    return {
+        "id": 1,
+        "type": "event",
+        "event": {"event_type": "state_changed", "data": {"entity_id": entity_id, "new_state": new_state}},
+    }
+
+
+class TestEventRouter(unittest.TestCase):
+    def setUp(self):
+        self.listeners = ListenerRegistry()
+        self.kitchen, self.hall = Mock(), Mock()
+        self.listeners.register("light.kitchen", self.kitchen)
+        self.listeners.register("light.hall", self.hall)
+        self.router = EventRouter(self.listeners)
+
+    def test_delivers_new_state_to_the_entity_listeners_only(self):
+        self.assertEqual(self.router.dispatch(state_changed("light.kitchen", "off")), 1)
+
+        self.kitchen.assert_called_once_with({"entity_id": "light.kitchen", "state": "off", "attributes": {}})
+        self.hall.assert_not_called()
+
+    def test_decodes_raw_messages(self):
+        self.router.dispatch(json.dumps(state_changed("light.hall")).encode())
+        self.assertEqual(self.hall.call_args[0][0]["state"], "on")
+
+        self.assertEqual(self.router.dispatch(b"{not json"), 0)
+        self.assertEqual(self.router.get_stats()["invalid"], 1)
+
+    def test_counts_ignored_and_unrouted_events(self):
+        self.router.dispatch({"type": "event", "event": {"event_type": "call_service", "data": {}}})
+        self.router.dispatch(state_changed("sensor.power"))
+
+        stats = self.router.get_stats()
+        self.assertEqual((stats["events"], stats["ignored"], stats["unrouted"], stats["delivered"]), (2, 1, 1, 0))
+
+    def test_listener_errors_do_not_stop_delivery(self):
+        second = Mock()
+        self.listeners.register("light.kitchen", second)
+        self.kitchen.side_effect = ValueError("boom")
+
+        self.assertEqual(self.router.dispatch(state_changed("light.kitchen")), 2)
+
+        second.assert_called_once()
+        self.assertEqual(self.router.get_stats()["errors"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+# pylint: disable=missing-function-docstring,missing-class-docstring,missing-module-docstring
+import threading
+import unittest
+from queue import Full
+
+from skill_homeassistant.ha_client.logic.executor import PriorityExecutor, current_priority, request_priority
+
+
+class TestPriorityExecutor(unittest.TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.started = threading.Event()
+
+    def block(self):
+        self.started.set()
+        self.release.wait(5)
+
+    def test_interactive_jumps_ahead_of_queued_background(self):
+        executor = PriorityExecutor(max_workers=1)
+        order = []
+        blocker = executor.submit("interactive", self.block)
+        self.started.wait(5)
+        futures = [executor.submit("refresh", order.append, "refresh"), executor.submit("gui", order.append, "gui")]
+        futures.append(executor.submit("interactive", order.append, "interactive"))
+
+        self.assertEqual(executor.get_stats()["depth"], {"interactive": 1, "gui": 1, "refresh": 1, "metrics": 0})
+        self.release.set()
+        for future in [blocker, *futures]:
+            future.result(5)
+
+        self.assertEqual(order, ["interactive", "gui", "refresh"])
+        executor.shutdown()
+
+    def test_background_cap_keeps_a_worker_for_interactive(self):
+        executor = PriorityExecutor(max_workers=2)
+        background = [executor.submit("refresh", self.block), executor.submit("refresh", self.block)]
+        self.started.wait(5)
+
+        self.assertEqual(executor.submit("interactive", lambda: "done").result(5), "done")
+        self.assertEqual(executor.get_stats()["running"]["refresh"], 1)
+        self.release.set()
+        for future in background:
+            future.result(5)
+        executor.shutdown()
+
+    def test_full_queue_rejects(self):
+        executor = PriorityExecutor(max_workers=1, max_queued=1)
+        blocker = executor.submit("interactive", self.block)
+        self.started.wait(5)
+        executor.submit("metrics", lambda: None)
+
+        with self.assertRaises(Full):
+            executor.submit("metrics", lambda: None)
+        self.assertEqual(executor.get_stats()["rejected"], 1)
+        self.release.set()
+        blocker.result(5)
+        executor.shutdown()
+
+    def test_exceptions_reach_the_caller(self):
+        executor = PriorityExecutor()
+        with self.assertRaises(ZeroDivisionError):
+            executor.submit("interactive", lambda: 1 / 0).result(5)
+        executor.shutdown()
+
+    def test_shutdown_cancels_queued_tasks(self):
+        executor = PriorityExecutor(max_workers=1)
+        blocker = executor.submit("interactive", self.block)
+        self.started.wait(5)
+        queued = executor.submit("refresh", lambda: None)
+
+        executor.shutdown()
+        self.release.set()
+
+        self.assertTrue(queued.cancelled())
+        blocker.result(5)
+        with self.assertRaises(RuntimeError):
+            executor.submit("interactive", lambda: None)
+
+    def test_request_priority(self):
+        self.assertEqual(current_priority(), "interactive")
+        with request_priority("gui"):
+            self.assertEqual(current_priority(), "gui")
+        self.assertEqual(current_priority(), "interactive")
+        with self.assertRaises(ValueError):
+            with request_priority("urgent"):
+                pass
+
+    def test_from_config(self):
+        self.assertIsNone(PriorityExecutor.from_config(False))
+        executor = PriorityExecutor.from_config({"workers": 3})
+        self.assertEqual((executor.max_workers, executor.background_workers), (3, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+# pylint: disable=missing-function-docstring,missing-class-docstring,missing-module-docstring
+import unittest
+
+from skill_homeassistant.ha_client.logic.filters import EntityFilter, compile_patterns
+
+
+def state(entity_id, area_id=None, **attributes):
+    return {"entity_id": entity_id, "state": "on", "attributes": attributes, "area_id": area_id}
+
+
+class TestCompilePatterns(unittest.TestCase):
+    def test_empty(self):
+        self.assertIsNone(compile_patterns([]))
+        self.assertIsNone(compile_patterns(None))
+
+    def test_glob_and_regex(self):
+        pattern = compile_patterns(["sensor.*_battery", r"re:switch\.kitchen_\d+$"])
+        self.assertTrue(pattern.match("sensor.phone_battery"))
+        self.assertTrue(pattern.match("switch.kitchen_2"))
+        self.assertFalse(pattern.match("sensor.phone_battery_state"))
+        self.assertFalse(pattern.match("switch.kitchen_main"))
+
+    def test_invalid_regex_dropped(self):
+        pattern = compile_patterns(["re:sensor.(battery", "light.*"])
+        self.assertTrue(pattern.match("light.a"))
+        self.assertFalse(pattern.match("sensor.(battery"))
+        self.assertIsNone(compile_patterns(["re:sensor.(battery"]))
+        self.assertFalse(EntityFilter.from_config({"exclude_entities": ["re:("]}))
+
+
+class TestEntityFilter(unittest.TestCase):
+    def test_default_keeps_everything(self):
+        entity_filter = EntityFilter.from_config(None)
+        self.assertFalse(entity_filter)
+        self.assertTrue(entity_filter(state("light.a")))
+
+    def test_domains(self):
+        entity_filter = EntityFilter.from_config({"exclude_domains": ["sensor"]})
+        self.assertTrue(entity_filter(state("light.a")))
+        self.assertFalse(entity_filter(state("sensor.a")))
+        entity_filter = EntityFilter.from_config({"include_domains": ["light"]})
+        self.assertFalse(entity_filter(state("switch.a")))
+
+    def test_entity_patterns(self):
+        entity_filter = EntityFilter.from_config(
+            {"include_entities": ["light.*", "sensor.*"], "exclude_entities": ["sensor.*_battery"]}
+        )
+        self.assertTrue(entity_filter(state("light.a")))
+        self.assertTrue(entity_filter(state("sensor.temperature")))
+        self.assertFalse(entity_filter(state("sensor.phone_battery")))
+        self.assertFalse(entity_filter(state("switch.a")))
+
+    def test_areas(self):
+        entity_filter = EntityFilter.from_config({"exclude_areas": ["garage"]})
+        self.assertTrue(entity_filter(state("light.a", area_id="kitchen")))
+        self.assertTrue(entity_filter(state("light.a")))
+        self.assertFalse(entity_filter(state("light.a", area_id="garage")))
+        self.assertTrue(entity_filter(state("light.a", area_id="garage"), check_areas=False))
+
+    def test_integrations(self):
+        entity_filter = EntityFilter.from_config({"exclude_integrations": ["mobile_app"]})
+        self.assertEqual(entity_filter.integrations, {"mobile_app"})
+        self.assertFalse(entity_filter({**state("sensor.a"), "integrations": ["mobile_app"]}))
+        self.assertTrue(entity_filter({**state("sensor.a"), "integrations": ()}))
+        self.assertTrue(entity_filter(state("sensor.a")))
+        entity_filter = EntityFilter.from_config({"include_integrations": ["hue", "zha"]})
+        self.assertTrue(entity_filter({**state("light.a"), "integrations": ["zha"]}))
+        self.assertFalse(entity_filter(state("light.a")))
+        self.assertTrue(entity_filter(state("light.a"), check_integrations=False))
+
+    def test_attributes(self):
+        entity_filter = EntityFilter.from_config(
+            {"exclude_attributes": {"device_class": ["battery", "signal_strength"]}}
+        )
+        self.assertFalse(entity_filter(state("sensor.a", device_class="battery")))
+        self.assertTrue(entity_filter(state("sensor.a", device_class="temperature")))
+        self.assertTrue(entity_filter(state("sensor.a", device_class=["unhashable"])))
+        entity_filter = EntityFilter.from_config({"include_attributes": {"device_class": "temperature"}})
+        self.assertTrue(entity_filter(state("sensor.a", device_class="temperature")))
+        self.assertFalse(entity_filter(state("sensor.a")))
+
+    def test_stats(self):
+        entity_filter = EntityFilter.from_config({"exclude_domains": ["sensor"], "exclude_areas": ["garage"]})
+        for entity in (state("sensor.a"), state("sensor.b"), state("light.a", area_id="garage"), state("light.b")):
+            entity_filter(entity)
+        self.assertEqual(entity_filter.stats, {"domain": 2, "area": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+# pylint: disable=missing-function-docstring,missing-class-docstring,missing-module-docstring
+import gc
+import unittest
+from unittest.mock import Mock
+
+from skill_homeassistant.ha_client.logic.listeners import ListenerRegistry
+
+
+class Listener:
+    def __init__(self):
+        self.messages = []
+
+    def on_change(self, message):
+        self.messages.append(message)
+
+
+class TestListenerRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = ListenerRegistry()
+
+    def test_several_listeners_per_entity(self):
+        first, second = Listener(), Listener()
+        self.registry.register("light.kitchen", first.on_change)
+        self.registry.register("light.kitchen", second.on_change)
+        self.registry.register("light.kitchen", first.on_change)
+
+        self.assertEqual(self.registry.listeners("light.kitchen"), [first.on_change, second.on_change])
+        self.assertEqual(self.registry.listeners("light.hall"), [])
+        self.assertEqual(self.registry.get_stats()["registered"], 2)
+
+    def test_unregister(self):
+        listener = Listener()
+        self.registry.register("light.kitchen", listener.on_change)
+
+        self.assertTrue(self.registry.unregister("light.kitchen", listener.on_change))
+        self.assertFalse(self.registry.unregister("light.kitchen", listener.on_change))
+        self.assertNotIn("light.kitchen", self.registry)
+        self.assertEqual(len(self.registry), 0)
+
+    def test_bound_methods_do_not_keep_their_object_alive(self):
+        listener = Listener()
+        self.registry.register("light.kitchen", listener.on_change)
+        del listener
+        gc.collect()
+
+        self.assertEqual(self.registry.listeners("light.kitchen"), [])
+        stats = self.registry.get_stats()
+        self.assertEqual(stats["collected"], 1)
+        self.assertEqual(stats["listeners"], 0)
+        self.assertEqual(stats["entities"], 0)
+
+    def test_plain_callables(self):
+        callback = Mock()
+        self.registry.register("switch.fan", callback)
+        self.assertEqual(self.registry.listeners("switch.fan"), [callback])
+
+    def test_clear(self):
+        listeners = [Listener() for _ in range(3)]
+        for index, listener in enumerate(listeners):
+            self.registry.register(f"light.{index}", listener.on_change)
+
+        self.registry.clear()
+
+        self.assertEqual(len(self.registry), 0)
+        self.assertEqual(self.registry.get_stats()["unregistered"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
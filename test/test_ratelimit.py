@@ -0,0 +1,104 @@
+# pylint: disable=missing-function-docstring,missing-class-docstring,missing-module-docstring
+import unittest
+from unittest.mock import patch
+
+from skill_homeassistant.ha_client.logic.ratelimit import RateLimited, RateLimiter, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = patch("skill_homeassistant.ha_client.logic.ratelimit.monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch("skill_homeassistant.ha_client.logic.ratelimit.sleep", self.clock.sleep)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_token_bucket_refills_at_rate(self):
+        bucket = TokenBucket(rate=2, burst=2)
+        for _ in range(2):
+            self.assertEqual(bucket.wait_time(self.clock()), 0)
+            bucket.consume()
+        self.assertEqual(bucket.wait_time(self.clock()), 0.5)
+        self.clock.now += 0.5
+        self.assertEqual(bucket.wait_time(self.clock()), 0)
+
+    def test_reject_mode_refuses_beyond_burst(self):
+        limiter = RateLimiter(rate=1, burst=3, mode="reject")
+        for index in range(3):
+            limiter.acquire("light", f"light.{index}")
+
+        with self.assertRaises(RateLimited):
+            limiter.acquire("light", "light.3")
+        self.assertEqual(limiter.get_stats(), {"allowed": 3, "delayed": 0, "rejected": 1})
+
+    def test_queue_mode_delays_until_a_token_is_free(self):
+        limiter = RateLimiter(rate=4, burst=1)
+        limiter.acquire("switch", "switch.a")
+        limiter.acquire("switch", "switch.b")
+
+        self.assertEqual(self.clock.now, 100.25)
+        self.assertEqual(limiter.get_stats()["delayed"], 1)
+
+    def test_queue_mode_rejects_beyond_max_wait(self):
+        limiter = RateLimiter(rate=0.1, burst=1, max_wait=5)
+        limiter.acquire("switch", "switch.a")
+
+        with self.assertRaises(RateLimited):
+            limiter.acquire("switch", "switch.b")
+        self.assertEqual(self.clock.now, 100)
+
+    def test_domain_bucket_limits_only_its_domain(self):
+        limiter = RateLimiter(rate=100, burst=100, domains={"light": {"rate": 1, "burst": 1}}, mode="reject")
+        limiter.acquire("light", "light.a")
+        limiter.acquire("switch", "switch.a")
+
+        with self.assertRaises(RateLimited):
+            limiter.acquire("light", "light.b")
+        limiter.acquire("switch", "switch.b")
+
+    def test_entity_interval(self):
+        limiter = RateLimiter(rate=100, burst=100, entity_interval=0.5)
+        limiter.acquire("light", "light.a")
+        limiter.acquire("light", "light.b")
+        self.assertEqual(self.clock.now, 100)
+
+        limiter.acquire("light", "light.a")
+        self.assertEqual(self.clock.now, 100.5)
+
+    def test_from_config(self):
+        self.assertIsNone(RateLimiter.from_config(None))
+        limiter = RateLimiter.from_config({"rate": 2, "mode": "unknown", "domains": {"light": {"rate": 1}}})
+        self.assertEqual((limiter.bucket.rate, limiter.mode), (2, "queue"))
+        self.assertEqual(limiter.domain_buckets["light"].burst, 1)
+
+    def test_from_config_ignores_invalid_limits(self):
+        limiter = RateLimiter.from_config(
+            {
+                "rate": 0,
+                "burst": 0.5,
+                "domains": {"light": {"rate": 0}, "switch": {"rate": 2, "burst": "many"}, "fan": {"rate": 0.5}},
+            }
+        )
+        self.assertEqual((limiter.bucket.rate, limiter.bucket.burst), (10, 20))
+        self.assertEqual(set(limiter.domain_buckets), {"fan"})
+        self.assertEqual(limiter.domain_buckets["fan"].burst, 1)
+        limiter.acquire("light", "light.a")
+        with self.assertRaises(ValueError):
+            RateLimiter(rate=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+# pylint: disable=missing-function-docstring,missing-class-docstring,missing-module-docstring
+import threading
+import unittest
+
+from skill_homeassistant.ha_client.logic.singleflight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    def run_concurrently(self, flight, key, function, callers=5):
+        results, errors = [], []
+
+        def call():
+            try:
+                results.append(flight.do(key, function))
+            except ValueError as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=call) for _ in range(callers)]
+        for thread in threads:
+            thread.start()
+        return threads, results, errors
+
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            release.wait(5)
+            return {"state": "on"}
+
+        threads, results, _ = self.run_concurrently(flight, ("state", "light.a"), slow)
+        while flight.get_stats()["executed"] + flight.get_stats()["shared"] < 5:
+            threading.Event().wait(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"state": "on"}] * 5)
+        self.assertEqual(flight.get_stats(), {"executed": 1, "shared": 4})
+
+    def test_errors_are_shared(self):
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def failing():
+            release.wait(5)
+            raise ValueError("boom")
+
+        threads, _, errors = self.run_concurrently(flight, "key", failing, callers=3)
+        while sum(flight.get_stats().values()) < 3:
+            threading.Event().wait(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(errors), 3)
+
+    def test_calls_after_invalidate_are_not_shared(self):
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def before():
+            release.wait(5)
+            return "before"
+
+        threads, results, _ = self.run_concurrently(flight, "key", before, callers=1)
+        while not flight.get_stats()["executed"]:
+            threading.Event().wait(0.001)
+        flight.invalidate()
+        self.assertEqual(flight.do("key", lambda: "after"), "after")
+        release.set()
+        threads[0].join()
+        self.assertEqual(results, ["before"])
+        self.assertEqual(flight.get_stats(), {"executed": 2, "shared": 0})
+
+    def test_sequential_calls_are_not_shared(self):
+        flight = SingleFlight()
+        self.assertEqual(flight.do("key", lambda: 1), 1)
+        self.assertEqual(flight.do("key", lambda: 2), 2)
+        self.assertEqual(flight.do("other", lambda value: value, 3), 3)
+        self.assertEqual(flight.get_stats(), {"executed": 3, "shared": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -26,7 +26,7 @@ class TestSkillIntentMatching(unittest.TestCase):
     def setUpClass(cls) -> None:
         cls.skill._startup(cls.bus, cls.test_skill_id)
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_rebuild_device_list(self, mock_get):
         """Test that rebuild device list calls refresh_devices and speaks completion."""
         self.skill.speak_dialog = Mock()
@@ -40,7 +40,7 @@ class TestSkillIntentMatching(unittest.TestCase):
         self.skill.speak_dialog.assert_called_once_with("rebuild.complete", data={"count": 5})
         self.skill.gui.show_text.assert_called_with("Device list refreshed: 5 devices found")
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_rebuild_device_list_no_connection(self, mock_get):
         """Test that rebuild device list returns early when connection unavailable."""
         self.skill.check_client_connection = Mock(return_value=False)
@@ -54,7 +54,7 @@ class TestSkillIntentMatching(unittest.TestCase):
         )
         self.skill.ha_client.refresh_devices.assert_not_called()
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_verify_ssl_config_default(self, mock_get):
         self.assertTrue(self.skill.verify_ssl)
         self.assertTrue(self.skill.ha_client.config.get("verify_ssl"))
@@ -196,6 +196,52 @@ class TestSkillResponseHandling(unittest.TestCase):
         self.skill.gui.show_text.assert_called_with("kitchen light: Turned on!")
 
 
+class TestSkillAdjustments(unittest.TestCase):
+    """Test the volume and temperature adjustment handlers."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.skill = HomeAssistantSkill(
+            settings={"host": "http://ha.local", "api_key": "test", "silent_entities": []}
+        )
+        cls.skill._startup(FakeBus(), "test_skill.adjustments")
+
+    def setUp(self):
+        self.skill.speak_dialog = Mock()
+        self.skill.gui = Mock()
+        self.skill.check_client_connection = Mock(return_value=True)
+        self.skill.ha_client = Mock()
+
+    def test_decrease_volume_steps_down(self):
+        self.skill.ha_client.handle_adjust_media_volume.return_value = {"device": "tv", "volume": 40}
+        self.skill.handle_decrease_volume_intent(Message("media.decrease.volume.intent", {"entity": "tv"}))
+        request = self.skill.ha_client.handle_adjust_media_volume.call_args[0][0]
+        self.assertEqual(request.data, {"device": "tv", "volume_step": -0.1})
+        self.skill.speak_dialog.assert_called_with("media.current.volume", {"device": "tv", "volume": 40})
+
+    def test_increase_temperature_steps_up(self):
+        self.skill.ha_client.handle_adjust_climate_temperature.return_value = {
+            "device": "thermostat",
+            "temperature": 22,
+        }
+        self.skill.handle_increase_temperature_intent(
+            Message("climate.increase.temperature.intent", {"entity": "thermostat"})
+        )
+        request = self.skill.ha_client.handle_adjust_climate_temperature.call_args[0][0]
+        self.assertEqual(request.data, {"device": "thermostat", "temperature_step": 1})
+        self.skill.speak_dialog.assert_called_with(
+            "climate.current.temperature", {"device": "thermostat", "temperature": 22}
+        )
+
+    def test_unknown_device_not_found(self):
+        self.skill.ha_client.handle_adjust_media_volume.return_value = {
+            "device": "tv",
+            "response": "Device id not provided",
+        }
+        self.skill.handle_increase_volume_intent(Message("media.increase.volume.intent", {"entity": "tv"}))
+        self.skill.speak_dialog.assert_called_with("device.not.found", {"device": "tv"})
+
+
 class TestSkillSilentEntities(unittest.TestCase):
     """Test silent_entities property."""
 
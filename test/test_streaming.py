@@ -0,0 +1,47 @@
+# pylint: disable=missing-function-docstring,missing-class-docstring,missing-module-docstring
+import json
+import unittest
+
+from skill_homeassistant.ha_client.logic.streaming import iter_states
+
+STATES = [
+    {"entity_id": "light.kitchen", "state": "on", "attributes": {"friendly_name": "Kitchen {light}"}},
+    {"entity_id": "weather.home", "state": "sunny", "attributes": {"forecast": [{"text": 'a "quoted" ] \\ {'}]}},
+    {"entity_id": "sensor.power", "state": "12.5", "attributes": {"friendly_name": "Pöwer ⚡"}},
+]
+
+
+def chunked(body: bytes, size: int):
+    return [body[i : i + size] for i in range(0, len(body), size)]
+
+
+class TestIterStates(unittest.TestCase):
+    def setUp(self):
+        self.body = json.dumps(STATES, ensure_ascii=False).encode("utf-8")
+
+    def test_yields_every_state(self):
+        self.assertEqual(list(iter_states([self.body])), STATES)
+
+    def test_chunk_boundaries_anywhere(self):
+        """Test chunks may split strings, escapes and multi-byte characters."""
+        for size in (1, 2, 3, 5, 16):
+            self.assertEqual(list(iter_states(chunked(self.body, size))), STATES, size)
+
+    def test_skips_unsupported_domains(self):
+        result = list(iter_states(chunked(self.body, 7), domains={"light", "sensor"}))
+        self.assertEqual([state["entity_id"] for state in result], ["light.kitchen", "sensor.power"])
+
+    def test_empty_list(self):
+        self.assertEqual(list(iter_states([b" [ ", b"]"])), [])
+
+    def test_rejects_non_array(self):
+        with self.assertRaises(ValueError):
+            list(iter_states([b'{"message": "API running."}']))
+
+    def test_rejects_truncated_body(self):
+        with self.assertRaises(ValueError):
+            list(iter_states([self.body[:-10]]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+# pylint: disable=missing-function-docstring,missing-class-docstring,missing-module-docstring
+import unittest
+
+from skill_homeassistant.ha_client.logic.timeouts import AdaptiveTimeouts
+
+
+class TestAdaptiveTimeouts(unittest.TestCase):
+    def test_default_until_enough_samples(self):
+        timeouts = AdaptiveTimeouts(min_samples=3)
+        timeouts.record("service", 0.1)
+        timeouts.record("service", 0.1)
+        self.assertEqual(timeouts.timeout_for("service", 5), (2.0, 5))
+
+    def test_read_timeout_from_percentile_with_headroom(self):
+        timeouts = AdaptiveTimeouts(floor=0.1, percentile=90, headroom=2, min_samples=1)
+        for latency in (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0):
+            timeouts.record("state", latency)
+        self.assertAlmostEqual(timeouts.read_timeout("state", 5), 1.8)
+
+    def test_read_timeout_clamped_to_floor_and_ceiling(self):
+        timeouts = AdaptiveTimeouts(floor=1, ceiling=10, min_samples=1)
+        timeouts.record("state", 0.01)
+        timeouts.record("states", 8)
+        self.assertEqual(timeouts.read_timeout("state", 5), 1)
+        self.assertEqual(timeouts.read_timeout("states", 5), 10)
+
+    def test_endpoints_tracked_separately(self):
+        timeouts = AdaptiveTimeouts(floor=0, min_samples=1, headroom=1, floors={})
+        timeouts.record("service", 0.2)
+        timeouts.record("states", 4)
+        self.assertEqual(timeouts.read_timeout("service", 5), 0.2)
+        self.assertEqual(timeouts.read_timeout("states", 5), 4)
+        self.assertEqual(timeouts.get_stats()["states"], {"samples": 1, "read_timeout": 4})
+
+    def test_service_calls_have_a_higher_floor(self):
+        timeouts = AdaptiveTimeouts(floor=1, min_samples=1)
+        timeouts.record("service", 0.05)
+        timeouts.record("state", 0.05)
+        self.assertEqual(timeouts.read_timeout("service", 5), 5)
+        self.assertEqual(timeouts.read_timeout("state", 5), 1)
+
+    def test_timeouts_raise_the_read_timeout(self):
+        timeouts = AdaptiveTimeouts(floor=0, window=10, headroom=2, min_samples=1)
+        for _ in range(9):
+            timeouts.record("state", 0.1)
+        timeout = timeouts.read_timeout("state", 5)
+        timeouts.record_timeout("state", timeout)
+        self.assertEqual(timeouts.read_timeout("state", 5), timeout * 2)
+
+    def test_window_drops_old_latencies(self):
+        timeouts = AdaptiveTimeouts(floor=0, window=2, min_samples=1, headroom=1)
+        for latency in (9, 0.5, 0.5):
+            timeouts.record("state", latency)
+        self.assertEqual(timeouts.read_timeout("state", 5), 0.5)
+
+    def test_from_config(self):
+        self.assertIsNone(AdaptiveTimeouts.from_config(False))
+        self.assertIsNone(AdaptiveTimeouts.from_config(None))
+        self.assertEqual(AdaptiveTimeouts.from_config(True).ceiling, 30.0)
+        timeouts = AdaptiveTimeouts.from_config({"connect": 1, "ceiling": 60})
+        self.assertEqual((timeouts.connect, timeouts.floor, timeouts.ceiling), (1.0, 1.0, 60.0))
+        self.assertEqual(timeouts.floors, {"service": 5.0})
+        timeouts = AdaptiveTimeouts.from_config({"floors": {"service": 10, "state": 0.5}})
+        self.assertEqual(timeouts.floors, {"service": 10.0, "state": 0.5})
+
+
+if __name__ == "__main__":
+    unittest.main()